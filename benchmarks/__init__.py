@@ -0,0 +1,3 @@
+"""
+Performance benchmarks (not part of the test suite)
+"""
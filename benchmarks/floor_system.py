@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Floor System FEM Scaling Benchmarks
+Wall times of model build, solve, force extraction, design checks and chart
+generation over grid size × storeys × solver backend.
+
+Every run appends one JSON record per case to a history file. A case is
+compared with the median of its last HISTORY_WINDOW clean records from the
+same machine; a phase slower than its threshold (thresholds.json) is a
+regression, and the run exits with status 1.
+
+Usage:
+    python -m benchmarks.floor_system                    # quick suite
+    python -m benchmarks.floor_system --suite full --engine sparse
+    python -m benchmarks.floor_system --bays 10 20 --storeys 1 5 --no-charts
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+import scipy
+
+from steeldeckfem.core.fem_analyzer import FloorSystemFEMAnalyzer
+from steeldeckfem.core.model_generator import generate_floor_system
+from steeldeckfem.core.parametric_sweep import DEFAULT_LOADS, DEFAULT_PARAMETERS, build_layout
+from steeldeckfem.core.sparse_solver import DOF_PER_NODE
+
+HERE = Path(__file__).resolve().parent
+HISTORY_FILE = HERE / 'history.jsonl'
+THRESHOLDS_FILE = HERE / 'thresholds.json'
+
+BAY = 6.0  # m, in both directions
+
+# Bays per direction × storeys
+SUITES = {
+    'quick': {'bays': [2, 5, 10], 'storeys': [1, 3]},
+    'full': {'bays': [2, 5, 10, 20, 40], 'storeys': [1, 3, 10, 30]},
+}
+
+# Larger models are skipped per engine (PyNite takes minutes beyond this)
+ENGINE_MAX_DOF = {'pynite': 6000, 'sparse': None}
+
+# Reported phases -> RunProfiler phases of the analyzer and chart creator
+PHASE_GROUPS = {
+    'build': ('define_nodes', 'define_members', 'apply_supports', 'apply_loads'),
+    'solve': ('analyze',),
+    'force_extraction': ('extract_results', 'combinations', 'envelopes'),
+    'design_checks': ('design_checks',),
+    'charts': ('dashboard',),
+}
+
+# Records compared against (most recent clean runs of the same case)
+HISTORY_WINDOW = 5
+
+
+def case_key(bays: int, storeys: int, engine: str) -> str:
+    return f'{engine}-{bays}x{bays}-{storeys}s'
+
+
+def case_layout(bays: int, storeys: int):
+    """Square grid of bays × bays with BAY spacing"""
+    return build_layout(dict(DEFAULT_PARAMETERS, length=bays * BAY, width=bays * BAY,
+                             column_spacing_x=BAY, column_spacing_y=BAY, num_storeys=storeys))
+
+
+def benchmark_case(bays: int, storeys: int, engine: str, charts: bool = True,
+                   repeat: int = 1, max_dof: int = None) -> Dict:
+    """
+    Time one layout
+
+    Args:
+        bays: Bays in each direction
+        storeys: Number of storeys
+        engine: FloorSystemFEMAnalyzer engine
+        charts: Also time the Plotly dashboard
+        repeat: Runs per case; the fastest time of each phase is kept
+        max_dof: Skip models with more degrees of freedom
+
+    Returns:
+        Record with 'case', 'engine', 'bays', 'storeys', 'dof', 'status'
+        ('ok', 'skipped' or the error) and 'timings' {phase: seconds}
+    """
+    layout = case_layout(bays, storeys)
+    dof = generate_floor_system(layout).num_nodes * DOF_PER_NODE
+    record = {'case': case_key(bays, storeys, engine), 'engine': engine, 'bays': bays,
+              'storeys': storeys, 'dof': dof, 'status': 'ok', 'timings': {}}
+    if max_dof is not None and dof > max_dof:
+        record['status'] = 'skipped'
+        return record
+
+    runs = []
+    for _ in range(repeat):
+        analyzer = FloorSystemFEMAnalyzer(engine=engine)
+        analyzer.build_fem_model(layout, DEFAULT_LOADS)
+        results = analyzer.run_analysis(layout=layout)
+        if 'error' in results:
+            record['status'] = results['error']
+            return record
+        if charts:
+            # Imported on use: plotly is not needed for --no-charts runs
+            from steeldeckfem.core.plotly_charts import StructuralDiagramCreator
+            StructuralDiagramCreator(analyzer.profiler).create_complete_analysis_dashboard(
+                results, layout)
+
+        phases = {p['name']: p['wall_time'] for p in analyzer.profiler.phases}
+        timings = {group: sum(phases.get(name, 0.0) for name in names)
+                   for group, names in PHASE_GROUPS.items() if charts or group != 'charts'}
+        timings['total'] = sum(timings.values())
+        runs.append(timings)
+
+    record['timings'] = {phase: min(run[phase] for run in runs) for phase in runs[0]}
+    return record
+
+
+def environment() -> Dict:
+    """Machine and software versions stored with every record"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit or None,
+        'machine': f'{platform.node()} ({platform.machine()})',
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+    }
+
+
+def read_history(path: Path) -> List[Dict]:
+    """All records of a history file (none if it does not exist)"""
+    if not path.exists():
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path: Path, records: List[Dict]):
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def load_thresholds(path: Path) -> Dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_regressions(record: Dict, history: List[Dict], thresholds: Dict) -> List[str]:
+    """
+    Phases of a record that are slower than the history allows
+
+    A phase regresses when it is slower than ratio × the median of the last
+    HISTORY_WINDOW clean records of the same case and machine, and by more
+    than min_seconds (so that millisecond noise is ignored).
+
+    Returns:
+        One message per regressed phase
+    """
+    previous = [r for r in history
+                if r['case'] == record['case'] and r['machine'] == record['machine']
+                and r['status'] == 'ok' and not r.get('regressions')][-HISTORY_WINDOW:]
+    messages = []
+    for phase, seconds in record['timings'].items():
+        past = [r['timings'][phase] for r in previous if phase in r['timings']]
+        if not past:
+            continue
+        baseline = statistics.median(past)
+        limit = dict(thresholds['default'], **thresholds.get('phases', {}).get(phase, {}))
+        if seconds > baseline * limit['ratio'] and seconds - baseline > limit['min_seconds']:
+            messages.append(f"{record['case']} {phase}: {seconds:.3f} s vs {baseline:.3f} s "
+                            f"baseline (+{seconds / baseline - 1:.0%})")
+    return messages
+
+
+def run_suite(bays: Sequence[int], storeys: Sequence[int], engines: Sequence[str],
+              charts: bool = True, repeat: int = 1, history_path: Path = None,
+              thresholds_path: Path = THRESHOLDS_FILE, progress=None) -> List[Dict]:
+    """
+    Benchmark every grid size × storeys × engine
+
+    Args:
+        history_path: History file to compare with and append to (None:
+                      neither)
+        progress: Optional callback(record) after each case
+
+    Returns:
+        Records with their environment and 'regressions'
+    """
+    history = read_history(history_path) if history_path else []
+    thresholds = load_thresholds(thresholds_path)
+    env = environment()
+
+    records = []
+    for n, s, engine in itertools.product(bays, storeys, engines):
+        record = dict(env, **benchmark_case(n, s, engine, charts, repeat, ENGINE_MAX_DOF[engine]))
+        record['regressions'] = check_regressions(record, history, thresholds)
+        records.append(record)
+        if progress:
+            progress(record)
+
+    if history_path:
+        append_history(history_path, records)
+    return records
+
+
+def format_table(records: List[Dict]) -> str:
+    """Plain-text table: one line per case, seconds per phase"""
+    phases = list(PHASE_GROUPS) + ['total']
+    headers = ['case', 'dof'] + phases
+    lines = []
+    for r in records:
+        if r['status'] != 'ok':
+            lines.append([r['case'], str(r['dof'])] + [''] * (len(phases) - 1) + [r['status']])
+            continue
+        lines.append([r['case'], str(r['dof'])] +
+                     [f"{r['timings'][p]:.3f}" if p in r['timings'] else '-' for p in phases])
+    widths = [max(len(h), *(len(line[c]) for line in lines)) if lines else len(h)
+              for c, h in enumerate(headers)]
+    fmt = '  '.join(f'{{:>{w}}}' for w in widths)
+    return '\n'.join([fmt.format(*headers), fmt.format(*('-' * w for w in widths))] +
+                     [fmt.format(*line) for line in lines])
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.floor_system',
+        description='Scaling benchmarks of the floor system FEM')
+    parser.add_argument('--suite', choices=list(SUITES), default='quick')
+    parser.add_argument('--bays', nargs='+', type=int, metavar='N',
+                        help='bays per direction (overrides the suite)')
+    parser.add_argument('--storeys', nargs='+', type=int, metavar='N',
+                        help='storeys (overrides the suite)')
+    parser.add_argument('--engine', nargs='+', choices=list(ENGINE_MAX_DOF),
+                        default=list(ENGINE_MAX_DOF))
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='runs per case (fastest kept)')
+    parser.add_argument('--no-charts', action='store_true', help='skip the Plotly dashboard')
+    parser.add_argument('--history', type=Path, default=HISTORY_FILE,
+                        help='history file (JSON lines)')
+    parser.add_argument('--no-history', action='store_true',
+                        help='do not compare with or append to the history')
+    parser.add_argument('--thresholds', type=Path, default=THRESHOLDS_FILE)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Command line entry point: 0 ok, 1 regressions or failed cases"""
+    args = _parse_args(argv)
+    suite = SUITES[args.suite]
+
+    def report(record):
+        print(f"{record['case']}: {record['status']} "
+              f"({record['timings'].get('total', 0.0):.2f} s)", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    records = run_suite(args.bays or suite['bays'], args.storeys or suite['storeys'],
+                        args.engine, not args.no_charts, args.repeat,
+                        None if args.no_history else args.history, args.thresholds, report)
+    print(format_table(records))
+    print(f"\n{len(records)} cases in {time.perf_counter() - start:.1f} s")
+
+    regressions = [m for r in records for m in r['regressions']]
+    failed = [r['case'] for r in records if r['status'] not in ('ok', 'skipped')]
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    for case in failed:
+        print(f"FAILED {case}")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Standards Data Startup Benchmark
+Time to load vn_construction_standards.json in a fresh process: cold (parse
+the JSON, compile the lookup tables, write the snapshot), warm (memory-map
+the snapshot) and without any snapshot.
+
+Every measurement runs in a new interpreter, like a worker of a process
+pool; only the load itself is timed, not the imports. With --scale the
+steel section catalogues are replicated to show how the startup grows with
+the file.
+
+Usage:
+    python -m benchmarks.standards_startup
+    python -m benchmarks.standards_startup --scale 1 10 100 --repeat 7
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from steeldeckfem.core.vn_standards_loader import snapshot_path
+
+ROOT = Path(__file__).resolve().parent.parent
+STANDARDS_FILE = ROOT / 'vn_construction_standards.json'
+
+MODES = ('cold', 'warm', 'json')
+
+_TIMER = """
+import sys, time
+from steeldeckfem.core.vn_standards_loader import load_standards
+start = time.perf_counter()
+load_standards(sys.argv[1], snapshot=sys.argv[2] == '1')
+print(time.perf_counter() - start)
+"""
+
+
+def scaled_standards(path: Path, scale: int, source: Path = STANDARDS_FILE) -> Path:
+    """Copy of the standards file with every section catalogue `scale` times as long"""
+    with open(source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for catalogue in data['steelDesign']['vietnameseSteelSections'].values():
+        if isinstance(catalogue, dict):
+            for name, section in list(catalogue.items()):
+                for copy in range(1, scale):
+                    catalogue[f'{name}_{copy}'] = section
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    return path
+
+
+def load_seconds(json_path: Path, mode: str) -> float:
+    """Seconds to load the standards in a new interpreter"""
+    snapshot = snapshot_path(json_path)
+    if mode == 'cold':
+        snapshot.unlink(missing_ok=True)
+    output = subprocess.run([sys.executable, '-c', _TIMER, str(json_path), '0' if mode == 'json' else '1'],
+                            capture_output=True, text=True, check=True, cwd=ROOT).stdout
+    return float(output.split()[-1])
+
+
+def benchmark_startup(json_path: Path, repeat: int = 5) -> Dict:
+    """
+    Fastest of `repeat` loads per mode
+
+    Returns:
+        {'bytes', 'snapshot_bytes', 'cold', 'warm', 'json'} (seconds per mode)
+    """
+    record = {'bytes': json_path.stat().st_size}
+    for mode in MODES:
+        # a warm start reuses the snapshot of the previous cold one
+        record[mode] = min(load_seconds(json_path, mode) for _ in range(repeat))
+    record['snapshot_bytes'] = snapshot_path(json_path).stat().st_size
+    return record
+
+
+def format_table(records: List[Dict]) -> str:
+    """Plain-text table: one line per file size, milliseconds per mode"""
+    lines = [f"{'JSON KB':>8}  {'snapshot KB':>11}  " + '  '.join(f'{m + " ms":>8}' for m in MODES)]
+    for r in records:
+        lines.append(f"{r['bytes'] / 1024:8.0f}  {r['snapshot_bytes'] / 1024:11.0f}  " +
+                     '  '.join(f'{r[m] * 1000:8.2f}' for m in MODES))
+    return '\n'.join(lines)
+
+
+def run(scales: Sequence[int], repeat: int = 5) -> List[Dict]:
+    """Benchmark the standards file at every scale (in a temporary directory)"""
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = scaled_standards(Path(tmp) / f'standards_{scale}.json', scale)
+            records.append(dict(benchmark_startup(path, repeat), scale=scale))
+    return records
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.standards_startup',
+        description='Cold vs warm startup of the standards data loader')
+    parser.add_argument('--scale', nargs='+', type=int, default=[1, 10, 100], metavar='N',
+                        help='section catalogue multipliers')
+    parser.add_argument('--repeat', type=int, default=5, help='loads per mode (fastest kept)')
+    args = parser.parse_args(argv)
+    print(format_table(run(args.scale, args.repeat)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,8 +7,23 @@ __version__ = '1.0.0'
 __author__ = 'Steel Deck FEM Contributors'
 __license__ = 'MIT'
 
-from steeldeckfem.core.fem_analyzer import FloorSystemFEMAnalyzer
-from steeldeckfem.core.wind_zones import get_wind_pressure, WIND_ZONES, CITY_WIND_ZONES
+import importlib
+
+# Public names are imported on first access, so that entry points such as
+# steeldeckfem.batch start without loading the analysis stack
+_LAZY_IMPORTS = {
+    'FloorSystemFEMAnalyzer': 'steeldeckfem.core.fem_analyzer',
+    'get_wind_pressure': 'steeldeckfem.core.wind_zones',
+    'WIND_ZONES': 'steeldeckfem.core.wind_zones',
+    'CITY_WIND_ZONES': 'steeldeckfem.core.wind_zones',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'FloorSystemFEMAnalyzer',
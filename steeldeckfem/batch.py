@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Headless Batch Runner
+Run design checks from JSON/CSV job files without a display.
+
+Each job names a designer ('type') and its parameters. The designer is
+constructed from the parameters matching its constructor and every check
+method whose required arguments are present is run (or only the methods
+listed in 'checks'). Results are written as JSON Lines, one per job.
+
+Job files:
+    JSON   - a list of jobs or {"jobs": [...]}
+    JSONL  - one job per line
+    CSV    - one job per row; columns 'id', 'type', 'checks' (';' separated)
+             and the parameters
+
+    {"id": "B1", "type": "rc_beam", "b": 300, "h": 600, "L": 6.0, "M_u": 180, "V_u": 120}
+
+Usage:
+    steeldeckfem-batch jobs.csv -o results.jsonl -j 8
+    steeldeckfem-batch --list
+
+This module never imports PyQt5 or matplotlib (floor system jobs use the
+sparse FEM engine) and imports designers only in the workers that use them.
+"""
+
+import argparse
+import csv
+import importlib
+import inspect
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List
+
+# Job type -> (module, class, check methods)
+DESIGNERS = {
+    'rc_beam': ('steeldeckfem.core.rc_beam_designer', 'RCBeamDesigner',
+                ('design_flexure', 'design_shear', 'check_deflection')),
+    'rc_slab': ('steeldeckfem.core.rc_slab_designer', 'RCSlabDesigner',
+                ('design_one_way', 'design_two_way', 'check_punching_shear')),
+    'isolated_footing': ('steeldeckfem.core.foundation_designer', 'IsolatedFootingDesigner',
+                         ('design_footing_size', 'check_punching_shear', 'design_reinforcement')),
+    'steel_beam': ('steeldeckfem.core.steel_designer', 'SteelIBeamDesigner',
+                   ('check_bending', 'check_shear', 'check_deflection')),
+    'connection': ('steeldeckfem.core.connection_designer', 'ConnectionDesigner',
+                   ('check_bolted_connection', 'check_welded_connection', 'design_base_plate')),
+}
+
+# Floor system FEM jobs (FloorSystemFEMAnalyzer via the parametric sweep runner)
+FLOOR_SYSTEM = 'floor_system'
+FLOOR_LOAD_KEYS = ('live_load', 'dead_load_finish', 'wind_load', 'seismic_load')
+
+JOB_TYPES = tuple(DESIGNERS) + (FLOOR_SYSTEM,)
+_RESERVED = ('id', 'type', 'checks')
+
+
+class JobError(ValueError):
+    """Invalid job definition"""
+
+
+def _designer(job_type: str):
+    module, name, checks = DESIGNERS[job_type]
+    return getattr(importlib.import_module(module), name), checks
+
+
+def _call(func, params: Dict, required_only: bool = False):
+    """Call func with the parameters it accepts (None if a required one is missing)"""
+    kwargs = {}
+    for name, p in inspect.signature(func).parameters.items():
+        if name == 'self' or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD):
+            continue
+        if name in params:
+            kwargs[name] = params[name]
+        elif p.default is p.empty:
+            if required_only:
+                return None
+            raise JobError(f"missing parameter '{name}'")
+    return kwargs
+
+
+def run_design_job(job_type: str, params: Dict, checks: List[str] = None) -> Dict:
+    """
+    Run the checks of one designer
+
+    Args:
+        job_type: Key of DESIGNERS
+        params: Constructor and check parameters (flat)
+        checks: Check methods to run (default: all with their arguments present)
+
+    Returns:
+        Check method -> result
+    """
+    cls, available = _designer(job_type)
+    unknown = set(checks or ()) - set(available)
+    if unknown:
+        raise JobError(f"unknown check(s) for {job_type}: {', '.join(sorted(unknown))}")
+
+    designer = cls(**_call(cls.__init__, params)) if cls.__init__ is not object.__init__ else cls()
+    results = {}
+    for method in checks or available:
+        func = getattr(designer, method)
+        kwargs = _call(func, params, required_only=checks is None)
+        if kwargs is not None:
+            results[method] = func(**kwargs)
+    if not results:
+        raise JobError(f"no check of {job_type} has its parameters ({', '.join(available)})")
+    return results
+
+
+def run_floor_system_job(params: Dict) -> Dict:
+    """Build and solve one floor system layout (sparse engine)"""
+    from steeldeckfem.core.parametric_sweep import DEFAULT_LOADS, DEFAULT_PARAMETERS, run_case
+
+    if params.get('engine', 'sparse') != 'sparse':
+        raise JobError("batch floor system jobs use the sparse engine (PyNite loads matplotlib)")
+    unknown = set(params) - set(DEFAULT_PARAMETERS) - set(FLOOR_LOAD_KEYS) - {'engine'}
+    if unknown:
+        raise JobError(f"unknown floor system parameter(s): {', '.join(sorted(unknown))}")
+
+    layout = {k: v for k, v in params.items() if k in DEFAULT_PARAMETERS}
+    loads = dict(DEFAULT_LOADS, **{k: v for k, v in params.items() if k in FLOOR_LOAD_KEYS})
+    row = run_case(0, dict(DEFAULT_PARAMETERS, **layout), loads, engine='sparse')
+    if row['status'] != 'Analysis Complete':
+        raise RuntimeError(row['status'])
+    return {key: row[key] for key in ('steel_tonnage', 'max_deflection', 'max_reaction')}
+
+
+def run_job(job: Dict) -> Dict:
+    """
+    Run one job (in a worker process)
+
+    Returns:
+        JSON Lines record: id, type, status ('ok' or 'error'), results or
+        error, elapsed (s)
+    """
+    start = time.perf_counter()
+    record = {'id': job.get('id'), 'type': job.get('type')}
+    params = {k: v for k, v in job.items() if k not in _RESERVED}
+    try:
+        job_type = job.get('type')
+        if job_type == FLOOR_SYSTEM:
+            results = run_floor_system_job(params)
+        elif job_type in DESIGNERS:
+            results = run_design_job(job_type, params, job.get('checks'))
+        else:
+            raise JobError(f"unknown job type {job_type!r} (available: {', '.join(JOB_TYPES)})")
+        record.update(status='ok', results=results)
+    except Exception as e:
+        record.update(status='error', error=f'{type(e).__name__}: {e}')
+    record['elapsed'] = time.perf_counter() - start
+    return record
+
+
+# ----------------------------------------------------------------------
+# Job files
+# ----------------------------------------------------------------------
+def _parse_value(text: str):
+    """CSV cell -> int, float, bool, None or str"""
+    text = text.strip()
+    if text == '':
+        return None
+    lowered = text.lower()
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def read_jobs(path: str) -> List[Dict]:
+    """
+    Read a JSON, JSON Lines or CSV job file ('-' reads JSON/JSONL from stdin)
+
+    Jobs without an id are numbered in file order.
+    """
+    if path == '-':
+        text, ext = sys.stdin.read(), '.json'
+    else:
+        ext = os.path.splitext(path)[1].lower()
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            text = f.read()
+
+    if ext == '.csv':
+        jobs = []
+        for row in csv.DictReader(text.splitlines()):
+            job = {k.strip(): _parse_value(v) for k, v in row.items() if k and v is not None}
+            job = {k: v for k, v in job.items() if v is not None}
+            if isinstance(job.get('checks'), str):
+                job['checks'] = [c.strip() for c in job['checks'].split(';') if c.strip()]
+            jobs.append(job)
+    else:
+        stripped = text.lstrip()
+        if stripped.startswith('[') or stripped.startswith('{"jobs"') or ext == '.json':
+            data = json.loads(text)
+            if isinstance(data, dict):
+                jobs = data['jobs'] if 'jobs' in data else [data]
+            else:
+                jobs = data
+            if not isinstance(jobs, list):
+                raise JobError('expected a list of jobs or {"jobs": [...]}')
+        else:
+            jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    for n, job in enumerate(jobs, start=1):
+        if not isinstance(job, dict):
+            raise JobError(f"job {n} is not an object")
+        job.setdefault('id', n)
+    return jobs
+
+
+def _json_default(value):
+    """Serialize NumPy scalars/arrays and other non-JSON values"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def _clean(value):
+    """Replace NaN/inf (not valid JSON) by None"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    return value
+
+
+def run_batch(jobs: List[Dict], workers: int = None) -> Iterator[Dict]:
+    """
+    Run jobs through a process pool and yield records in job order
+
+    Args:
+        jobs: Job dictionaries
+        workers: Worker processes (default: all cores; 1 runs in-process)
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(jobs) <= 1:
+        yield from map(run_job, jobs)
+        return
+    # Many small jobs: hand them out in chunks to amortize the IPC
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        yield from executor.map(run_job, jobs, chunksize=chunksize)
+
+
+def write_records(records: Iterable[Dict], out) -> Dict[str, int]:
+    """Write records as JSON Lines; returns the count per status"""
+    counts = {'ok': 0, 'error': 0}
+    for record in records:
+        counts[record['status']] += 1
+        out.write(json.dumps(_clean(record), ensure_ascii=False, default=_json_default,
+                             allow_nan=False) + '\n')
+    out.flush()
+    return counts
+
+
+def describe_job_types() -> str:
+    """Job types with their constructor and check parameters"""
+    lines = []
+    for job_type in DESIGNERS:
+        cls, checks = _designer(job_type)
+        lines.append(f"{job_type} ({cls.__name__})")
+        if cls.__init__ is not object.__init__:
+            lines.append(f"    init{inspect.signature(cls.__init__)}".replace('(self, ', '('))
+        for method in checks:
+            lines.append(f"    {method}{inspect.signature(getattr(cls, method))}".replace('(self, ', '('))
+    from steeldeckfem.core.parametric_sweep import DEFAULT_PARAMETERS
+    lines.append(f"{FLOOR_SYSTEM} (FloorSystemFEMAnalyzer, sparse engine)")
+    lines.append(f"    {', '.join(list(DEFAULT_PARAMETERS) + list(FLOOR_LOAD_KEYS))}")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        prog='steeldeckfem-batch',
+        description='Run design checks from JSON/CSV job files (headless)')
+    parser.add_argument('jobs', nargs='*', help="job files (.json, .jsonl, .csv; '-' for stdin)")
+    parser.add_argument('-o', '--output', help='JSON Lines output file (default: stdout)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('--list', action='store_true', help='list job types and parameters')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print(describe_job_types())
+        return 0
+    if not args.jobs:
+        parser.error('no job files given')
+
+    try:
+        jobs = [job for path in args.jobs for job in read_jobs(path)]
+    except (OSError, ValueError) as e:
+        print(f"steeldeckfem-batch: {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            counts = write_records(run_batch(jobs, args.workers), out)
+    else:
+        counts = write_records(run_batch(jobs, args.workers), sys.stdout)
+    print(f"{len(jobs)} jobs: {counts['ok']} ok, {counts['error']} failed "
+          f"in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return 0 if counts['error'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,33 +4,82 @@ VietStruct FEM - Core Package
 Steel structure analysis for Vietnamese engineers
 """
 
+import importlib
+
 # Helpers
 from .helpers import remove_diacritics, format_number
 
-# FEM Analysis
-from .fem_analyzer import FloorSystemFEMAnalyzer
-
-# Wind zones
-from .wind_zones import WIND_ZONES, CITY_WIND_ZONES, get_wind_pressure, get_all_locations
-
-# Floor system calculators
-from .complete_floor_system import CompleteFloorSystemCalculator, FloorSystemLayout, ColumnSpec, BeamSpec
-from .floor_deck import SteelDeckCalculator, DeckDesignResult, CompositeBeamResult, FloorLoadDistributor
+# Public names are imported from their submodule on first access, so that a
+# batch worker or a single designer does not load scipy and the FEM stack
+_LAZY_IMPORTS = {
+    # FEM Analysis
+    'FloorSystemFEMAnalyzer': 'fem_analyzer',
+    'SparseFrameModel': 'sparse_solver',
+    'FloorSystemTopology': 'model_generator',
+    'generate_floor_system': 'model_generator',
+    'ElementForces': 'force_recovery',
+    'MemberForceDiagrams': 'force_recovery',
+    'FEMResults': 'fem_results',
+    'ModalResults': 'fem_results',
+    'AnalysisCache': 'analysis_cache',
+    'analysis_key': 'analysis_cache',
+    'get_analysis_cache': 'analysis_cache',
+    'ParametricSweep': 'parametric_sweep',
+    'expand_grid': 'parametric_sweep',
+    'build_layout': 'parametric_sweep',
+    'MemberDesignChecker': 'design_checks',
+    'DesignCheckResults': 'design_checks',
+    'RunProfiler': 'profiling',
+    'InfluenceLines': 'moving_load',
+    'MovingLoadEnvelope': 'moving_load',
+    'WheelTrain': 'moving_load',
+    # Wind zones
+    'WIND_ZONES': 'wind_zones',
+    'CITY_WIND_ZONES': 'wind_zones',
+    'get_wind_pressure': 'wind_zones',
+    'get_all_locations': 'wind_zones',
+    # Floor system calculators
+    'CompleteFloorSystemCalculator': 'complete_floor_system',
+    'FloorSystemLayout': 'complete_floor_system',
+    'ColumnSpec': 'complete_floor_system',
+    'BeamSpec': 'complete_floor_system',
+    'SteelDeckCalculator': 'floor_deck',
+    'DeckDesignResult': 'floor_deck',
+    'CompositeBeamResult': 'floor_deck',
+    'FloorLoadDistributor': 'floor_deck',
+    # Engineering (Industrial buildings - purlin, portal frames)
+    'PurlinCalculator': 'engineering',
+    'WindLoadCalculator': 'engineering',
+    'FrameLoadCalculator': 'engineering',
+    'MemberChecker': 'engineering',
+    # Stability analysis
+    'StabilityCalculator': 'stability',
+    'StabilityResult': 'stability',
+    'LateralTorsionalBuckling': 'stability',
+    # Plotly visualization (headless runs skip plotly)
+    'StructuralDiagramCreator': 'plotly_charts',
+}
 
-# Engineering (Industrial buildings - purlin, portal frames)
-from .engineering import PurlinCalculator, WindLoadCalculator, FrameLoadCalculator, MemberChecker
 
-# Stability analysis
-from .stability import StabilityCalculator, StabilityResult, LateralTorsionalBuckling
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(f'.{_LAZY_IMPORTS[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Plotly visualization
-from .plotly_charts import StructuralDiagramCreator
 
 __all__ = [
     # Helpers
     'remove_diacritics', 'format_number',
     # FEM
-    'FloorSystemFEMAnalyzer',
+    'FloorSystemFEMAnalyzer', 'SparseFrameModel', 'FloorSystemTopology', 'generate_floor_system',
+    'ElementForces', 'MemberForceDiagrams', 'FEMResults', 'ModalResults',
+    'AnalysisCache', 'analysis_key', 'get_analysis_cache',
+    'ParametricSweep', 'expand_grid', 'build_layout',
+    'MemberDesignChecker', 'DesignCheckResults', 'RunProfiler',
+    'InfluenceLines', 'MovingLoadEnvelope', 'WheelTrain',
     # Wind
     'WIND_ZONES', 'CITY_WIND_ZONES', 'get_wind_pressure', 'get_all_locations',
     # Floor system
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Analysis Cache
+Content-addressed cache of FEM analysis results keyed by a layout hash.
+
+The key is a SHA-256 hash of the layout geometry, section specs, loads and
+analysis options, so unchanged inputs map to the same entry regardless of
+how the layout object was built (SimpleNamespace, dataclass, dict).
+Entries live in an in-memory LRU and are written through to an on-disk
+store, so repeated analyses return instantly, also after a restart.
+"""
+
+import dataclasses
+import enum
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Bump when the cached results format changes
+CACHE_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory (STEELDECKFEM_CACHE_DIR overrides)"""
+    env = os.environ.get('STEELDECKFEM_CACHE_DIR')
+    if env:
+        return Path(env)
+    if os.name == 'nt':
+        base = Path(os.environ.get('LOCALAPPDATA', Path.home() / 'AppData' / 'Local'))
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache'))
+    return base / 'steeldeckfem' / 'analysis'
+
+
+def _canonical(value) -> Any:
+    """JSON-serializable, order-independent form of a layout/loads object"""
+    if isinstance(value, enum.Enum):
+        return _canonical(value.value)
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # 5.0 and 5 describe the same model
+        return repr(float(value))
+    if isinstance(value, dict):
+        return {str(_canonical(k)): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    if dataclasses.is_dataclass(value):
+        return _canonical(dataclasses.asdict(value))
+    if hasattr(value, '__dict__'):
+        return _canonical({k: v for k, v in vars(value).items() if not k.startswith('_')})
+    raise TypeError(f"Cannot hash value of type {type(value).__name__}")
+
+
+def value_nbytes(value, _seen=None) -> int:
+    """
+    Approximate memory of a cached value: the bytes of every NumPy array
+    and string reachable through containers and object attributes (each
+    counted once)
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        base = value if value.base is None or not isinstance(value.base, np.ndarray) else value.base
+        if base is not value:
+            return value_nbytes(base, seen)
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(value_nbytes(k, seen) + value_nbytes(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(value_nbytes(v, seen) for v in value)
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return value_nbytes(vars(value), seen)
+    return 0
+
+
+def analysis_key(layout, loads: Dict, **options) -> str:
+    """
+    Stable hash of an analysis input
+
+    Args:
+        layout: Floor system layout (with column/beam section specs)
+        loads: Loads dictionary
+        **options: Analysis options (engine, combinations, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {'version': CACHE_VERSION, 'layout': layout, 'loads': loads, 'options': options}
+    text = json.dumps(_canonical(payload), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """
+    In-memory LRU of analysis results with an on-disk spill store
+
+    Args:
+        max_memory_bytes: Size cap of the in-memory entries, measured with
+                          value_nbytes() (least recently used evicted first;
+                          a larger entry stays on disk only)
+        max_entries: Entries kept in memory at most
+        cache_dir: On-disk store directory; None keeps the cache in memory only
+        max_disk_bytes: Size cap of the on-disk store (oldest files removed first)
+    """
+
+    def __init__(self, max_memory_bytes: int = 512 * 1024**2, max_entries: int = 64,
+                 cache_dir: Optional[os.PathLike] = None, max_disk_bytes: int = 512 * 1024**2):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.memory_bytes = 0
+        self._memory = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._write_warned = False
+
+    def __len__(self):
+        return len(self._memory)
+
+    def __contains__(self, key: str):
+        return key in self._memory or (self._path(key) is not None and self._path(key).exists())
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f'{key}.pkl' if self.cache_dir is not None else None
+
+    def get(self, key: str):
+        """Cached value, or None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        value = self._load(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value):
+        """Store a value in memory and on disk"""
+        with self._lock:
+            self._remember(key, value)
+        self._store(key, value)
+
+    def clear(self, disk: bool = True):
+        """Drop all entries (and the on-disk store)"""
+        with self._lock:
+            self._memory.clear()
+            self._sizes.clear()
+            self.memory_bytes = 0
+        if disk and self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob('*.pkl'):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, value):
+        self.memory_bytes -= self._sizes.pop(key, 0)
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        self._sizes[key] = value_nbytes(value)
+        self.memory_bytes += self._sizes[key]
+        while self._memory and (len(self._memory) > self.max_entries or
+                                self.memory_bytes > self.max_memory_bytes):
+            evicted, _ = self._memory.popitem(last=False)
+            self.memory_bytes -= self._sizes.pop(evicted)
+
+    def _load(self, key: str):
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except Exception:
+            # Truncated or written by an incompatible version
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return value
+
+    def _store(self, key: str, value):
+        if self.cache_dir is None:
+            return
+        tmp = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except Exception as e:
+            # An unwritable store is reported once; the cache keeps working in memory
+            if not self._write_warned:
+                self._write_warned = True
+                print(f"⚠️  Could not write analysis cache: {e}")
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+            return
+        self._prune()
+
+    def _prune(self):
+        """Remove the least recently used files above max_disk_bytes"""
+        files = sorted(self.cache_dir.glob('*.pkl'), key=lambda p: p.stat().st_mtime, reverse=True)
+        total = 0
+        for path in files:
+            total += path.stat().st_size
+            if total > self.max_disk_bytes:
+                path.unlink(missing_ok=True)
+
+
+_analysis_cache = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get the global analysis cache (persisted in default_cache_dir())"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache(cache_dir=default_cache_dir())
+    return _analysis_cache
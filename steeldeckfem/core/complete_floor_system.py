@@ -69,6 +69,9 @@ class FloorSystemLayout:
     
     # Column
     column_spec: ColumnSpec = None
+    
+    # Number of identical storeys (FEM model)
+    num_storeys: int = 1
 
 
 class CompleteFloorSystemCalculator:
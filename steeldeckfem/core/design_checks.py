@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Member Design Checks
+Vectorized strength, stability and deflection unity checks of all members.
+
+Every check is evaluated for all members and load combinations at once from
+the exact member force extremes (see force_recovery):
+
+    strength   - N-M interaction of the cross-section
+                 (SteelBoxColumnDesigner.check_combined_loading)
+    shear      - web / flange shear (SteelIBeamDesigner.check_shear)
+    stability  - N-M interaction with the flexural buckling coefficient of
+                 StabilityCalculator (columns; beams are braced by the deck)
+    deflection - beams: midspan deflection relative to the member chord,
+                 L/360 (SteelIBeamDesigner.check_deflection); columns:
+                 storey drift, h/500
+
+Strength, shear and stability use the ULS combinations, deflection the SLS
+combinations. The unity check of a member is its largest ratio; the check
+and load combination giving it are reported as governing.
+"""
+
+import math
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from steeldeckfem.core.fem_results import FEMResults
+from steeldeckfem.core.stability import StabilityCalculator
+from steeldeckfem.core.steel_designer import SteelSectionDatabase
+
+CHECKS = ('strength', 'shear', 'stability', 'deflection')
+MEMBER_GROUPS = ('column', 'main_beam', 'secondary_beam')
+
+STATUS_OK = 'ĐẠT'
+STATUS_FAIL = 'KHÔNG ĐẠT'
+
+E_STEEL = 200000  # MPa
+PHI = 0.9         # Resistance factor (as SteelIBeamDesigner)
+
+# Stations per member for the deflection integral (odd: Simpson's rule)
+_DEFLECTION_POINTS = 21
+
+
+def buckling_coefficient(lambda_bar: np.ndarray, curve_type: str = 'b') -> np.ndarray:
+    """
+    Buckling coefficient φ of StabilityCalculator.calculate_buckling_coefficient
+    for an array of normalized slenderness values
+    """
+    curve = StabilityCalculator().buckling_curves.get(curve_type)
+    if curve is None:
+        curve = StabilityCalculator().buckling_curves['b']
+    lambda_bar = np.asarray(lambda_bar, dtype=np.float64)
+    Phi = 0.5 * (1 + curve['alpha'] * (lambda_bar - curve['lambda_0']) + lambda_bar**2)
+    discriminant = Phi**2 - lambda_bar**2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        phi = 1.0 / (Phi + np.sqrt(np.maximum(discriminant, 0.0)))
+    phi = np.where(discriminant < 0, 0.1, np.clip(phi, 0.1, 1.0))
+    return np.where(lambda_bar <= 0.2, 1.0, phi)
+
+
+def section_properties(spec) -> Dict[str, float]:
+    """
+    Design properties of a column/beam spec (mm units)
+
+    Args:
+        spec: ColumnSpec/BeamSpec-like object with h, b, tf, tw (mm), area
+              (cm²), ix (cm⁴) and optionally wx (cm³)
+
+    Returns:
+        A, Ix, Iy (weak axis), Wx, Wy, rx, ry, Aw (web) and Af (flanges)
+    """
+    h, b = spec.h, spec.b
+    tf, tw = getattr(spec, 'tf', 0) or 0, getattr(spec, 'tw', 0) or 0
+    A = spec.area * 100
+    Ix = spec.ix * 1e4
+    Wx = (getattr(spec, 'wx', 0) or 0) * 1000 or 2 * Ix / h
+    if tf > 0 and tw > 0:
+        Iy = 2 * tf * b**3 / 12 + (h - 2 * tf) * tw**3 / 12
+        Aw, Af = (h - 2 * tf) * tw, 2 * b * tf
+    else:
+        # Closed or unknown shape: treat as doubly symmetric
+        Iy, Aw, Af = Ix, A / 2, A / 2
+    return {
+        'A': A, 'Ix': Ix, 'Iy': Iy, 'Wx': Wx, 'Wy': 2 * Iy / b,
+        'rx': math.sqrt(Ix / A), 'ry': math.sqrt(Iy / A), 'Aw': Aw, 'Af': Af,
+    }
+
+
+@dataclass
+class DesignCheckResults:
+    """
+    Unity checks of all checked members
+
+    Arrays:
+        ratios:      (n_checks, n_members) governing ratio of every check
+        combination: (n_checks, n_members) index into combinations
+        unity:       (n_members,) largest ratio
+        governing:   (n_members,) index into CHECKS
+    """
+    members: List[str]
+    groups: List[str]               # member group per member
+    sections: List[str]             # section name per member
+    combinations: List[str]
+    ratios: np.ndarray
+    combination: np.ndarray
+    unity: np.ndarray
+    governing: np.ndarray
+
+    def failing(self, limit: float = 1.0) -> List[str]:
+        """Members with a unity check above limit"""
+        return [self.members[m] for m in np.flatnonzero(self.unity > limit)]
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """
+        {member: {'group', 'section', 'unity_check', 'status', 'governing',
+        'combination', <check>: ratio}} (the 'design_checks' results entry)
+        """
+        ratios = self.ratios.T.tolist()
+        unity = self.unity.tolist()
+        governing = self.governing.tolist()
+        combination = self.combination[self.governing, np.arange(len(self.members))].tolist()
+        checks = {}
+        for m, name in enumerate(self.members):
+            checks[name] = {
+                'group': self.groups[m],
+                'section': self.sections[m],
+                'unity_check': unity[m],
+                'status': STATUS_OK if unity[m] <= 1.0 else STATUS_FAIL,
+                'governing': CHECKS[governing[m]],
+                'combination': self.combinations[combination[m]],
+                **dict(zip(CHECKS, ratios[m])),
+            }
+        return checks
+
+
+class MemberDesignChecker:
+    """
+    Vectorized design checks of columns, main beams and secondary beams
+
+    Args:
+        steel_grade: Key of SteelSectionDatabase.STEEL_GRADES
+        column_k: Effective length factor of columns (both axes)
+        curve_type: Buckling curve of StabilityCalculator ('a', 'b' or 'c')
+        deflection_limit: Beam deflection limit L/deflection_limit
+        drift_limit: Column drift limit h/drift_limit
+    """
+
+    def __init__(self, steel_grade: str = 'SS400', column_k: float = 1.0,
+                 curve_type: str = 'b', deflection_limit: float = 360,
+                 drift_limit: float = 500):
+        steel = SteelSectionDatabase.STEEL_GRADES.get(steel_grade,
+                                                      SteelSectionDatabase.STEEL_GRADES['SS400'])
+        self.Fy = steel['Fy']
+        self.column_k = column_k
+        self.curve_type = curve_type
+        self.deflection_limit = deflection_limit
+        self.drift_limit = drift_limit
+
+    def check(self, results: FEMResults, limit_states: Sequence[str],
+              members: Dict[str, Sequence[str]], specs: Dict[str, object],
+              member_nodes: Optional[np.ndarray] = None) -> DesignCheckResults:
+        """
+        Check all members for all load combinations
+
+        Args:
+            results: FEMResults with one "case" per load combination
+            limit_states: 'ULS' or 'SLS' per combination
+            members: Member group (MEMBER_GROUPS) -> member names
+            specs: Member group -> section spec (see section_properties)
+            member_nodes: (n_members, 2) end node indices into
+                          results.node_names of all results members, for
+                          the column drift check (skipped if None)
+
+        Returns:
+            DesignCheckResults of the grouped members
+        """
+        limit_states = np.asarray(limit_states)
+        uls = np.flatnonzero(limit_states == 'ULS')
+        sls = np.flatnonzero(limit_states == 'SLS')
+
+        names = [name for group in MEMBER_GROUPS for name in members.get(group, ())]
+        group_of = [group for group in MEMBER_GROUPS for _ in members.get(group, ())]
+        rows = np.array([results.member_index[name] for name in names], dtype=np.int64)
+        group_idx = np.array([MEMBER_GROUPS.index(g) for g in group_of], dtype=np.int64)
+        is_column = group_idx == MEMBER_GROUPS.index('column')
+
+        # Section properties per member (one row per group, then gathered)
+        props = [section_properties(specs[g]) if g in specs and members.get(g) else None
+                 for g in MEMBER_GROUPS]
+        sec = {key: np.array([p[key] if p else np.nan for p in props])[group_idx]
+               for key in ('A', 'Ix', 'Iy', 'Wx', 'Wy', 'rx', 'ry', 'Aw', 'Af')}
+        length = results.element_forces.member_length[rows] * 1000  # mm
+
+        n_members = len(names)
+        ratios = np.zeros((len(CHECKS), n_members))
+        combination = np.zeros((len(CHECKS), n_members), dtype=np.int64)
+
+        if len(uls):
+            strength, stability, shear = self._uls_ratios(results, uls, rows, sec, length, is_column)
+            for k, ratio in zip(('strength', 'stability', 'shear'), (strength, stability, shear)):
+                c = CHECKS.index(k)
+                combination[c] = uls[ratio.argmax(axis=0)]
+                ratios[c] = ratio.max(axis=0)
+
+        if len(sls):
+            deflection = np.zeros((len(sls), n_members))
+            beams = np.flatnonzero(~is_column)
+            if len(beams):
+                deflection[:, beams] = self._beam_deflection(
+                    results, sls, [names[m] for m in beams], sec['Ix'][beams], length[beams])
+            columns = np.flatnonzero(is_column)
+            if len(columns) and member_nodes is not None:
+                deflection[:, columns] = self._column_drift(
+                    results, sls, member_nodes[rows[columns]], length[columns])
+            c = CHECKS.index('deflection')
+            combination[c] = sls[deflection.argmax(axis=0)]
+            ratios[c] = deflection.max(axis=0)
+
+        governing = ratios.argmax(axis=0)
+        section_names = [getattr(specs.get(g), 'name', g) for g in MEMBER_GROUPS]
+        return DesignCheckResults(
+            members=names,
+            groups=group_of,
+            sections=[section_names[g] for g in group_idx.tolist()],
+            combinations=list(results.load_cases),
+            ratios=ratios,
+            combination=combination,
+            unity=ratios[governing, np.arange(n_members)],
+            governing=governing,
+        )
+
+    def _uls_ratios(self, results, uls, rows, sec, length, is_column):
+        """Strength, stability and shear ratios, (n_uls, n_members) each"""
+        extremes = results.extremes
+
+        def peak(component):
+            e = extremes[component]
+            return np.maximum(np.abs(e['max'][uls][:, rows]), np.abs(e['min'][uls][:, rows]))
+
+        # Compression positive
+        compression = np.maximum(extremes['axial']['max'][uls][:, rows], 0.0)
+        tension = np.maximum(-extremes['axial']['min'][uls][:, rows], 0.0)
+
+        Fy = self.Fy
+        phi_P_y = PHI * Fy * sec['A'] / 1000          # kN
+        phi_M_nx = PHI * Fy * sec['Wx'] / 1e6         # kNm
+        phi_M_ny = PHI * Fy * sec['Wy'] / 1e6
+        moment_ratio = peak('moment_y') / phi_M_nx + peak('moment_z') / phi_M_ny
+
+        # Flexural buckling (columns only; beams are braced by the deck)
+        lambda_cr = math.pi * math.sqrt(E_STEEL / Fy)
+        slenderness = self.column_k * length / np.minimum(sec['rx'], sec['ry'])
+        phi_b = np.where(is_column, buckling_coefficient(slenderness / lambda_cr, self.curve_type), 1.0)
+
+        axial_ratio = np.maximum(compression, tension) / phi_P_y
+        strength = _interaction(axial_ratio, moment_ratio)
+        stability = np.where(is_column, _interaction(compression / (phi_b * phi_P_y), moment_ratio), 0.0)
+
+        phi_V_z = PHI * 0.6 * Fy * sec['Aw'] / 1000  # kN
+        phi_V_y = PHI * 0.6 * Fy * sec['Af'] / 1000
+        shear = np.maximum(peak('shear_z') / phi_V_z, peak('shear_y') / phi_V_y)
+        return strength, stability, shear
+
+    def _beam_deflection(self, results, sls, beams, Ix, length):
+        """
+        Midspan deflection relative to the member chord over L/deflection_limit
+
+        Virtual work with a unit midspan load on the simply supported member:
+        δ = ∫ M(x)·m(x) / EI dx, m(x) = min(x, L - x) / 2, by Simpson's rule
+        """
+        forces = results.element_forces
+        forces = replace(forces, forces=forces.forces[sls], loads=forces.loads[sls])
+        diagrams = forces.diagrams(_DEFLECTION_POINTS, beams)
+        moment = diagrams.values['moment_y']        # kNm
+        x = diagrams.positions                       # m
+        L = x[:, -1:]
+        unit_moment = np.minimum(x, L - x) / 2
+
+        weights = np.ones(_DEFLECTION_POINTS)
+        weights[1:-1:2], weights[2:-1:2] = 4, 2
+        weights = weights[None, :] * (L / (_DEFLECTION_POINTS - 1)) / 3
+
+        EI = E_STEEL * 1e3 * Ix * 1e-12            # kN·m² (MPa → kN/m², mm⁴ → m⁴)
+        delta = np.abs((moment * unit_moment * weights).sum(axis=-1)) / EI * 1000  # mm
+        return delta / (length / self.deflection_limit)
+
+    def _column_drift(self, results, sls, nodes, length):
+        """Horizontal displacement between column ends over h/drift_limit"""
+        d = results.displacements[sls][:, :, :2]
+        drift = np.linalg.norm(d[:, nodes[:, 1]] - d[:, nodes[:, 0]], axis=-1) * 1000  # mm
+        return drift / (length / self.drift_limit)
+
+
+def _interaction(axial_ratio, moment_ratio):
+    """N-M interaction (SteelBoxColumnDesigner.check_combined_loading)"""
+    return np.where(axial_ratio >= 0.2,
+                    axial_ratio + 8 / 9 * moment_ratio,
+                    axial_ratio / 2 + moment_ratio)
+
+
+def governing_check(design_checks: Dict[str, Dict], name: str, storey: int = 1) -> Optional[Dict]:
+    """
+    Design check of a member, or the governing check of its segments
+
+    Main beams are split into one member per span (MB_Y0_S0, MB_Y0_S1...);
+    looking up 'MB_Y0' returns the span with the largest unity check.
+
+    Args:
+        design_checks: Checks by member name (DesignCheckResults.as_dict())
+        name: First-storey member or main beam line name, as shown on the plan
+        storey: Storey to look up; the copies on storey 2 and above carry a
+                '_F{storey}' suffix and are never matched for another storey
+
+    Returns:
+        Check dict, or None if the member has no check
+    """
+    suffix = f'_F{storey}' if storey > 1 else ''
+    if name + suffix in design_checks:
+        return design_checks[name + suffix]
+    pattern = re.compile(re.escape(name) + r'_S\d+' + re.escape(suffix))
+    segments = [check for member, check in design_checks.items() if pattern.fullmatch(member)]
+    return max(segments, key=lambda check: check['unity_check']) if segments else None
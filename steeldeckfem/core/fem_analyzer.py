@@ -3,33 +3,167 @@ PyNite FEM Analyzer for Steel Deck Floor Systems
 Provides finite element analysis for columns, beams, and deck structures
 """
 
-from Pynite import FEModel3D
+import copy
+import json
 import numpy as np
-from typing import Dict, List, Tuple, Any
+import scipy.sparse as sp
+from collections.abc import Mapping
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Any, Union
+
+from steeldeckfem.core.sparse_solver import ORDERINGS, SparseFrameModel
+from steeldeckfem.core.force_recovery import ElementForces
+from steeldeckfem.core.fem_results import FEMResults, ModalResults
+from steeldeckfem.core.model_generator import (
+    generate_floor_system, NODE_BASE, NODE_COLUMN_TOP, NODE_SECONDARY,
+    MEMBER_COLUMN, MEMBER_MAIN_BEAM, MEMBER_SECONDARY_BEAM
+)
+from steeldeckfem.core.load_combination_engine import (
+    LoadCombination, LoadCombinationEngine, LoadType
+)
+from steeldeckfem.core.analysis_cache import AnalysisCache, analysis_key
+from steeldeckfem.core.design_checks import DesignCheckResults, MemberDesignChecker
+from steeldeckfem.core.moving_load import WheelTrain
+from steeldeckfem.core.profiling import RunProfiler
+
+# Beams are assigned to the bay panels found this far (m) on either side
+_PANEL_PROBE = 1e-3
 
 
 class FloorSystemFEMAnalyzer:
     """
     Finite Element Analysis for complete floor systems using PyNite
+
+    Two engines are available:
+        'pynite' - PyNite FEModel3D (default)
+        'sparse' - native scipy.sparse solver (SparseFrameModel), much faster
+                   on large grids
+    
+    Each load type (D, L, W, E...) is a separate primary load case. The model
+    is solved once for all primary cases and every load combination is then
+    formed by linear superposition with the LoadCombination factors.
     """
     
-    def __init__(self):
+    ENGINES = ('pynite', 'sparse')
+    
+    # Factors of the primary results ('deflections', 'reactions', ...):
+    # unfactored gravity load, as before load cases were split
+    SERVICE_FACTORS = {LoadType.DEAD: 1.0, LoadType.LIVE: 1.0}
+    SERVICE_NAME = '1.0D + 1.0L'
+    
+    # Gravity loads taken as mass by run_modal_analysis(): permanent load and
+    # the quasi-permanent part of the live load (TCVN 9386:2012, ψ = 0.3)
+    MODAL_MASS_FACTORS = {LoadType.DEAD: 1.0, LoadType.LIVE: 0.3}
+    
+    # Default moving-load responses: moment and shear at this many equally
+    # spaced stations of every path member, plus the vertical base reactions
+    MOVING_LOAD_STATIONS = 11
+    
+    # Envelope entries (key -> diagram component) of beams and columns
+    BEAM_ENVELOPE_KEYS = {'shear': 'shear_z', 'moment': 'moment_y', 'axial': 'axial'}
+    COLUMN_ENVELOPE_KEYS = {'axial': 'axial', 'moment_y': 'moment_y', 'moment_z': 'moment_z'}
+    
+    # Memory for one block of unit panel cases in run_pattern_analysis()
+    # (element forces and sampled diagrams), in bytes
+    PATTERN_BLOCK_BYTES = 256 * 2**20
+    
+    # run_analysis() entries stored as JSON by save_results()
+    SUMMARY_KEYS = ('max_deflection', 'load_cases', 'combinations', 'envelopes',
+                    'design_checks', 'status')
+    
+    def __init__(self, engine: str = 'pynite', combinations: List[LoadCombination] = None,
+                 n_points: int = 21, cache: AnalysisCache = None, ordering: str = 'amd',
+                 profile: bool = False, rigid_diaphragm: bool = False,
+                 super_elements: bool = False):
+        """
+        Args:
+            engine: 'pynite' or 'sparse'
+            combinations: Load combinations to evaluate (default: all TCVN
+                          2737:2023 ULS and SLS combinations)
+            n_points: Number of points sampled along each member diagram
+            cache: Optional AnalysisCache; run_analysis() then returns the
+                   stored results of an identical layout and loads
+            ordering: DOF reordering before factorization (sparse engine,
+                      see sparse_solver.ORDERINGS)
+            profile: Also record peak allocations and object counts of
+                     every phase (wall times are always recorded)
+            rigid_diaphragm: Treat every floor level as a rigid diaphragm
+                             (sparse engine): the in-plane DOF of a level
+                             follow one master node, as the composite deck
+                             does in reality
+            super_elements: Condense the secondary beam nodes of every
+                            floor into a super-element before the global
+                            solve (sparse engine; same results). Pays off
+                            with closely spaced secondaries on small column
+                            grids; on wide grids the condensed floors
+                            couple all their column tops densely
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown FEM engine '{engine}'. Available: {', '.join(self.ENGINES)}")
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering '{ordering}'. Available: {', '.join(ORDERINGS)}")
+        if rigid_diaphragm and engine != 'sparse':
+            raise ValueError("Rigid diaphragms require the 'sparse' engine")
+        if super_elements and engine != 'sparse':
+            raise ValueError("Super-elements require the 'sparse' engine")
+        self.engine = engine
+        self.ordering = ordering
+        self.rigid_diaphragm = rigid_diaphragm
+        self.super_elements = super_elements
+        if combinations is None:
+            combinations = (LoadCombinationEngine.get_uls_combinations() +
+                            LoadCombinationEngine.get_sls_combinations())
+        self.combinations = combinations
+        self.n_points = n_points
+        self.cache = cache
+        self.profiler = RunProfiler(trace_memory=profile, count_objects=profile)
         self.model = None
+        self._model_key = None
+        self._loads = None
+        self._cache_key = None
+        self.load_cases = []
+        self.case_results = None
+        self._combination_results = None
+        self.modal_results = None
+        self.pdelta_results = None
+        self.moving_load_results = None
+        self.pattern_results = None
         self.results = {}
         
-    def build_fem_model(self, layout, loads: Dict) -> FEModel3D:
+    def build_fem_model(self, layout, loads: Dict):
         """
-        Build PyNite FEM model from floor system layout
+        Build FEM model from floor system layout
         
         Args:
             layout: FloorSystemLayout object with system parameters
-            loads: Dictionary with 'live_load' and 'dead_load_finish' in kg/m²
+            loads: Dictionary with 'live_load' and 'dead_load_finish' in kg/m².
+                   Optional 'wind_load' and 'seismic_load': total lateral
+                   force (kN) at each floor level in the global X direction
             
         Returns:
-            FEModel3D: Configured PyNite model ready for analysis
+            FEModel3D or SparseFrameModel (depending on engine) ready for analysis
+        
+        If only the member sections differ from the previously built model
+        (same geometry and loads), the model is updated in place with
+        update_sections() instead of being rebuilt.
         """
+        model_key = (self._geometry_key(layout), tuple(sorted(loads.items())))
+        if self.model is not None and model_key == self._model_key:
+            self.profiler.reset()
+            with self.profiler.phase('update_sections'):
+                return self.update_sections(layout)
+        self._loads = loads
+        self.profiler.reset()
+        
         # Create new model
-        self.model = FEModel3D()
+        if self.engine == 'pynite':
+            # Imported on use: PyNite loads matplotlib, which headless
+            # (sparse engine) runs do not need
+            from Pynite import FEModel3D
+            self.model = FEModel3D()
+        else:
+            self.model = SparseFrameModel(self.ordering)
         
         # Define material properties (Steel)
         E = 200e6  # kN/m² (200 GPa)
@@ -42,112 +176,95 @@ class FloorSystemFEMAnalyzer:
         dead_load_kn = loads.get('dead_load_finish', 30) / 100
         
         # 1. Define nodes
-        self._define_nodes(layout)
+        with self.profiler.phase('define_nodes'):
+            self._define_nodes(layout)
         
         # 2. Define members
-        self._define_members(layout, E, G, nu, rho)
+        with self.profiler.phase('define_members'):
+            self._define_members(layout, E, G, nu, rho)
         
         # 3. Apply supports
-        self._apply_supports(layout)
+        with self.profiler.phase('apply_supports'):
+            self._apply_supports(layout)
+            if self.rigid_diaphragm:
+                self._apply_diaphragms()
+            if self.super_elements:
+                self._define_super_elements()
+        
+        # 4. Apply loads (one primary load case per load type)
+        self.load_cases = []
+        with self.profiler.phase('apply_loads'):
+            self._apply_loads(layout, live_load_kn, dead_load_kn)
+            self._apply_lateral_loads(loads)
         
-        # 4. Apply loads
-        self._apply_loads(layout, live_load_kn, dead_load_kn)
+        # PyNite only solves load combinations: one unit combination per case
+        if self.engine == 'pynite':
+            for case in self.load_cases:
+                self.model.add_load_combo(case, {case: 1.0})
         
+        self._model_key = model_key
+        self._set_cache_key(layout)
         return self.model
     
     def _define_nodes(self, layout):
-        """Define all nodes in the system"""
-        L = layout.length
-        W = layout.width
-        H = layout.floor_height
-        col_x = layout.column_spacing_x
-        col_y = layout.column_spacing_y
-        
-        num_cols_x = int(L / col_x) + 1
-        num_cols_y = int(W / col_y) + 1
-        
-        # Column nodes (base and top)
-        node_id = 1
-        self.column_nodes = {}
+        """Define all nodes in the system (all storeys)"""
+        self.topology = generate_floor_system(layout)
+        topo = self.topology
+        node_names = topo.node_labels()
         
-        for i in range(num_cols_x):
-            for j in range(num_cols_y):
-                x = i * col_x
-                y = j * col_y
-                
-                # Base node
-                base_name = f'C{i}_{j}_B'
-                self.model.add_node(base_name, x, y, 0)
-                
-                # Top node
-                top_name = f'C{i}_{j}_T'
-                self.model.add_node(top_name, x, y, H)
-                
-                self.column_nodes[(i, j)] = {'base': base_name, 'top': top_name}
-        
-        # Main beam nodes (already defined as column tops)
-        # Secondary beam nodes (intermediate nodes along main beams)
-        self._define_beam_intermediate_nodes(layout)
-    
-    def _define_beam_intermediate_nodes(self, layout):
-        """Define intermediate nodes for secondary beams"""
-        L = layout.length
-        W = layout.width
-        H = layout.floor_height
-        col_x = layout.column_spacing_x
-        col_y = layout.column_spacing_y
-        sec_spacing = layout.secondary_beam_spacing
-        
-        num_cols_x = int(L / col_x) + 1
-        num_cols_y = int(W / col_y) + 1
+        for name, (x, y, z) in zip(node_names, topo.coords.tolist()):
+            self.model.add_node(name, x, y, z)
         
-        self.sec_beam_nodes = []
+        # Column base and first-storey top nodes, keyed by grid position
+        bases = topo.nodes_of_kind(NODE_BASE)
+        tops = topo.nodes_of_kind(NODE_COLUMN_TOP)
+        self.column_nodes = {}
+        for base, top in zip(bases.tolist(), tops.tolist()):
+            i, j = topo.node_fields[base, 1:3].tolist()
+            self.column_nodes[(i, j)] = {'base': node_names[base], 'top': node_names[top]}
         
-        if layout.main_beam_direction == 'X':
-            # Secondary beams run in Y direction
-            num_sec = int(col_x / sec_spacing)
-            for i in range(num_cols_x - 1):
-                for k in range(1, num_sec + 1):
-                    x = i * col_x + k * sec_spacing
-                    for j in range(num_cols_y):
-                        y = j * col_y
-                        node_name = f'SB{i}_{k}_{j}'
-                        self.model.add_node(node_name, x, y, H)
-                        self.sec_beam_nodes.append(node_name)
-        else:
-            # Secondary beams run in X direction
-            num_sec = int(col_y / sec_spacing)
-            for j in range(num_cols_y - 1):
-                for k in range(1, num_sec + 1):
-                    y = j * col_y + k * sec_spacing
-                    for i in range(num_cols_x):
-                        x = i * col_x
-                        node_name = f'SB{i}_{j}_{k}'
-                        self.model.add_node(node_name, x, y, H)
-                        self.sec_beam_nodes.append(node_name)
+        # Secondary beam nodes (intermediate nodes along main beams). Secondary
+        # beams landing on a column grid line frame into the column top nodes
+        self.sec_beam_nodes = [node_names[n] for n in topo.nodes_of_kind(NODE_SECONDARY)]
     
     def _define_members(self, layout, E, G, nu, rho):
         """Define all members (columns, beams)"""
         # First define materials and sections
         self._define_materials_and_sections(layout, E, G, nu, rho)
         
-        # Then define members
-        self._define_column_members(layout, E, G, nu, rho)
-        self._define_main_beam_members(layout, E, G, nu, rho)
-        self._define_secondary_beam_members(layout, E, G, nu, rho)
+        # Then define members from the generated connectivity
+        topo = self.topology
+        node_names = topo.node_labels()
+        member_names = topo.member_labels()
+        sections = {
+            MEMBER_COLUMN: 'ColumnSection',
+            MEMBER_MAIN_BEAM: 'MainBeamSection',
+            MEMBER_SECONDARY_BEAM: 'SecBeamSection',
+        }
+        for name, (n_i, n_j), kind in zip(member_names, topo.connectivity.tolist(),
+                                           topo.member_kind.tolist()):
+            self.model.add_member(name, node_names[n_i], node_names[n_j], 'Steel', sections[kind])
+        
+        self.column_members = [member_names[m] for m in topo.members_of_kind(MEMBER_COLUMN)]
+        self.main_beam_members = [member_names[m] for m in topo.members_of_kind(MEMBER_MAIN_BEAM)]
+        self.sec_beam_members = [member_names[m] for m in topo.members_of_kind(MEMBER_SECONDARY_BEAM)]
     
     def _define_materials_and_sections(self, layout, E, G, nu, rho):
         """Define materials and sections for Pynite 2.0"""
         # Add steel material
         self.model.add_material('Steel', E, G, nu, rho)
         
+        for name, (A, Iy, Iz, J) in self._section_properties(layout).items():
+            self.model.add_section(name, A, Iy, Iz, J)
+    
+    def _section_properties(self, layout) -> Dict[str, tuple]:
+        """Section name -> (A, Iy, Iz, J) in m² and m⁴"""
         # Column section
         col_spec = layout.column_spec
         A_col = col_spec.area / 10000  # cm² to m²
         Iy_col = col_spec.ix / 100000000  # cm⁴ to m⁴
         Iz_col = Iy_col
         J_col = Iy_col + Iz_col
-        self.model.add_section('ColumnSection', A_col, Iy_col, Iz_col, J_col)
         
         # Main beam section
         beam_spec = layout.main_beam_spec
@@ -155,7 +272,6 @@ class FloorSystemFEMAnalyzer:
         Iy_beam = beam_spec.ix / 100000000
         Iz_beam = Iy_beam * 0.3
         J_beam = 0.1 * Iy_beam
-        self.model.add_section('MainBeamSection', A_beam, Iy_beam, Iz_beam, J_beam)
         
         # Secondary beam section
         sec_spec = layout.secondary_beam_spec
@@ -163,106 +279,61 @@ class FloorSystemFEMAnalyzer:
         Iy_sec = sec_spec.ix / 100000000
         Iz_sec = Iy_sec * 0.3
         J_sec = 0.1 * Iy_sec
-        self.model.add_section('SecBeamSection', A_sec, Iy_sec, Iz_sec, J_sec)
-    
-    def _define_column_members(self, layout, E, G, nu, rho):
-        """Define column members"""
-        self.column_members = []
-        for (i, j), nodes in self.column_nodes.items():
-            member_name = f'Col_{i}_{j}'
-            self.model.add_member(
-                member_name,
-                nodes['base'],
-                nodes['top'],
-                'Steel',
-                'ColumnSection'
-            )
-            self.column_members.append(member_name)
-    
-    def _define_main_beam_members(self, layout, E, G, nu, rho):
-        """Define main beam members"""
-        col_x = layout.column_spacing_x
-        col_y = layout.column_spacing_y
-        L = layout.length
-        W = layout.width
-        num_cols_x = int(L / col_x) + 1
-        num_cols_y = int(W / col_y) + 1
-        
-        self.main_beam_members = []
         
-        if layout.main_beam_direction == 'X':
-            # Main beams run in X direction
-            for j in range(num_cols_y):
-                for i in range(num_cols_x - 1):
-                    member_name = f'MB_Y{j}_S{i}'  # Y-row, Span i
-                    node_i = self.column_nodes[(i, j)]['top']
-                    node_j = self.column_nodes[(i+1, j)]['top']
-                    self.model.add_member(member_name, node_i, node_j, 'Steel', 'MainBeamSection')
-                    self.main_beam_members.append(member_name)
-        else:
-            # Main beams run in Y direction
-            for i in range(num_cols_x):
-                for j in range(num_cols_y - 1):
-                    member_name = f'MB_X{i}_S{j}'  # X-row, Span j
-                    node_i = self.column_nodes[(i, j)]['top']
-                    node_j = self.column_nodes[(i, j+1)]['top']
-                    self.model.add_member(member_name, node_i, node_j, 'Steel', 'MainBeamSection')
-                    self.main_beam_members.append(member_name)
-    
-    def _define_secondary_beam_members(self, layout, E, G, nu, rho):
-        """Define secondary beam members"""
-        col_x = layout.column_spacing_x
-        col_y = layout.column_spacing_y
-        sec_spacing = layout.secondary_beam_spacing
-        L = layout.length
-        W = layout.width
-        num_cols_x = int(L / col_x) + 1
-        num_cols_y = int(W / col_y) + 1
+        return {
+            'ColumnSection': (A_col, Iy_col, Iz_col, J_col),
+            'MainBeamSection': (A_beam, Iy_beam, Iz_beam, J_beam),
+            'SecBeamSection': (A_sec, Iy_sec, Iz_sec, J_sec),
+        }
+    
+    def update_sections(self, layout):
+        """
+        Change member sections of the built model in place
         
-        self.sec_beam_members = []
+        Nodes, members, supports and loads are kept: the sparse engine only
+        recomputes the affected element matrices and re-solves from its
+        previous factorization, PyNite members pick up the new properties
+        through their shared Section objects.
         
-        if layout.main_beam_direction == 'X':
-            # Main beams run in X direction, secondary beams run in Y direction
-            # Secondary beams connect column tops in Y direction at intermediate X positions
-            num_sec = int(col_x / sec_spacing)
-            
-            for i in range(num_cols_x - 1):  # Between each pair of column lines
-                for k in range(1, num_sec + 1):  # Each secondary beam position
-                    # Connect nodes from j=0 to j=num_cols_y-1
-                    for j in range(num_cols_y - 1):
-                        node_i = f'SB{i}_{k}_{j}'
-                        node_j = f'SB{i}_{k}_{j+1}'
-                        member_name = f'SecB_{i}_{k}_{j}'
-                        
-                        self.model.add_member(
-                            member_name,
-                            node_i,
-                            node_j,
-                            'Steel',
-                            'SecBeamSection'
-                        )
-                        self.sec_beam_members.append(member_name)
-        else:
-            # Main beams run in Y direction, secondary beams run in X direction
-            # Secondary beams connect column tops in X direction at intermediate Y positions
-            num_sec = int(col_y / sec_spacing)
+        Args:
+            layout: FloorSystemLayout with the same geometry as the built model
             
-            for j in range(num_cols_y - 1):  # Between each pair of column lines
-                for k in range(1, num_sec + 1):  # Each secondary beam position
-                    # Connect nodes from i=0 to i=num_cols_x-1
-                    for i in range(num_cols_x - 1):
-                        node_i = f'SB{i}_{j}_{k}'
-                        node_j = f'SB{i+1}_{j}_{k}'
-                        member_name = f'SecB_{i}_{j}_{k}'
-                        
-                        self.model.add_member(
-                            member_name,
-                            node_i,
-                            node_j,
-                            'Steel',
-                            'SecBeamSection'
-                        )
-                        self.sec_beam_members.append(member_name)
+        Returns:
+            The updated model
+        """
+        if self.model is None:
+            raise ValueError("Model not built. Call build_fem_model() first.")
+        if self._geometry_key(layout) != self._model_key[0]:
+            raise ValueError("Layout geometry changed; call build_fem_model() to rebuild the model")
+        
+        for name, (A, Iy, Iz, J) in self._section_properties(layout).items():
+            if self.engine == 'sparse':
+                self.model.update_section(name, A, Iy, Iz, J)
+            else:
+                section = self.model.sections[name]
+                section.A, section.Iy, section.Iz, section.J = A, Iy, Iz, J
+        self._set_cache_key(layout)
+        return self.model
+    
+    def _set_cache_key(self, layout):
+        """Hash of the current layout, loads and analysis options (None: not cached)"""
+        self._cache_key = None
+        if self.cache is not None:
+            try:
+                self._cache_key = analysis_key(layout, self._loads, engine=self.engine,
+                                               combinations=self.combinations,
+                                               n_points=self.n_points,
+                                               rigid_diaphragm=self.rigid_diaphragm)
+            except TypeError:
+                pass  # Layout holds objects without a stable hash
+    
+    @staticmethod
+    def _geometry_key(layout) -> tuple:
+        """Layout parameters that define the model topology"""
+        return (layout.length, layout.width, layout.floor_height,
+                layout.column_spacing_x, layout.column_spacing_y,
+                layout.main_beam_direction, layout.secondary_beam_spacing,
+                getattr(layout, 'num_storeys', 1))
     
     def _apply_supports(self, layout):
         """Apply support conditions (fixed at column bases)"""
@@ -271,24 +342,44 @@ class FloorSystemFEMAnalyzer:
             # Fixed support (all DOF restrained)
             self.model.def_support(base_node, True, True, True, True, True, True)
     
+    def _apply_diaphragms(self):
+        """One rigid diaphragm per floor level, mastered near the floor centroid"""
+        topo = self.topology
+        floors = np.setdiff1d(np.arange(topo.num_nodes), topo.nodes_of_kind(NODE_BASE))
+        for Z in np.unique(topo.coords[floors, 2]).tolist():
+            self.model.def_diaphragm(Z)
+    
+    def _define_super_elements(self):
+        """One super-element per floor: its secondary beam nodes, bounded by the column tops"""
+        topo = self.topology
+        names = topo.node_labels()
+        secondary = topo.nodes_of_kind(NODE_SECONDARY)
+        storey = topo.node_fields[secondary, 4]
+        for s in np.unique(storey).tolist():
+            self.model.def_super_element(f'Floor_{s}', [names[n] for n in secondary[storey == s]])
+    
     def _apply_loads(self, layout, live_load_kn, dead_load_kn):
-        """Apply loads to the structure"""
+        """Apply gravity loads to the structure (cases D and L)"""
         # Calculate deck self-weight
         deck_weight = 0.05  # kN/m² (approximate)
         
-        # Total distributed load
-        total_load = live_load_kn + dead_load_kn + deck_weight
+        # Distributed load per primary case
+        case_loads = {
+            LoadType.DEAD.value: dead_load_kn + deck_weight,
+            LoadType.LIVE.value: live_load_kn,
+        }
         
         # Calculate tributary area for each beam
         sec_spacing = layout.secondary_beam_spacing
         col_spacing_x = layout.column_spacing_x
         col_spacing_y = layout.column_spacing_y
         
-        # Apply distributed loads to main beams
-        for member_name in self.main_beam_members:
-            # Load per unit length (kN/m)
-            w = total_load * sec_spacing
-            self.model.add_member_dist_load(member_name, 'Fy', -w, -w, 0, 1)
+        # Apply distributed loads to main beams (gravity, global -Z, full length)
+        for case, load in case_loads.items():
+            for member_name in self.main_beam_members:
+                # Load per unit length (kN/m)
+                w = load * sec_spacing
+                self.model.add_member_dist_load(member_name, 'FZ', -w, -w, case=case)
         
         # Apply distributed loads to secondary beams
         if layout.main_beam_direction == 'X':
@@ -298,17 +389,54 @@ class FloorSystemFEMAnalyzer:
             # Secondary beams run in X direction  
             tributary_width = sec_spacing
         
-        for member_name in self.sec_beam_members:
-            # Load per unit length for secondary beams (kN/m)
-            w = total_load * tributary_width
-            self.model.add_member_dist_load(member_name, 'Fy', -w, -w, 0, 1)
+        for case, load in case_loads.items():
+            for member_name in self.sec_beam_members:
+                # Load per unit length for secondary beams (kN/m)
+                w = load * tributary_width
+                self.model.add_member_dist_load(member_name, 'FZ', -w, -w, case=case)
+        
+        self.load_cases.extend(case_loads)
+    
+    def _apply_lateral_loads(self, loads: Dict):
+        """Apply wind/seismic storey forces to the column tops (cases W and E)"""
+        lateral = {
+            LoadType.WIND.value: loads.get('wind_load', 0),
+            LoadType.SEISMIC.value: loads.get('seismic_load', 0),
+        }
+        node_names = self.topology.node_labels()
+        top_nodes = [node_names[n] for n in self.topology.nodes_of_kind(NODE_COLUMN_TOP)]
+        num_cols = len(self.column_nodes)
+        
+        for case, force in lateral.items():
+            if not force:
+                continue
+            # Rigid floor assumption: storey force shared equally by the
+            # columns of every floor
+            P = force / num_cols
+            for node_name in top_nodes:
+                self.model.add_node_load(node_name, 'FX', P, case=case)
+            self.load_cases.append(case)
     
     def run_analysis(self, layout=None) -> Dict[str, Any]:
         """
         Run FEM analysis and extract results
         
+        All primary load cases are solved together; the primary results are
+        the unfactored gravity load (1.0D + 1.0L) and every load combination
+        is summarized under 'combinations' and enveloped per limit state
+        under 'envelopes'. 'deflections', 'reactions', 'member_forces' and
+        'member_extremes' are read-only dict views over the columnar
+        FEMResults store returned under 'fem_results'. 'profile' holds the
+        wall time (and, if enabled, memory) of every phase since the model
+        was built (see RunProfiler). With the sparse
+        engine, 'solver' reports the DOF ordering, nnz of K and of its
+        factors, the fill ratio and the factorization time (results served
+        from the cache have no 'solver' entry, as nothing was solved).
+        
         Args:
-            layout: Optional layout object for design checks
+            layout: Optional layout object; if given, every member is checked
+                    (see check_design) and 'design_checks' holds
+                    {member: {'unity_check', 'status', 'governing', ...}}
             
         Returns:
             Dictionary with analysis results
@@ -316,23 +444,57 @@ class FloorSystemFEMAnalyzer:
         if self.model is None:
             raise ValueError("Model not built. Call build_fem_model() first.")
         
+        if self._cache_key is not None:
+            with self.profiler.phase('cache_lookup'):
+                cached = self.cache.get(self._cache_key)
+            if cached is not None:
+                self.results = self._results_copy(cached)
+                self.case_results = cached['fem_results']
+                self._combination_results = None
+                self.load_cases = list(cached['load_cases'])
+                if layout is not None and not self.results['design_checks']:
+                    with self.profiler.phase('design_checks'):
+                        self.results['design_checks'] = self.check_design(layout).as_dict()
+                    self.cache.put(self._cache_key, self._results_copy(self.results))
+                self.results['profile'] = self.profiler.as_dict()
+                return self.results
+        
         try:
-            # Analyze the model
-            self.model.analyze(check_statics=True)
+            # Analyze the model (one solve for all primary load cases)
+            with self.profiler.phase('analyze'):
+                self.model.analyze(check_statics=True)
             
-            # Extract results
+            # Extract per-case results, then superpose
+            with self.profiler.phase('extract_results'):
+                self.case_results = self._extract_case_results()
+                self._combination_results = None
+                service = self._combine_results([self.SERVICE_FACTORS], [self.SERVICE_NAME])
+                views = self._service_views(service)
+            with self.profiler.phase('combinations'):
+                combinations = self._summarize_combinations()
+            with self.profiler.phase('envelopes'):
+                envelopes = self._build_envelopes()
             self.results = {
-                'deflections': self._extract_deflections(),
-                'reactions': self._extract_reactions(),
-                'member_forces': self._extract_member_forces(),
-                'max_deflection': self._find_max_deflection(),
-                'design_checks': {},  # Placeholder for design checks
+                **views,
+                'max_deflection': self._find_max_deflection(service),
+                'fem_results': self.case_results,
+                'load_cases': list(self.load_cases),
+                'combinations': combinations,
+                'envelopes': envelopes,
+                'design_checks': {},
                 'status': 'Analysis Complete'
             }
+            if self.engine == 'sparse':
+                # Factor size, fill-in and time, and how the last solve was done
+                self.results['solver'] = {**self.model.factor_info, **self.model.solver_info}
+            
+            if layout is not None:
+                with self.profiler.phase('design_checks'):
+                    self.results['design_checks'] = self.check_design(layout).as_dict()
             
-            # TODO: Implement design checks using layout if provided
-            if layout:
-                pass
+            self.results['profile'] = self.profiler.as_dict()
+            if self._cache_key is not None:
+                self.cache.put(self._cache_key, self._results_copy(self.results))
                 
         except Exception as e:
             # Analysis failed - return partial results with error info
@@ -342,84 +504,642 @@ class FloorSystemFEMAnalyzer:
                 'reactions': {},
                 'member_forces': {},
                 'max_deflection': {'value': 0, 'node': 'N/A', 'limit': 'N/A'},
+                'member_extremes': {},
+                'fem_results': None,
+                'load_cases': [],
+                'combinations': {},
+                'envelopes': {},
                 'design_checks': {},
+                'profile': self.profiler.as_dict(),
                 'status': f'Analysis failed: {str(e)}',
                 'error': str(e)
             }
         
         return self.results
     
-    def _extract_deflections(self) -> Dict:
-        """Extract nodal deflections"""
-        deflections = {}
-        for node_name in self.model.nodes:
-            node = self.model.nodes[node_name]
-            deflections[node_name] = {
-                'dx': node.DX['Combo 1'],
-                'dy': node.DY['Combo 1'],
-                'dz': node.DZ['Combo 1']
-            }
-        return deflections
+    def _results_copy(self, results: Dict) -> Dict:
+        """
+        Copy of run_analysis() results to store in or serve from the cache
+        
+        The summary entries are deep-copied so that callers editing them
+        never change the cached entry; the FEMResults store and its read-only
+        views are shared. 'solver' and 'profile' describe one run and are dropped.
+        """
+        entry = {key: value for key, value in results.items() if key not in ('solver', 'profile')}
+        for key in self.SUMMARY_KEYS:
+            if key in entry:
+                entry[key] = copy.deepcopy(entry[key])
+        return entry
     
-    def _extract_reactions(self) -> Dict:
-        """Extract support reactions"""
-        reactions = {}
-        for (i, j), nodes in self.column_nodes.items():
-            base_node = nodes['base']
-            node = self.model.nodes[base_node]
-            reactions[base_node] = {
-                'Fx': node.RxnFX['Combo 1'],
-                'Fy': node.RxnFY['Combo 1'],
-                'Fz': node.RxnFZ['Combo 1']
-            }
-        return reactions
+    def run_modal_analysis(self, num_modes: int = 12,
+                           mass_factors: Dict[LoadType, float] = None,
+                           lumped: bool = True) -> ModalResults:
+        """
+        Natural frequencies, mode shapes and mass participation
+        
+        The mass is the member self-weight plus the factored gravity load
+        cases. Modes are extracted from the assembled model by shift-invert
+        Lanczos (sparse engine only).
+        
+        Args:
+            num_modes: Number of lowest modes
+            mass_factors: LoadType -> factor of the gravity loads taken as
+                          mass (default MODAL_MASS_FACTORS)
+            lumped: Lumped member mass (False: consistent mass matrix)
+            
+        Returns:
+            ModalResults (also stored as self.modal_results)
+        """
+        if self.model is None:
+            raise ValueError("Model not built. Call build_fem_model() first.")
+        if self.engine != 'sparse':
+            raise ValueError("Modal analysis requires the 'sparse' engine")
+        
+        mass_factors = self.MODAL_MASS_FACTORS if mass_factors is None else mass_factors
+        mass_cases = {load_type.value: factor for load_type, factor in mass_factors.items()
+                      if load_type.value in self.load_cases}
+        with self.profiler.phase('modal_analysis'):
+            self.modal_results = self.model.modal_analysis(num_modes, mass_cases, lumped)
+        return self.modal_results
     
-    def _extract_member_forces(self) -> Dict:
-        """Extract member internal forces"""
-        member_forces = {}
+    def run_pdelta_analysis(self, combinations: List[LoadCombination] = None,
+                            tol: float = 1e-6, max_iter: int = 20) -> Dict[str, Any]:
+        """
+        Second-order (P-Delta) analysis of load combinations
         
-        # Main beams
-        for member_name in self.main_beam_members:
-            member = self.model.members[member_name]
-            L = member.L()
+        Second-order results do not superpose, so each combination is solved
+        on its own tangent stiffness; all of them are iterated together in
+        one batched call (sparse engine only, see
+        SparseFrameModel.analyze_pdelta).
+        
+        Args:
+            combinations: Combinations to analyze (default: all ULS
+                          combinations of the analyzer)
+            tol: Relative displacement change at which the iteration stops
+            max_iter: Maximum number of axial force updates
             
-            # Sample points along member
-            positions = np.linspace(0, L, 21)
+        Returns:
+            Dictionary with 'fem_results' (FEMResults, one "case" per
+            combination), 'amplification' ({combination: [{'storey', 'X',
+            'Y'}]} ratios of second- to first-order column drift per storey)
+            and 'iterations'. Also stored as self.pdelta_results.
+        """
+        if self.model is None:
+            raise ValueError("Model not built. Call build_fem_model() first.")
+        if self.engine != 'sparse':
+            raise ValueError("P-Delta analysis requires the 'sparse' engine")
+        if combinations is None:
+            combinations = [c for c in self.combinations if c.limit_state.name == 'ULS']
+        if not combinations:
+            raise ValueError("No load combinations to analyze")
+        
+        # Combination factors in the model's load case order
+        factors = np.zeros((len(combinations), len(self.model.load_cases)))
+        case_idx = [self.model.load_cases.index(case) for case in self.load_cases]
+        factors[:, case_idx] = self._factor_matrix([c.factors for c in combinations])
+        with self.profiler.phase('pdelta_analysis'):
+            solution = self.model.analyze_pdelta(factors, tol, max_iter)
+        
+        node_names = list(self.model.nodes)
+        support_nodes = [nodes['base'] for nodes in self.column_nodes.values()]
+        support_idx = [self.model.nodes[name] for name in support_nodes]
+        names = [c.name for c in combinations]
+        fem_results = FEMResults(
+            node_names, support_nodes, names,
+            solution['D'][:, :, :3], solution['reactions'][:, support_idx, :3],
+            ElementForces.from_sparse_model(self.model, solution=solution), self.n_points)
+        
+        # Storey drift amplification: largest column drift of each storey
+        topo = self.topology
+        columns = topo.members_of_kind(MEMBER_COLUMN)
+        storeys = topo.member_fields[columns, 4]
+        base, top = topo.connectivity[columns].T
+        drift = {order: np.abs(solution[key][:, top, :2] - solution[key][:, base, :2])
+                 for order, key in (('first', 'D_linear'), ('second', 'D'))}
+        amplification = {name: [] for name in names}
+        for storey in np.unique(storeys).tolist():
+            in_storey = storeys == storey
+            first = drift['first'][:, in_storey].max(axis=1)
+            second = drift['second'][:, in_storey].max(axis=1)
+            ratio = np.divide(second, first, out=np.ones_like(first), where=first > 1e-9)
+            for k, name in enumerate(names):
+                amplification[name].append({'storey': storey, 'X': float(ratio[k, 0]),
+                                            'Y': float(ratio[k, 1])})
+        
+        self.pdelta_results = {
+            'fem_results': fem_results,
+            'amplification': amplification,
+            'iterations': solution['iterations'],
+        }
+        return self.pdelta_results
+    
+    def run_moving_load_analysis(self, path: List[str], train: WheelTrain,
+                                 responses: List[tuple] = None, step: float = 0.1,
+                                 both_directions: bool = True) -> Dict[str, Any]:
+        """
+        Envelopes of a wheel train (crane, vehicle) moving along members
+        
+        Influence lines are computed once from the stiffness factorization
+        and the train is swept over them, so thousands of positions cost no
+        extra solves (sparse engine only, see
+        SparseFrameModel.influence_lines). Results are for the train alone,
+        to be combined with the static cases as the crane load (C).
+        
+        Args:
+            path: Member names in order along the runway or lane
+            train: WheelTrain (gravity wheel loads negative, e.g.
+                   WheelTrain.crane())
+            responses: Responses as accepted by influence_lines() (default:
+                       moment_y and shear_z at MOVING_LOAD_STATIONS stations
+                       of every path member and the base reactions FZ)
+            step: Spacing of influence ordinates and train positions (m)
+            both_directions: Also run the train in the opposite direction
             
-            member_forces[member_name] = {
-                'positions': positions.tolist(),
-                'shear': [member.shear('Fy', x) for x in positions],
-                'moment': [member.moment('Mz', x) for x in positions],
-                'axial': [member.axial(x) for x in positions],
-                'length': L
-            }
+        Returns:
+            Dictionary with 'influence_lines' (InfluenceLines) and
+            'envelope' (MovingLoadEnvelope). Also stored as
+            self.moving_load_results.
+        """
+        if self.model is None:
+            raise ValueError("Model not built. Call build_fem_model() first.")
+        if self.engine != 'sparse':
+            raise ValueError("Moving load analysis requires the 'sparse' engine")
+        if responses is None:
+            responses = []
+            for member in path:
+                length = self.model.member_length(member)
+                for x in np.linspace(0.0, length, self.MOVING_LOAD_STATIONS).tolist():
+                    responses += [('moment_y', member, x), ('shear_z', member, x)]
+            responses += [('reaction', nodes['base'], 'FZ') for nodes in self.column_nodes.values()]
         
-        return member_forces
+        with self.profiler.phase('moving_load'):
+            lines = self.model.influence_lines(path, responses, step)
+            envelope = lines.envelope(train, step, both_directions)
+        self.moving_load_results = {'influence_lines': lines, 'envelope': envelope}
+        return self.moving_load_results
     
-    def _find_max_deflection(self) -> Dict:
-        """Find maximum deflection in the structure"""
-        max_def = 0
-        max_node = None
-        
-        # Safety check
-        if 'deflections' not in self.results or not self.results['deflections']:
-            return {
-                'value': 0,
-                'node': 'N/A',
-                'limit': 'N/A'
-            }
+    def live_load_panels(self):
+        """
+        Bay panels of the live load and the share of every member in them
         
-        for node_name, defl in self.results['deflections'].items():
-            total_def = abs(defl['dy'])  # Vertical deflection
-            if total_def > max_def:
-                max_def = total_def
-                max_node = node_name
+        A panel is one bay of the column grid on one storey. Beams inside a
+        bay belong to its panel and beams on a grid line are shared equally
+        by the panels on either side, so all panels together make up the
+        full live load case.
         
+        Returns:
+            (panel names 'P{i}_{j}' (with '_F{storey}' above the first
+            storey), weights (n_panels, n_members) sparse matrix with the
+            members in model order)
+        """
+        if self.model is None:
+            raise ValueError("Model not built. Call build_fem_model() first.")
+        topo = self.topology
+        bases = topo.nodes_of_kind(NODE_BASE)
+        xs = np.unique(topo.coords[bases, 0])
+        ys = np.unique(topo.coords[bases, 1])
+        nx, ny = len(xs) - 1, len(ys) - 1
+        if nx < 1 or ny < 1:
+            raise ValueError("Pattern loading needs at least one bay in each direction")
+        
+        beams = np.flatnonzero(topo.member_kind != MEMBER_COLUMN)
+        start, end = topo.coords[topo.connectivity[beams].T]
+        mid = (start[:, :2] + end[:, :2]) / 2
+        along = end[:, :2] - start[:, :2]
+        along /= np.linalg.norm(along, axis=1)[:, None]
+        normal = np.column_stack([-along[:, 1], along[:, 0]])
+        storey = topo.member_fields[beams, 4]
+        
+        # Panel on either side of every beam (none outside the floor)
+        panels, inside = [], []
+        for side in (-1.0, 1.0):
+            x, y = (mid + side * _PANEL_PROBE * normal).T
+            i = np.clip(np.searchsorted(xs, x) - 1, 0, nx - 1)
+            j = np.clip(np.searchsorted(ys, y) - 1, 0, ny - 1)
+            panels.append(((storey - 1) * nx + i) * ny + j)
+            inside.append((x > xs[0]) & (x < xs[-1]) & (y > ys[0]) & (y < ys[-1]))
+        share = 1.0 / np.maximum(inside[0].astype(int) + inside[1], 1)
+        on = np.concatenate(inside)
+        weights = sp.csr_matrix(
+            (np.tile(share, 2)[on], (np.concatenate(panels)[on], np.tile(beams, 2)[on])),
+            shape=(topo.num_storeys * nx * ny, topo.num_members))
+        
+        names = [f'P{i}_{j}' if s == 1 else f'P{i}_{j}_F{s}'
+                 for s in range(1, topo.num_storeys + 1) for i in range(nx) for j in range(ny)]
+        return names, weights
+    
+    def run_pattern_analysis(self, combinations: List[LoadCombination] = None) -> Dict[str, Any]:
+        """
+        Live-load pattern (checkerboard) envelopes by unit-panel superposition
+        
+        The live load of every bay panel (see live_load_panels) is solved as
+        a separate case, all with the one stiffness factorization. The
+        response to any pattern is the sum of its panel responses, so the
+        most adverse pattern for a response loads exactly the panels that
+        increase it: max = base + γL·Σ max(0, Lp) and min = base +
+        γL·Σ min(0, Lp), with base the combination without live load. This
+        is the exact envelope over all patterns at every diagram station,
+        node and support (sparse engine only; run_analysis() first).
+        
+        Args:
+            combinations: Combinations to envelope (default: all
+                          combinations of the analyzer)
+            
+        Returns:
+            Dictionary with 'panels' (panel names) and 'envelopes' per limit
+            state, as in run_analysis() plus 'column_forces' (axial and
+            moment envelopes of the columns). Also stored as
+            self.pattern_results.
+        """
+        if self.model is None:
+            raise ValueError("Model not built. Call build_fem_model() first.")
+        if self.engine != 'sparse':
+            raise ValueError("Pattern loading requires the 'sparse' engine")
+        if self.case_results is None:
+            raise ValueError("No analysis results. Call run_analysis() first.")
+        live = LoadType.LIVE.value
+        if live not in self.load_cases:
+            raise ValueError("The model has no live load case")
+        combinations = self.combinations if combinations is None else combinations
+        if not combinations:
+            raise ValueError("No load combinations to analyze")
+        
+        members = self.main_beam_members + self.column_members
+        names, weights = self.live_load_panels()
+        element_forces = self.case_results.element_forces
+        support_idx = [self.model.nodes[name] for name in self.case_results.support_nodes]
+        group_bytes = 96 * (len(element_forces.length) + len(members) * self.n_points)
+        block = int(np.clip(self.PATTERN_BLOCK_BYTES // group_bytes, 1, 256))
+        
+        with self.profiler.phase('pattern_analysis'):
+            # Sums of the positive and of the negative panel contributions
+            adverse, favourable = {}, {}
+            for part in self.model.analyze_load_groups(live, weights, block):
+                forces = replace(element_forces, forces=part['element_forces'], loads=part['loads'])
+                values = forces.diagrams(self.n_points, members).values
+                values['dz'] = part['D'][..., 2]
+                values['Fz'] = part['reactions'][:, support_idx, 2]
+                for key, v in values.items():
+                    adverse[key] = adverse.get(key, 0.0) + np.maximum(v, 0.0).sum(axis=0)
+                    favourable[key] = favourable.get(key, 0.0) + np.minimum(v, 0.0).sum(axis=0)
+            
+            envelopes = {}
+            live_idx = self.load_cases.index(live)
+            beams = slice(0, len(self.main_beam_members))
+            columns = slice(len(self.main_beam_members), len(members))
+            for limit_state in ('ULS', 'SLS'):
+                combos = [c for c in combinations if c.limit_state.name == limit_state]
+                if not combos:
+                    continue
+                factors = self._factor_matrix([c.factors for c in combos])
+                gamma = factors[:, live_idx].copy()
+                factors[:, live_idx] = 0.0
+                base = self.case_results.combine(factors, [c.name for c in combos])
+                diagrams = base.diagrams(members)
+                base_values = dict(diagrams.values, dz=base.displacements[..., 2],
+                                   Fz=base.reactions[..., 2])
+                
+                upper, lower = {}, {}
+                for key, b in base_values.items():
+                    up = np.maximum(gamma, 0.0).reshape((-1,) + (1,) * (b.ndim - 1))
+                    down = np.minimum(gamma, 0.0).reshape(up.shape)
+                    upper[key] = b + up * adverse[key] + down * favourable[key]
+                    lower[key] = b + up * favourable[key] + down * adverse[key]
+                maxima = {key: v.max(axis=0) for key, v in upper.items()}
+                minima = {key: v.min(axis=0) for key, v in lower.items()}
+                
+                dz = np.maximum(np.abs(upper['dz']), np.abs(lower['dz']))
+                k, n = np.unravel_index(dz.argmax(), dz.shape)
+                moment = np.maximum(np.abs(upper['moment_y']), np.abs(lower['moment_y']))
+                moment = moment[:, beams].max(axis=2)
+                km, bm = np.unravel_index(moment.argmax(), moment.shape)
+                envelopes[limit_state] = {
+                    'member_forces': self._member_envelopes(
+                        self.main_beam_members, diagrams.positions[beams],
+                        {key: v[beams] for key, v in maxima.items() if v.ndim == 2},
+                        {key: v[beams] for key, v in minima.items() if v.ndim == 2},
+                        self.BEAM_ENVELOPE_KEYS),
+                    'column_forces': self._member_envelopes(
+                        self.column_members, diagrams.positions[columns],
+                        {key: v[columns] for key, v in maxima.items() if v.ndim == 2},
+                        {key: v[columns] for key, v in minima.items() if v.ndim == 2},
+                        self.COLUMN_ENVELOPE_KEYS),
+                    'reactions': {
+                        name: {'Fz_max': float(maxima['Fz'][s]), 'Fz_min': float(minima['Fz'][s])}
+                        for s, name in enumerate(base.support_nodes)
+                    },
+                    'max_deflection': {
+                        'value': float(dz[k, n]) * 1000,
+                        'node': base.node_names[n],
+                        'combination': combos[k].name
+                    },
+                    'max_moment': {
+                        'value': float(moment[km, bm]),
+                        'member': self.main_beam_members[bm],
+                        'combination': combos[km].name
+                    }
+                }
+        
+        self.pattern_results = {'panels': names, 'envelopes': envelopes}
+        return self.pattern_results
+    
+    def check_design(self, layout, checker: MemberDesignChecker = None) -> DesignCheckResults:
+        """
+        Strength, stability and deflection checks of all members
+        
+        Args:
+            layout: Layout with the column, main beam and secondary beam specs
+            checker: MemberDesignChecker (default: SS400 steel)
+            
+        Returns:
+            DesignCheckResults with the unity check, governing check and
+            governing load combination of every member
+        """
+        if self.case_results is None:
+            raise ValueError("No analysis results. Call run_analysis() first.")
+        checker = checker or MemberDesignChecker()
+        combos = self._all_combinations()
+        
+        # End nodes of every results member, for the column drift check
+        topo = self.topology
+        node_rows = np.array([combos.node_index[name] for name in topo.node_labels()])
+        member_nodes = np.empty((len(combos.member_names), 2), dtype=np.int64)
+        member_rows = [combos.member_index[name] for name in topo.member_labels()]
+        member_nodes[member_rows] = node_rows[topo.connectivity]
+        
+        return checker.check(
+            combos,
+            [c.limit_state.name for c in self.combinations],
+            {'column': self.column_members,
+             'main_beam': self.main_beam_members,
+             'secondary_beam': self.sec_beam_members},
+            {'column': layout.column_spec,
+             'main_beam': layout.main_beam_spec,
+             'secondary_beam': layout.secondary_beam_spec},
+            member_nodes,
+        )
+    
+    def _service_views(self, service: FEMResults) -> Dict[str, Mapping]:
+        """Dict views of the primary (service) results"""
         return {
-            'value': max_def * 1000,  # Convert to mm
-            'node': max_node if max_node else 'N/A',
-            'limit': 'L/360'  # Typical limit
+            'deflections': service.deflections_view(),
+            'reactions': service.reactions_view(),
+            'member_forces': service.member_forces_view(members=self.main_beam_members),
+            'member_extremes': service.member_extremes_view(),
+        }
+    
+    def save_results(self, path: Union[str, Path]) -> Path:
+        """
+        Write the results of the last analysis to a results directory
+        
+        The directory holds the primary load case results ('cases'), the
+        service combination ('service') as memory-mappable arrays and the
+        combination summaries and envelopes (analysis.json).
+        
+        Args:
+            path: Target directory (e.g. 'project.femres')
+            
+        Returns:
+            The results directory
+        """
+        if self.case_results is None or 'error' in self.results:
+            raise ValueError("No analysis results. Call run_analysis() first.")
+        
+        path = Path(path)
+        self.case_results.save(path / 'cases')
+        self._combine_results([self.SERVICE_FACTORS], [self.SERVICE_NAME]).save(path / 'service')
+        
+        summary = {key: self.results[key] for key in self.SUMMARY_KEYS}
+        summary['engine'] = self.engine
+        summary['members'] = {
+            'column': self.column_members,
+            'main_beam': self.main_beam_members,
+            'secondary_beam': self.sec_beam_members,
         }
+        with open(path / 'analysis.json', 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False)
+        return path
+    
+    def load_results(self, path: Union[str, Path], mmap: bool = True) -> Dict[str, Any]:
+        """
+        Open results written by save_results() without re-solving
+        
+        Arrays are memory-mapped, so only the members and stations that are
+        displayed are read from disk.
+        
+        Args:
+            path: Results directory
+            mmap: Memory-map the result arrays
+            
+        Returns:
+            Results dictionary as returned by run_analysis()
+        """
+        path = Path(path)
+        with open(path / 'analysis.json', encoding='utf-8') as f:
+            summary = json.load(f)
+        
+        members = summary['members']
+        self.column_members = members['column']
+        self.main_beam_members = members['main_beam']
+        self.sec_beam_members = members['secondary_beam']
+        self.load_cases = list(summary['load_cases'])
+        self.case_results = FEMResults.load(path / 'cases', mmap)
+        self._combination_results = None
+        service = FEMResults.load(path / 'service', mmap)
+        
+        self.results = {
+            **self._service_views(service),
+            **{key: summary[key] for key in self.SUMMARY_KEYS},
+            'fem_results': self.case_results,
+        }
+        return self.results
+    
+    def _extract_case_results(self) -> FEMResults:
+        """Collect the results of every primary load case into a FEMResults store"""
+        node_names = list(self.model.nodes)
+        support_nodes = [nodes['base'] for nodes in self.column_nodes.values()]
+        
+        if self.engine == 'sparse':
+            case_idx = [self.model.load_cases.index(case) for case in self.load_cases]
+            displacements = self.model.D[case_idx][:, :, :3]
+            support_idx = [self.model.nodes[name] for name in support_nodes]
+            reactions = self.model.reactions[case_idx][:, support_idx, :3]
+            element_forces = ElementForces.from_sparse_model(self.model, self.load_cases)
+        else:
+            nodes = [self.model.nodes[name] for name in node_names]
+            displacements = np.array([
+                [[node.DX[case], node.DY[case], node.DZ[case]] for node in nodes]
+                for case in self.load_cases
+            ])
+            supports = [self.model.nodes[name] for name in support_nodes]
+            reactions = np.array([
+                [[node.RxnFX[case], node.RxnFY[case], node.RxnFZ[case]] for node in supports]
+                for case in self.load_cases
+            ])
+            element_forces = ElementForces.from_pynite_model(self.model, self.load_cases)
+        
+        return FEMResults(node_names, support_nodes, self.load_cases,
+                          displacements, reactions, element_forces, self.n_points)
+    
+    def _factor_matrix(self, combinations: List[Dict[LoadType, float]]) -> np.ndarray:
+        """Combination factors as an (n_combinations, n_cases) array"""
+        return LoadCombinationEngine.factor_matrix(
+            combinations, [LoadType(case) for case in self.load_cases])
+    
+    def _combine_results(self, combinations: List[Dict[LoadType, float]],
+                         names: List[str]) -> FEMResults:
+        """FEMResults of load combinations by superposition of the primary cases"""
+        if self.case_results is None:
+            raise ValueError("No analysis results. Call run_analysis() first.")
+        return self.case_results.combine(self._factor_matrix(combinations), names)
+    
+    def _all_combinations(self) -> FEMResults:
+        """FEMResults of every load combination (member extremes computed once)"""
+        if self._combination_results is None:
+            self._combination_results = self._combine_results(
+                [c.factors for c in self.combinations], [c.name for c in self.combinations])
+        return self._combination_results
+    
+    def combine(self, factors: Dict[LoadType, float]) -> Dict[str, Mapping]:
+        """
+        Results of a single load combination by superposition
+        
+        Args:
+            factors: Dictionary mapping LoadType to factor (as in
+                     LoadCombination.factors); missing load cases count as 0
+            
+        Returns:
+            Dictionary with 'deflections', 'reactions' and 'member_forces' in
+            the same format as the primary results
+        """
+        combined = self._combine_results([factors], ['combination'])
+        return {
+            'deflections': combined.deflections_view(),
+            'reactions': combined.reactions_view(),
+            'member_forces': combined.member_forces_view(members=self.main_beam_members)
+        }
+    
+    def member_extremes(self, factors: Dict[LoadType, float] = None) -> Mapping:
+        """
+        Exact extreme internal forces of all members for one combination
+        
+        Args:
+            factors: Dictionary mapping LoadType to factor (default: the
+                     primary 1.0D + 1.0L results)
+            
+        Returns:
+            {member: {component: {'max', 'x_max', 'min', 'x_min'}}} for the
+            components 'axial', 'shear_y', 'shear_z', 'moment_y', 'moment_z'
+        """
+        factors = self.SERVICE_FACTORS if factors is None else factors
+        return self._combine_results([factors], ['combination']).member_extremes_view()
+    
+    def _summarize_combinations(self) -> Dict[str, Dict]:
+        """Governing values of every load combination"""
+        if not self.combinations:
+            return {}
+        
+        combos = self._all_combinations()
+        dz, dz_node = combos.max_abs_displacement('dz')
+        rz = combos.reactions[..., 2]
+        rz_node = np.abs(rz).argmax(axis=1)
+        beams = [combos.member_index[name] for name in self.main_beam_members]
+        moment = combos.member_peaks('moment_y')[:, beams]
+        shear = combos.member_peaks('shear_z')[:, beams]
+        
+        summary = {}
+        for k, combo in enumerate(self.combinations):
+            summary[combo.name] = {
+                'limit_state': combo.limit_state.name,
+                'formula': combo.get_formula(),
+                'max_deflection': {'value': float(dz[k]) * 1000,
+                                   'node': combos.node_names[dz_node[k]]},
+                'max_reaction': {'value': float(rz[k, rz_node[k]]),
+                                 'node': combos.support_nodes[rz_node[k]]},
+                'max_moment': self._governing_member(moment[k]),
+                'max_shear': self._governing_member(shear[k]),
+            }
+        return summary
+    
+    def _governing_member(self, values: np.ndarray) -> Dict:
+        """Largest per-member value and the main beam it occurs in"""
+        b = int(values.argmax())
+        return {'value': float(values[b]), 'member': self.main_beam_members[b]}
+    
+    def _build_envelopes(self) -> Dict[str, Dict]:
+        """Max/min envelopes of the load combinations, per limit state"""
+        envelopes = {}
+        # Diagrams and reactions of the primary cases, enveloped over the
+        # combinations with one factor matrix product per component
+        diagrams = self.case_results.diagrams(self.main_beam_members)
+        components = set(self.BEAM_ENVELOPE_KEYS.values())
+        
+        for limit_state in ('ULS', 'SLS'):
+            combos = [c for c in self.combinations if c.limit_state.name == limit_state]
+            if not combos:
+                continue
+            factors = self._factor_matrix([c.factors for c in combos])
+            results = self.case_results.combine(factors, [c.name for c in combos])
+            diagram_envelopes = {key: LoadCombinationEngine.envelope(v, factors)
+                                 for key, v in diagrams.values.items() if key in components}
+            rz = LoadCombinationEngine.envelope(self.case_results.reactions[..., 2], factors)
+            
+            member_forces = self._member_envelopes(
+                self.main_beam_members, diagrams.positions,
+                {key: env.max for key, env in diagram_envelopes.items()},
+                {key: env.min for key, env in diagram_envelopes.items()},
+                self.BEAM_ENVELOPE_KEYS)
+            
+            reactions = {
+                name: {'Fz_max': float(rz.max[s]), 'Fz_min': float(rz.min[s])}
+                for s, name in enumerate(results.support_nodes)
+            }
+            
+            dz, dz_node = results.max_abs_displacement('dz')
+            k = int(dz.argmax())
+            beams = [results.member_index[name] for name in self.main_beam_members]
+            abs_moment = results.member_peaks('moment_y')[:, beams]
+            km, bm = np.unravel_index(abs_moment.argmax(), abs_moment.shape)
+            
+            envelopes[limit_state] = {
+                'member_forces': member_forces,
+                'reactions': reactions,
+                'max_deflection': {
+                    'value': float(dz[k]) * 1000,
+                    'node': results.node_names[dz_node[k]],
+                    'combination': combos[k].name
+                },
+                'max_moment': {
+                    'value': float(abs_moment[km, bm]),
+                    'member': self.main_beam_members[bm],
+                    'combination': combos[km].name
+                }
+            }
+        
+        return envelopes
+    
+    @staticmethod
+    def _member_envelopes(members: List[str], positions: np.ndarray, maxima: Dict[str, np.ndarray],
+                          minima: Dict[str, np.ndarray], keys: Dict[str, str]) -> Dict[str, Dict]:
+        """
+        {member: {'positions', '<key>_max', '<key>_min', ..., 'length'}} from
+        (n_members, n_points) envelopes per diagram component
+        """
+        envelopes = {}
+        for b, member_name in enumerate(members):
+            envelope = {'positions': positions[b].tolist()}
+            for key, component in keys.items():
+                envelope[f'{key}_max'] = maxima[component][b].tolist()
+                envelope[f'{key}_min'] = minima[component][b].tolist()
+            envelope['length'] = float(positions[b, -1])
+            envelopes[member_name] = envelope
+        return envelopes
+    
+    def _find_max_deflection(self, results: FEMResults, case=0) -> Dict:
+        """Find maximum deflection in the structure"""
+        max_def = results.max_deflection(case)
+        max_def['limit'] = 'L/360'  # Typical limit
+        return max_def
     
     def generate_fem_report(self) -> str:
         """
@@ -432,6 +1152,11 @@ class FloorSystemFEMAnalyzer:
             return "<h3>Chưa có kết quả phân tích. Vui lòng chạy phân tích trước.</h3>"
         
         max_def = self.results['max_deflection']
+        if self.case_results is not None:
+            n_nodes = len(self.case_results.node_names)
+            n_members = len(self.case_results.member_names)
+        else:
+            n_nodes, n_members = len(self.model.nodes), len(self.model.members)
         
         html = f"""
         <html>
@@ -471,11 +1196,11 @@ class FloorSystemFEMAnalyzer:
         </tr>
         <tr>
             <td>Số nút (nodes)</td>
-            <td>{len(self.model.nodes)}</td>
+            <td>{n_nodes}</td>
         </tr>
         <tr>
             <td>Số thanh (members)</td>
-            <td>{len(self.model.members)}</td>
+            <td>{n_members}</td>
         </tr>
         </table>
         </div>
@@ -499,7 +1224,26 @@ class FloorSystemFEMAnalyzer:
         html += """
         </table>
         
-        <h2>III. NỘI LỰC DẦM CHÍNH</h2>
+        <h2>III. TỔ HỢP TẢI TRỌNG</h2>
+        <table>
+        <tr><th>Tổ hợp</th><th>Độ võng max (mm)</th><th>Mô men max (kNm)</th><th>Lực cắt max (kN)</th></tr>
+        """
+        
+        # Add combination summary
+        for combo_name, combo in self.results.get('combinations', {}).items():
+            html += f"""
+            <tr>
+                <td>{combo_name}</td>
+                <td>{combo['max_deflection']['value']:.2f}</td>
+                <td>{combo['max_moment']['value']:.2f}</td>
+                <td>{combo['max_shear']['value']:.2f}</td>
+            </tr>
+            """
+        
+        html += """
+        </table>
+        
+        <h2>IV. NỘI LỰC DẦM CHÍNH</h2>
         <p>Xem biểu đồ Moment và Shear ở tab "📊 Biểu đồ Plotly"</p>
         
         </body>
@@ -0,0 +1,460 @@
+# -*- coding: utf-8 -*-
+"""
+FEM Results Store
+Columnar, NumPy-backed storage of floor system analysis results.
+
+Displacements and reactions are kept as contiguous (case, node, component)
+arrays and member forces as element end forces (see force_recovery), so
+queries over thousands of nodes and members are vectorized. Dict-compatible
+read-only views provide the historical nested-dict access
+(results['deflections'][node]['dz']) without materializing the dicts.
+
+Natural modes (ModalResults) are stored the same way: frequencies, mass
+participation and a (mode, node, DOF) array of mode shapes.
+
+Results are persisted as a directory of .npy arrays plus a JSON manifest.
+Loading memory-maps the arrays, so opening a large result is immediate and
+only the nodes, members and stations that are read are paged in.
+"""
+
+import abc
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from steeldeckfem.core.force_recovery import COMPONENTS, ElementForces, MemberForceDiagrams
+
+DISPLACEMENT_COMPONENTS = ('dx', 'dy', 'dz')
+REACTION_COMPONENTS = ('Fx', 'Fy', 'Fz')
+EXTREME_KEYS = ('max', 'x_max', 'min', 'x_min')
+
+RESULTS_FORMAT = 'steeldeckfem-results'
+RESULTS_VERSION = 1
+MODAL_FORMAT = 'steeldeckfem-modal'
+MODE_SHAPE_COMPONENTS = ('dx', 'dy', 'dz', 'rx', 'ry', 'rz')
+DIRECTIONS = ('X', 'Y', 'Z')
+MANIFEST_FILE = 'manifest.json'
+_ELEMENT_ARRAYS = ('forces', 'loads', 'length', 'x0', 'member_ptr', 'member_length')
+
+# Members whose diagrams MemberForceView recovers together
+_VIEW_BLOCK = 64
+
+
+class FEMResults:
+    """
+    FEM results for a set of load cases (or load combinations)
+
+    Arrays:
+        displacements: (n_cases, n_nodes, 3) translations dx, dy, dz (m)
+        reactions:     (n_cases, n_supports, 3) support forces Fx, Fy, Fz (kN)
+        element_forces: ElementForces of all members
+    """
+
+    def __init__(self, node_names: Sequence[str], support_nodes: Sequence[str],
+                 load_cases: Sequence[str], displacements: np.ndarray, reactions: np.ndarray,
+                 element_forces: ElementForces, n_points: int = 21):
+        self.node_names = list(node_names)
+        self.support_nodes = list(support_nodes)
+        self.load_cases = list(load_cases)
+        self.member_names = element_forces.members
+        self.displacements = np.ascontiguousarray(displacements, dtype=np.float64)
+        self.reactions = np.ascontiguousarray(reactions, dtype=np.float64)
+        self.element_forces = element_forces
+        self.n_points = n_points
+
+        self.node_index = {name: n for n, name in enumerate(self.node_names)}
+        self.support_index = {name: s for s, name in enumerate(self.support_nodes)}
+        self.member_index = element_forces.member_index
+        self._extremes = None
+
+    @property
+    def num_cases(self) -> int:
+        return len(self.load_cases)
+
+    def case_index(self, case: Union[int, str]) -> int:
+        """Row of a load case given by position or name"""
+        if isinstance(case, str):
+            try:
+                return self.load_cases.index(case)
+            except ValueError:
+                raise KeyError(f"Load case '{case}' not in results")
+        return case
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Write the results to a directory of .npy arrays and a JSON manifest
+
+        Args:
+            path: Target directory (created if needed)
+
+        Returns:
+            The results directory
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / 'displacements.npy', self.displacements)
+        np.save(path / 'reactions.npy', self.reactions)
+        for name in _ELEMENT_ARRAYS:
+            np.save(path / f'element_{name}.npy', getattr(self.element_forces, name))
+
+        # Manifest last: a directory without one is an incomplete write
+        manifest = {
+            'format': RESULTS_FORMAT,
+            'version': RESULTS_VERSION,
+            'node_names': self.node_names,
+            'support_nodes': self.support_nodes,
+            'load_cases': self.load_cases,
+            'member_names': self.member_names,
+            'n_points': self.n_points,
+        }
+        with open(path / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> 'FEMResults':
+        """
+        Open results written by save()
+
+        Args:
+            path: Results directory
+            mmap: Memory-map the arrays (read-only) instead of reading them
+
+        Returns:
+            FEMResults backed by the files
+        """
+        path = Path(path)
+        try:
+            with open(path / MANIFEST_FILE, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No FEM results in {path}")
+        if manifest.get('format') != RESULTS_FORMAT or manifest.get('version') != RESULTS_VERSION:
+            raise ValueError(f"Unsupported FEM results format in {path}")
+
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(path / f'element_{name}.npy', mmap_mode=mode)
+                  for name in _ELEMENT_ARRAYS}
+        element_forces = ElementForces(members=manifest['member_names'], **arrays)
+        return cls(
+            manifest['node_names'], manifest['support_nodes'], manifest['load_cases'],
+            np.load(path / 'displacements.npy', mmap_mode=mode),
+            np.load(path / 'reactions.npy', mmap_mode=mode),
+            element_forces, manifest['n_points'],
+        )
+
+    # ------------------------------------------------------------------
+    # Derived data
+    # ------------------------------------------------------------------
+    def combine(self, factors: np.ndarray, names: Sequence[str]) -> 'FEMResults':
+        """
+        Superpose load cases into load combinations
+
+        Args:
+            factors: (n_combinations, n_cases) combination factors
+            names: Combination names
+
+        Returns:
+            FEMResults with one "case" per combination
+        """
+        return FEMResults(
+            self.node_names, self.support_nodes, names,
+            np.tensordot(factors, self.displacements, axes=1),
+            np.tensordot(factors, self.reactions, axes=1),
+            self.element_forces.combine(factors),
+            self.n_points,
+        )
+
+    def diagrams(self, members: List[str] = None) -> MemberForceDiagrams:
+        """Sampled internal force diagrams (all members by default)"""
+        return self.element_forces.diagrams(self.n_points, members)
+
+    @property
+    def extremes(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Exact member extremes: component -> key -> (n_cases, n_members)"""
+        if self._extremes is None:
+            self._extremes = self.element_forces.extremes()
+        return self._extremes
+
+    # ------------------------------------------------------------------
+    # Vectorized queries
+    # ------------------------------------------------------------------
+    def max_abs_displacement(self, component: str = 'dz') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Largest absolute displacement of every case
+
+        Returns:
+            (values (n_cases,) in m, node indices (n_cases,))
+        """
+        values = np.abs(self.displacements[..., DISPLACEMENT_COMPONENTS.index(component)])
+        nodes = values.argmax(axis=1)
+        return values[np.arange(self.num_cases), nodes], nodes
+
+    def max_deflection(self, case: Union[int, str] = 0) -> Dict:
+        """Largest vertical deflection (mm) of one case and its node"""
+        values, nodes = self.max_abs_displacement('dz')
+        c = self.case_index(case)
+        return {'value': float(values[c]) * 1000, 'node': self.node_names[nodes[c]]}
+
+    def reaction_totals(self, groups: Dict[str, Sequence[str]]) -> Dict[str, np.ndarray]:
+        """
+        Summed support reactions per group of support nodes
+
+        Args:
+            groups: Group name -> support node names
+
+        Returns:
+            Group name -> (n_cases, 3) array of Fx, Fy, Fz totals
+        """
+        return {
+            group: self.reactions[:, [self.support_index[name] for name in nodes]].sum(axis=1)
+            for group, nodes in groups.items()
+        }
+
+    def member_peaks(self, component: str = 'moment_y') -> np.ndarray:
+        """Largest absolute value of a force component, (n_cases, n_members)"""
+        extremes = self.extremes[component]
+        return np.maximum(np.abs(extremes['max']), np.abs(extremes['min']))
+
+    def members_exceeding(self, capacity: Union[float, np.ndarray, Dict[str, float]],
+                          component: str = 'moment_y', ratio: float = 1.0,
+                          case: Union[int, str] = None) -> List[str]:
+        """
+        Members whose peak force exceeds ratio × capacity
+
+        Args:
+            capacity: Capacity for all members, per member (n_members,), or a
+                      dict of member name -> capacity (other members skipped)
+            component: Force component (see force_recovery.COMPONENTS)
+            ratio: Utilization threshold
+            case: Load case; None checks the envelope of all cases
+
+        Returns:
+            Member names in model order
+        """
+        peaks = self.member_peaks(component)
+        peak = peaks.max(axis=0) if case is None else peaks[self.case_index(case)]
+
+        if isinstance(capacity, dict):
+            cap = np.full(len(self.member_names), np.inf)
+            for name, value in capacity.items():
+                cap[self.member_index[name]] = value
+        else:
+            cap = np.broadcast_to(np.asarray(capacity, dtype=np.float64), peak.shape)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exceeding = np.flatnonzero(peak / cap > ratio)
+        return [self.member_names[m] for m in exceeding]
+
+    # ------------------------------------------------------------------
+    # Dict-compatible views
+    # ------------------------------------------------------------------
+    def deflections_view(self, case: Union[int, str] = 0) -> 'DisplacementView':
+        """{node: {'dx', 'dy', 'dz'}} view of one case"""
+        return DisplacementView(self, self.case_index(case))
+
+    def reactions_view(self, case: Union[int, str] = 0) -> 'ReactionView':
+        """{support node: {'Fx', 'Fy', 'Fz'}} view of one case"""
+        return ReactionView(self, self.case_index(case))
+
+    def member_forces_view(self, case: Union[int, str] = 0,
+                           members: List[str] = None) -> 'MemberForceView':
+        """{member: {'positions', 'shear', 'moment', 'axial', 'length'}} view of one case"""
+        return MemberForceView(self, self.case_index(case), members)
+
+    def member_extremes_view(self, case: Union[int, str] = 0) -> 'MemberExtremeView':
+        """{member: {component: {'max', 'x_max', 'min', 'x_min'}}} view of one case"""
+        return MemberExtremeView(self, self.case_index(case))
+
+
+@dataclass
+class ModalResults:
+    """
+    Natural modes of a structure, lowest first
+
+    Arrays:
+        omega:         (n_modes,) circular frequencies (rad/s)
+        mode_shapes:   (n_modes, n_nodes, 6) mass-normalized mode shapes
+        participation: (n_modes, 3) participation factors in X, Y, Z (t^0.5)
+        total_mass:    (3,) mass of the free DOF in X, Y, Z (t)
+    """
+    node_names: List[str]
+    omega: np.ndarray
+    mode_shapes: np.ndarray
+    participation: np.ndarray
+    total_mass: np.ndarray
+
+    @property
+    def num_modes(self) -> int:
+        return len(self.omega)
+
+    @property
+    def frequencies(self) -> np.ndarray:
+        """Natural frequencies (Hz)"""
+        return self.omega / (2 * np.pi)
+
+    @property
+    def periods(self) -> np.ndarray:
+        """Natural periods (s)"""
+        with np.errstate(divide='ignore'):
+            return 2 * np.pi / self.omega
+
+    @property
+    def effective_mass(self) -> np.ndarray:
+        """Effective modal mass (n_modes, 3) in X, Y, Z (t)"""
+        return self.participation**2
+
+    @property
+    def mass_ratios(self) -> np.ndarray:
+        """Effective modal mass over the total mass, (n_modes, 3)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.nan_to_num(self.effective_mass / self.total_mass)
+
+    @cached_property
+    def node_index(self) -> Dict[str, int]:
+        """Node name -> row index"""
+        return {name: n for n, name in enumerate(self.node_names)}
+
+    def mode_shape(self, mode: int, node: str) -> Dict[str, float]:
+        """Mode shape components at a node (mode counted from 0)"""
+        values = self.mode_shapes[mode, self.node_index[node]].tolist()
+        return dict(zip(MODE_SHAPE_COMPONENTS, values))
+
+    def summary(self) -> List[Dict]:
+        """Period, frequency and (cumulative) mass ratios of every mode"""
+        ratios = self.mass_ratios
+        cumulative = np.cumsum(ratios, axis=0)
+        return [
+            {
+                'mode': k + 1,
+                'period': float(self.periods[k]),
+                'frequency': float(self.frequencies[k]),
+                'mass_ratio': dict(zip(DIRECTIONS, ratios[k].tolist())),
+                'cumulative_mass_ratio': dict(zip(DIRECTIONS, cumulative[k].tolist())),
+            }
+            for k in range(self.num_modes)
+        ]
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the modes to a directory of .npy arrays and a JSON manifest"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ('omega', 'mode_shapes', 'participation', 'total_mass'):
+            np.save(path / f'{name}.npy', getattr(self, name))
+        manifest = {'format': MODAL_FORMAT, 'version': RESULTS_VERSION,
+                    'node_names': self.node_names}
+        with open(path / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> 'ModalResults':
+        """Open modes written by save() (mode shapes memory-mapped)"""
+        path = Path(path)
+        try:
+            with open(path / MANIFEST_FILE, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No modal results in {path}")
+        if manifest.get('format') != MODAL_FORMAT or manifest.get('version') != RESULTS_VERSION:
+            raise ValueError(f"Unsupported modal results format in {path}")
+        return cls(
+            node_names=manifest['node_names'],
+            omega=np.load(path / 'omega.npy'),
+            mode_shapes=np.load(path / 'mode_shapes.npy', mmap_mode='r' if mmap else None),
+            participation=np.load(path / 'participation.npy'),
+            total_mass=np.load(path / 'total_mass.npy'),
+        )
+
+
+class _ResultsView(Mapping):
+    """Read-only mapping from names to rows of one load case"""
+
+    def __init__(self, results: FEMResults, case: int, names: List[str], index: Dict[str, int]):
+        self._results = results
+        self._case = case
+        self._names = names
+        self._index = index
+
+    def __getitem__(self, name):
+        return self._row(self._index[name])
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __repr__(self):
+        return f"<{type(self).__name__} case={self._results.load_cases[self._case]!r} n={len(self)}>"
+
+    @abc.abstractmethod
+    def _row(self, i: int) -> Dict:
+        """Row i of the view as a dict"""
+
+
+class DisplacementView(_ResultsView):
+    def __init__(self, results: FEMResults, case: int):
+        super().__init__(results, case, results.node_names, results.node_index)
+
+    def _row(self, n):
+        return dict(zip(DISPLACEMENT_COMPONENTS, self._results.displacements[self._case, n].tolist()))
+
+
+class ReactionView(_ResultsView):
+    def __init__(self, results: FEMResults, case: int):
+        super().__init__(results, case, results.support_nodes, results.support_index)
+
+    def _row(self, s):
+        return dict(zip(REACTION_COMPONENTS, self._results.reactions[self._case, s].tolist()))
+
+
+class MemberForceView(_ResultsView):
+    """
+    Gravity bending diagrams (shear along local z, moment about local y),
+    recovered on first access for the block of _VIEW_BLOCK viewed members
+    holding the member read
+    """
+
+    def __init__(self, results: FEMResults, case: int, members: List[str] = None):
+        members = results.member_names if members is None else list(members)
+        super().__init__(results, case, members, {name: m for m, name in enumerate(members)})
+        self._blocks: Dict[int, MemberForceDiagrams] = {}
+
+    def _row(self, m):
+        b, i = divmod(m, _VIEW_BLOCK)
+        if b not in self._blocks:
+            self._blocks[b] = self._results.diagrams(self._names[b * _VIEW_BLOCK:(b + 1) * _VIEW_BLOCK])
+        diagrams = self._blocks[b]
+        values = diagrams.values
+        positions = diagrams.positions[i]
+        return {
+            'positions': positions.tolist(),
+            'shear': values['shear_z'][self._case, i].tolist(),
+            'moment': values['moment_y'][self._case, i].tolist(),
+            'axial': values['axial'][self._case, i].tolist(),
+            'length': float(positions[-1])
+        }
+
+
+class MemberExtremeView(_ResultsView):
+    def __init__(self, results: FEMResults, case: int):
+        super().__init__(results, case, results.member_names, results.member_index)
+
+    def _row(self, m):
+        extremes = self._results.extremes
+        return {
+            component: {key: float(extremes[component][key][self._case, m]) for key in EXTREME_KEYS}
+            for component in COMPONENTS
+        }
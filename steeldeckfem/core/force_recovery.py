@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Member Force Recovery
+Closed-form internal force diagrams for all members in one vectorized pass.
+
+Internal forces are recovered from the local end forces of every analysis
+element and the linearly varying line loads acting on it (PyNite sign
+conventions):
+
+    N(x)  = f0 + ∫p
+    Vy(x) = f1 + ∫wy           Mz(x) = f5 - f1·x - ∫∫wy
+    Vz(x) = f2 + ∫wz           My(x) = -f4 - f2·x - ∫∫wz
+
+Element end forces and loads are linear in the load cases, so load
+combinations are formed on them before recovery and give exact diagrams and
+extremes for every combination.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List
+
+import numpy as np
+
+COMPONENTS = ('axial', 'shear_y', 'shear_z', 'moment_y', 'moment_z')
+
+# Points closer than this to an element start (m) belong to that element
+_X_TOLERANCE = 1e-9
+
+
+@dataclass
+class MemberForceDiagrams:
+    """Sampled internal force diagrams"""
+    members: List[str]
+    positions: np.ndarray           # (n_members, n_points)
+    values: Dict[str, np.ndarray]   # component -> (n_cases, n_members, n_points)
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Member name -> row index"""
+        return {name: m for m, name in enumerate(self.members)}
+
+
+@dataclass
+class ElementForces:
+    """
+    Local end forces and line loads of all analysis elements
+
+    Elements are grouped by physical member (in member order) and sorted
+    along each member; member_ptr[m]:member_ptr[m + 1] are the elements of
+    member m.
+    """
+    members: List[str]
+    forces: np.ndarray          # (n_cases, n_elements, 12) local end forces
+    loads: np.ndarray           # (n_cases, n_elements, 3, 2) local x/y/z load at i and j
+    length: np.ndarray          # (n_elements,)
+    x0: np.ndarray              # (n_elements,) start position along the member
+    member_ptr: np.ndarray      # (n_members + 1,)
+    member_length: np.ndarray   # (n_members,)
+
+    @cached_property
+    def member_index(self) -> Dict[str, int]:
+        """Member name -> row index"""
+        return {name: m for m, name in enumerate(self.members)}
+
+    @classmethod
+    def from_sparse_model(cls, model, cases: List[str] = None,
+                          solution: Dict[str, np.ndarray] = None) -> 'ElementForces':
+        """
+        Collect the element arrays of an analyzed SparseFrameModel
+
+        With a `solution` returned by model.analyze_pdelta(), the
+        second-order forces of its combinations are collected instead of
+        the load cases.
+        """
+        if solution is not None:
+            forces, loads = solution['element_forces'], solution['loads']
+        else:
+            case_idx = [model.load_cases.index(case) for case in cases]
+            forces, loads = model.element_forces[case_idx], model._elem_w[case_idx]
+        return cls(
+            members=list(model.members),
+            forces=forces,
+            loads=loads,
+            length=model._elem_L,
+            x0=model._elem_x0,
+            member_ptr=model._member_elem_ptr,
+            member_length=model._member_length,
+        )
+
+    @classmethod
+    def from_pynite_model(cls, model, cases: List[str]) -> 'ElementForces':
+        """
+        Collect the sub-member arrays of an analyzed PyNite FEModel3D
+
+        Each case must have a load combination of the same name. Only
+        full-length distributed loads are supported.
+        """
+        members = list(model.members)
+        forces, loads, length, x0, counts, member_length = [], [], [], [], [], []
+
+        for name in members:
+            sub_members = list(model.members[name].sub_members.values())
+            counts.append(len(sub_members))
+            member_length.append(model.members[name].L())
+            x = 0.0
+            for sub in sub_members:
+                L = sub.L()
+                R = sub.T()[:3, :3]
+                length.append(L)
+                x0.append(x)
+                x += L
+                forces.append([sub.f(case)[:, 0] for case in cases])
+                loads.append(_pynite_line_loads(sub, R, L, cases))
+
+        return cls(
+            members=members,
+            forces=np.asarray(forces, dtype=np.float64).transpose(1, 0, 2),
+            loads=np.asarray(loads, dtype=np.float64).transpose(1, 0, 2, 3),
+            length=np.asarray(length, dtype=np.float64),
+            x0=np.asarray(x0, dtype=np.float64),
+            member_ptr=np.concatenate([[0], np.cumsum(counts)]),
+            member_length=np.asarray(member_length, dtype=np.float64),
+        )
+
+    def combine(self, factors: np.ndarray) -> 'ElementForces':
+        """
+        Superpose load cases
+
+        Args:
+            factors: (n_combinations, n_cases) combination factors
+
+        Returns:
+            ElementForces with one "case" per combination
+        """
+        return ElementForces(
+            members=self.members,
+            forces=np.tensordot(factors, self.forces, axes=1),
+            loads=np.tensordot(factors, self.loads, axes=1),
+            length=self.length,
+            x0=self.x0,
+            member_ptr=self.member_ptr,
+            member_length=self.member_length,
+        )
+
+    def _member_table(self, rows: np.ndarray = None):
+        """Element indices per member (or per member in rows), padded with the first element"""
+        starts = np.asarray(self.member_ptr[:-1] if rows is None else self.member_ptr[rows])
+        counts = np.asarray(self.member_ptr[1:] if rows is None else self.member_ptr[rows + 1]) - starts
+        slots = np.arange(counts.max())
+        valid = slots[None, :] < counts[:, None]
+        table = np.where(valid, starts[:, None] + slots[None, :], starts[:, None])
+        return table, valid
+
+    def diagrams(self, n_points: int = 21, members: List[str] = None) -> MemberForceDiagrams:
+        """
+        Internal forces at n_points equally spaced positions along members
+
+        Args:
+            n_points: Number of stations per member
+            members: Member names to recover (default: all members)
+
+        Returns:
+            MemberForceDiagrams with arrays of shape (n_cases, n_members, n_points)
+        """
+        if members is None:
+            members = self.members
+            rows = np.arange(len(self.members))
+        else:
+            rows = np.array([self.member_index[name] for name in members], dtype=np.int64)
+        positions = self.member_length[rows, None] * np.linspace(0.0, 1.0, n_points)[None, :]
+
+        # Element holding each point: last element starting at or before it
+        table, valid = self._member_table(rows)
+        starts = np.where(valid, self.x0[table], np.inf)
+        slot = (starts[:, None, :] <= positions[:, :, None] + _X_TOLERANCE).sum(axis=2) - 1
+        elem = np.take_along_axis(table, np.maximum(slot, 0), axis=1)
+
+        xe = positions - self.x0[elem]
+        values = _evaluate(self.forces[:, elem], self.loads[:, elem], self.length[elem], xe)
+        return MemberForceDiagrams(members=list(members), positions=positions, values=values)
+
+    def extremes(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Exact maximum and minimum of every internal force component
+
+        Candidates are the element ends and the stationary points inside each
+        element (zero shear for moments, zero load for shear and axial).
+
+        Returns:
+            component -> {'max', 'x_max', 'min', 'x_min'}, arrays of shape
+            (n_cases, n_members); x is measured from the member start
+        """
+        f, w, L = self.forces, self.loads, self.length
+        w1 = w[..., 0]
+        slope = (w[..., 1] - w1) / L[None, :, None]
+
+        candidates = [np.zeros_like(f[..., 0]), np.broadcast_to(L, f.shape[:2])]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for k in (1, 2):
+                candidates.extend(_quadratic_roots(f[..., k], w1[..., k], slope[..., k] / 2))
+            for k in range(3):
+                candidates.append(-w1[..., k] / slope[..., k])
+        xe = np.stack(candidates, axis=-1)
+        xe = np.where(np.isfinite(xe) & (xe >= 0) & (xe <= L[None, :, None]), xe, 0.0)
+
+        values = _evaluate(f[:, :, None], w[:, :, None], L[None, :, None], xe)
+        x = self.x0[None, :, None] + xe
+
+        table, _ = self._member_table()
+        result = {}
+        for component, v in values.items():
+            result[component] = {}
+            for key, reduce in (('max', np.argmax), ('min', np.argmin)):
+                # Per element, then per member
+                c = reduce(v, axis=2)[..., None]
+                v_elem = np.take_along_axis(v, c, axis=2)[..., 0]
+                x_elem = np.take_along_axis(x, c, axis=2)[..., 0]
+                e = reduce(v_elem[:, table], axis=2)[..., None]
+                result[component][key] = np.take_along_axis(v_elem[:, table], e, axis=2)[..., 0]
+                result[component]['x_' + key] = np.take_along_axis(x_elem[:, table], e, axis=2)[..., 0]
+        return result
+
+
+def _evaluate(f, w, L, xe) -> Dict[str, np.ndarray]:
+    """Closed-form internal forces at local positions xe (all arguments broadcast)"""
+    w1 = w[..., 0]
+    slope = (w[..., 1] - w1) / np.asarray(L)[..., None]
+    x = np.asarray(xe)[..., None]
+    load_1 = w1 * x + slope * x**2 / 2        # ∫w
+    load_2 = w1 * x**2 / 2 + slope * x**3 / 6  # ∫∫w
+    xe = np.asarray(xe)
+    return {
+        'axial': f[..., 0] + load_1[..., 0],
+        'shear_y': f[..., 1] + load_1[..., 1],
+        'shear_z': f[..., 2] + load_1[..., 2],
+        'moment_y': -f[..., 4] - f[..., 2] * xe - load_2[..., 2],
+        'moment_z': f[..., 5] - f[..., 1] * xe - load_2[..., 1],
+    }
+
+
+def _quadratic_roots(c0, c1, c2):
+    """Real roots of c0 + c1·x + c2·x² (NaN where there is none)"""
+    linear = np.abs(c2) < 1e-12 * np.maximum(np.abs(c1), 1.0)
+    disc = np.sqrt(c1**2 - 4 * c2 * c0)
+    r1 = np.where(linear, -c0 / c1, (-c1 + disc) / (2 * c2))
+    r2 = np.where(linear, np.nan, (-c1 - disc) / (2 * c2))
+    return r1, r2
+
+
+def _pynite_line_loads(sub, R: np.ndarray, L: float, cases: List[str]) -> np.ndarray:
+    """Local x/y/z load intensities at both ends of a PyNite sub-member, per case"""
+    local_dirs = {'Fx': 0, 'Fy': 1, 'Fz': 2}
+    global_dirs = {'FX': 0, 'FY': 1, 'FZ': 2}
+    w = np.zeros((len(cases), 3, 2))
+
+    for direction, w1, w2, x1, x2, case, *_ in sub.DistLoads:
+        if case not in cases:
+            continue
+        if abs(x1) > _X_TOLERANCE or abs(x2 - L) > _X_TOLERANCE:
+            raise ValueError("Force recovery only supports full-length distributed loads")
+        unit = np.zeros(3)
+        if direction in global_dirs:
+            unit[global_dirs[direction]] = 1.0
+            unit = R @ unit
+        else:
+            unit[local_dirs[direction]] = 1.0
+        w[cases.index(case)] += np.outer(unit, [w1, w2])
+    return w
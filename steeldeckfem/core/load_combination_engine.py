@@ -2,10 +2,31 @@
 """
 Load Combination Engine
 TCVN 2737:2023 - Vietnamese Building Code for Loads
+
+Combinations also have a matrix form: an (n_combinations, n_load_types)
+factor matrix applied with one matrix product to per-load-case results
+stacked along their first axis (member forces at every station,
+reactions, displacements), from which max/min envelopes and the governing
+combination of every entry follow. Envelopes are streamed over blocks of
+entries within a memory budget, so combinations x stations never have to
+fit in memory at once.
+
+Project combinations are generated from load groups (LoadGroup): every
+variable group leads in turn at its leading factor while the others
+accompany at their companion factors or stay absent, the cases of one group
+are mutually exclusive (wind +X/-X/+Y/-Y, seismic +/-) and permanent groups
+take their adverse or favourable factor. The generator is lazy, and
+LoadCombinationEngine.prune_dominated drops combinations that can never
+govern the envelope of given case results before anything is evaluated.
 """
 
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from itertools import product
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 
 class LoadType(Enum):
@@ -25,6 +46,30 @@ class LimitState(Enum):
     SLS = "Serviceability Limit State"    # Trạng thái giới hạn sử dụng
 
 
+# Column order of factor matrices by default
+LOAD_TYPES = tuple(LoadType)
+
+# Combinations compared at once when pruning dominated ones
+_PRUNE_BLOCK = 256
+
+# Fewest entries per envelope block before combinations are split instead
+_MIN_BLOCK_ENTRIES = 4096
+
+
+def _case_key(case) -> Hashable:
+    """LoadType for standard case names, else the name itself"""
+    if isinstance(case, LoadType):
+        return case
+    try:
+        return LoadType(case)
+    except ValueError:
+        return case
+
+
+def _case_label(case) -> str:
+    return case.value if isinstance(case, LoadType) else str(case)
+
+
 class LoadCombination:
     """Represents a single load combination"""
     
@@ -61,10 +106,11 @@ class LoadCombination:
         for load_type, factor in self.factors.items():
             if factor != 0:
                 sign = "+" if factor > 0 else "-"
+                label = _case_label(load_type)
                 if abs(factor) == 1.0:
-                    terms.append(f"{sign} {load_type.value}")
+                    terms.append(f"{sign} {label}")
                 else:
-                    terms.append(f"{sign} {abs(factor):.1f}{load_type.value}")
+                    terms.append(f"{sign} {abs(factor):.1f}{label}")
         
         formula = " ".join(terms)
         if formula.startswith("+ "):
@@ -72,116 +118,315 @@ class LoadCombination:
         return formula
 
 
+@dataclass
+class CombinationEnvelope:
+    """
+    Max/min over load combinations of every entry of a result array
+
+    Arrays (shape of one load case's results):
+        max, min:                 Envelope values
+        max_index, min_index:     Governing combination (row of the factor
+                                  matrix) of every entry
+    """
+    max: np.ndarray
+    min: np.ndarray
+    max_index: np.ndarray
+    min_index: np.ndarray
+    
+    @property
+    def abs_max(self) -> np.ndarray:
+        """Largest absolute value of every entry"""
+        return np.maximum(self.max, -self.min)
+    
+    @property
+    def abs_max_index(self) -> np.ndarray:
+        """Governing combination of abs_max"""
+        return np.where(self.max >= -self.min, self.max_index, self.min_index)
+
+
+@dataclass
+class LoadGroup:
+    """
+    Load cases entering combinations under common factors
+    
+    The cases of a group are mutually exclusive: a combination contains at
+    most one of them (e.g. wind cases WX+, WX-, WY+, WY-). Case names that
+    are LoadType values ('D', 'L', 'W', ...) are keyed by the LoadType, so
+    generated combinations apply directly to the analyzer's load cases.
+    
+    Factors:
+        leading:      Permanent groups: adverse factor. Variable groups:
+                      factor as the leading action. Accidental groups:
+                      factor of the seismic action.
+        accompanying: Variable groups: companion factor next to another
+                      leading action (0: never accompanies)
+        favourable:   Permanent groups: factor where the load relieves
+                      (None: always adverse)
+        seismic:      Factor in seismic combinations (None: not present)
+        service:      SLS factor as permanent or leading action
+        service_accompanying: SLS companion factor (0: never accompanies)
+    """
+    name: str
+    cases: Sequence[Union[str, LoadType]]
+    leading: float
+    accompanying: float = 0.0
+    favourable: Optional[float] = None
+    seismic: Optional[float] = None
+    service: float = 1.0
+    service_accompanying: float = 0.0
+    permanent: bool = False
+    accidental: bool = False
+    reversible: bool = False
+    
+    def __post_init__(self):
+        if isinstance(self.cases, (str, LoadType)):
+            self.cases = [self.cases]
+        self.cases = tuple(_case_key(case) for case in self.cases)
+        if not self.cases:
+            raise ValueError(f"Load group {self.name!r} has no load cases")
+        if self.permanent and self.accidental:
+            raise ValueError(f"Load group {self.name!r} cannot be permanent and accidental")
+    
+    def terms(self, factor: float) -> List[Tuple[Hashable, float]]:
+        """(case, factor) alternatives of the group, reversed too if reversible"""
+        signs = (1.0, -1.0) if self.reversible else (1.0,)
+        return [(case, sign * factor) for case in self.cases for sign in signs]
+
+
+# Default groups of the analyzer's load cases (same factors as the
+# standard combinations; wind and earthquake act in both directions)
+TCVN_LOAD_GROUPS = (
+    LoadGroup('Dead', LoadType.DEAD, leading=1.1, favourable=0.9, seismic=1.0,
+              permanent=True),
+    LoadGroup('Live', LoadType.LIVE, leading=1.3, accompanying=0.8, seismic=0.5,
+              service_accompanying=0.7),
+    LoadGroup('Wind', LoadType.WIND, leading=1.3, accompanying=0.8,
+              service_accompanying=0.7, reversible=True),
+    LoadGroup('Crane', LoadType.CRANE, leading=1.0),
+    LoadGroup('Seismic', LoadType.SEISMIC, leading=1.0, accidental=True, reversible=True),
+)
+
+
 class LoadCombinationEngine:
     """Engine for generating TCVN 2737:2023 load combinations"""
     
+    # Memory for one block of envelope() (combined values and the case
+    # values they are formed from), in bytes; blocks this small stay in
+    # cache, larger ones only save loop overhead
+    memory_budget = 4 * 2**20
+    
     @staticmethod
     def get_uls_combinations() -> List[LoadCombination]:
         """
         Get all Ultimate Limit State (ULS) combinations per TCVN 2737:2023
         
+        The combinations are built once; every call returns a new list of
+        the same objects.
+        
         Returns:
             List of LoadCombination objects for ULS
         """
-        combinations = []
-        
-        # LC1: 1.1D + 1.3L (Permanent + Variable - Basic)
-        combinations.append(LoadCombination(
-            "LC1: 1.1D + 1.3L",
-            {LoadType.DEAD: 1.1, LoadType.LIVE: 1.3},
-            LimitState.ULS
-        ))
-        
-        # LC2: 1.1D + 1.3L + 0.8W (Permanent + Variable + Wind)
-        combinations.append(LoadCombination(
-            "LC2: 1.1D + 1.3L + 0.8W",
-            {LoadType.DEAD: 1.1, LoadType.LIVE: 1.3, LoadType.WIND: 0.8},
-            LimitState.ULS
-        ))
-        
-        # LC3: 1.1D + 0.8L + 1.3W (Wind dominant)
-        combinations.append(LoadCombination(
-            "LC3: 1.1D + 0.8L + 1.3W",
-            {LoadType.DEAD: 1.1, LoadType.LIVE: 0.8, LoadType.WIND: 1.3},
-            LimitState.ULS
-        ))
-        
-        # LC4: 1.1D + 1.3W (Permanent + Wind only)
-        combinations.append(LoadCombination(
-            "LC4: 1.1D + 1.3W",
-            {LoadType.DEAD: 1.1, LoadType.WIND: 1.3},
-            LimitState.ULS
-        ))
-        
-        # LC5: 1.0D + 0.5L + 1.0E (Seismic combination - positive)
-        combinations.append(LoadCombination(
-            "LC5: 1.0D + 0.5L + 1.0E",
-            {LoadType.DEAD: 1.0, LoadType.LIVE: 0.5, LoadType.SEISMIC: 1.0},
-            LimitState.ULS
-        ))
-        
-        # LC6: 1.0D + 0.5L - 1.0E (Seismic combination - negative)
-        combinations.append(LoadCombination(
-            "LC6: 1.0D + 0.5L - 1.0E",
-            {LoadType.DEAD: 1.0, LoadType.LIVE: 0.5, LoadType.SEISMIC: -1.0},
-            LimitState.ULS
-        ))
-        
-        # LC7: 1.0D + 1.0C (Crane load)
-        combinations.append(LoadCombination(
-            "LC7: 1.0D + 1.0C",
-            {LoadType.DEAD: 1.0, LoadType.CRANE: 1.0},
-            LimitState.ULS
-        ))
-        
-        # LC8: 0.9D + 1.3W (Uplift check - minimum dead load)
-        combinations.append(LoadCombination(
-            "LC8: 0.9D + 1.3W (Uplift)",
-            {LoadType.DEAD: 0.9, LoadType.WIND: 1.3},
-            LimitState.ULS
-        ))
-        
-        return combinations
+        return list(_uls_combinations())
     
     @staticmethod
     def get_sls_combinations() -> List[LoadCombination]:
         """
         Get all Serviceability Limit State (SLS) combinations
         
+        The combinations are built once; every call returns a new list of
+        the same objects.
+        
         Returns:
             List of LoadCombination objects for SLS
         """
-        combinations = []
-        
-        # SLS1: 1.0D + 1.0L (Characteristic combination)
-        combinations.append(LoadCombination(
-            "SLS1: 1.0D + 1.0L",
-            {LoadType.DEAD: 1.0, LoadType.LIVE: 1.0},
-            LimitState.SLS
-        ))
-        
-        # SLS2: 1.0D + 0.7L + 0.7W (Frequent combination)
-        combinations.append(LoadCombination(
-            "SLS2: 1.0D + 0.7L + 0.7W",
-            {LoadType.DEAD: 1.0, LoadType.LIVE: 0.7, LoadType.WIND: 0.7},
-            LimitState.SLS
-        ))
-        
-        # SLS3: 1.0D + 0.7W (Wind deflection check)
-        combinations.append(LoadCombination(
-            "SLS3: 1.0D + 0.7W",
-            {LoadType.DEAD: 1.0, LoadType.WIND: 0.7},
-            LimitState.SLS
-        ))
-        
-        # SLS4: 1.0D (Quasi-permanent - for long-term deflection)
-        combinations.append(LoadCombination(
-            "SLS4: 1.0D (Permanent only)",
-            {LoadType.DEAD: 1.0},
-            LimitState.SLS
-        ))
-        
-        return combinations
+        return list(_sls_combinations())
+    
+    @staticmethod
+    def get_combinations(limit_state: LimitState = LimitState.ULS) -> List[LoadCombination]:
+        """Standard combinations of one limit state"""
+        if limit_state == LimitState.ULS:
+            return LoadCombinationEngine.get_uls_combinations()
+        return LoadCombinationEngine.get_sls_combinations()
+    
+    @staticmethod
+    def factor_matrix(combinations: Sequence[Union[LoadCombination, Dict[LoadType, float]]] = None,
+                      load_types: Sequence[LoadType] = LOAD_TYPES,
+                      limit_state: LimitState = LimitState.ULS) -> np.ndarray:
+        """
+        Combination factors as an (n_combinations, n_load_types) matrix
+        
+        Args:
+            combinations: Combinations or factor dictionaries (default: the
+                          standard combinations of limit_state, whose
+                          matrix is cached and read-only)
+            load_types: Load type of every column
+            limit_state: Limit state of the default combinations
+        
+        Returns:
+            Factor matrix, rows in combination order
+        """
+        if combinations is None:
+            return _standard_factor_matrix(limit_state, tuple(load_types))
+        return _factor_matrix(combinations, load_types)
+    
+    @staticmethod
+    def combine(case_values: np.ndarray, factors: np.ndarray) -> np.ndarray:
+        """
+        Superpose per-load-case results
+        
+        Args:
+            case_values: (n_load_types, ...) results, one row per factor
+                         matrix column
+            factors: (n_combinations, n_load_types) factor matrix
+        
+        Returns:
+            (n_combinations, ...) combined results
+        """
+        return np.tensordot(factors, case_values, axes=1)
+    
+    @staticmethod
+    def envelope(case_values: np.ndarray, factors: np.ndarray,
+                 memory_budget: int = None) -> CombinationEnvelope:
+        """
+        Max/min envelope of combined results with the governing combinations
+        
+        The combinations are formed by factor matrix products over blocks
+        of entries (and, when one block of entries for all combinations
+        would exceed the memory budget, of combinations too) while running
+        maxima, minima and their combinations are updated in place. Only
+        the envelope itself is held for all entries, so case_values may be
+        a memory-mapped array larger than RAM.
+        
+        Args:
+            case_values: (n_load_types, ...) results, one row per factor
+                         matrix column
+            factors: (n_combinations, n_load_types) factor matrix
+            memory_budget: Bytes for one block of combined values and case
+                           values (default: LoadCombinationEngine.memory_budget)
+        
+        Returns:
+            CombinationEnvelope with arrays of shape case_values.shape[1:];
+            ties go to the first combination
+        """
+        case_values = np.asanyarray(case_values)
+        factors = np.atleast_2d(np.asarray(factors, dtype=np.float64))
+        n_cases = len(case_values)
+        if factors.shape[1] != n_cases:
+            raise ValueError(f"factors must have {n_cases} columns (one per load case)")
+        budget = LoadCombinationEngine.memory_budget if memory_budget is None else memory_budget
+        shape = case_values.shape[1:]
+        values = case_values.reshape(n_cases, -1)
+        n_combinations, n_entries = len(factors), values.shape[1]
+        
+        # Entries per block for all combinations; below _MIN_BLOCK_ENTRIES
+        # the combinations are split instead
+        itemsize = np.dtype(np.float64).itemsize
+        entries = budget // (itemsize * (n_combinations + n_cases))
+        rows = n_combinations
+        if entries < min(n_entries, _MIN_BLOCK_ENTRIES):
+            entries = min(n_entries, _MIN_BLOCK_ENTRIES)
+            rows = int(np.clip(budget // (itemsize * entries) - n_cases, 1, n_combinations))
+        entries = int(max(entries, 1))
+        
+        max_values = np.full(n_entries, -np.inf)
+        min_values = np.full(n_entries, np.inf)
+        max_index = np.zeros(n_entries, dtype=np.intp)
+        min_index = np.zeros(n_entries, dtype=np.intp)
+        for start in range(0, n_entries, entries):
+            block = slice(start, start + entries)
+            chunk = np.asarray(values[:, block], dtype=np.float64)
+            columns = np.arange(chunk.shape[1])
+            for first in range(0, n_combinations, rows):
+                combined = factors[first:first + rows] @ chunk
+                for running, index, pick, better in (
+                        (max_values, max_index, np.argmax, np.greater),
+                        (min_values, min_index, np.argmin, np.less)):
+                    k = pick(combined, axis=0)
+                    extreme = combined[k, columns]
+                    update = better(extreme, running[block])
+                    np.copyto(running[block], extreme, where=update)
+                    np.copyto(index[block], k + first, where=update)
+        
+        return CombinationEnvelope(
+            max=max_values.reshape(shape),
+            min=min_values.reshape(shape),
+            max_index=max_index.reshape(shape),
+            min_index=min_index.reshape(shape),
+        )
+    
+    @staticmethod
+    def generate(groups: Sequence[LoadGroup] = TCVN_LOAD_GROUPS,
+                 limit_state: LimitState = LimitState.ULS) -> Iterator[LoadCombination]:
+        """
+        Enumerate the combinations of load groups lazily
+        
+        ULS basic combinations: permanent groups (adverse or favourable)
+        with each variable group leading in turn, every other variable
+        group accompanying with one of its cases or absent, plus the
+        permanent loads alone. ULS seismic combinations: permanent and
+        variable groups at their seismic factors with one case of one
+        accidental group. SLS: the basic pattern at the service factors.
+        Combinations repeating an earlier factor set are skipped.
+        
+        Args:
+            groups: Load groups
+            limit_state: ULS or SLS
+        
+        Returns:
+            Iterator over LoadCombination, named LC<k> (ULS) or SLS<k>
+        """
+        prefix = 'LC' if limit_state == LimitState.ULS else 'SLS'
+        seen = set()
+        for terms in _combination_terms(groups, limit_state):
+            factors = {}
+            for case, factor in terms:
+                factors[case] = factors.get(case, 0.0) + factor
+            key = tuple(sorted((_case_label(c), f) for c, f in factors.items() if f != 0))
+            if key in seen:
+                continue
+            seen.add(key)
+            combination = LoadCombination('', factors, limit_state)
+            combination.name = f"{prefix}{len(seen)}: {combination.get_formula()}"
+            yield combination
+    
+    @staticmethod
+    def prune_dominated(combinations: Iterable[LoadCombination],
+                        case_values: Union[np.ndarray, Sequence[np.ndarray]],
+                        cases: Sequence[Hashable] = LOAD_TYPES) -> List[LoadCombination]:
+        """
+        Drop combinations that cannot govern the envelope of case results
+        
+        Only the signs of the case results are inspected. Where a case is
+        non-negative at every entry, a larger factor on it never lowers any
+        combined value (and the opposite for non-positive cases); cases that
+        change sign must have equal factors for two combinations to be
+        comparable. A combination that some other combination beats at every
+        entry and that also beats some other combination at every entry
+        can govern neither the max nor the min envelope, so it is dropped
+        before anything is combined. The envelope of the kept combinations
+        equals the envelope of all of them.
+        
+        Args:
+            combinations: Combinations (e.g. from generate())
+            case_values: (n_cases, ...) results, one row per case, or a list
+                         of such arrays; a combination is kept if it may
+                         govern any of them
+            cases: Load case of every row
+        
+        Returns:
+            Kept combinations, in their original order
+        """
+        combinations = list(combinations)
+        if isinstance(case_values, np.ndarray):
+            case_values = [case_values]
+        factors = _factor_matrix(combinations, cases)
+        keep = np.zeros(len(combinations), dtype=bool)
+        for values in case_values:
+            values = np.asarray(values, dtype=np.float64)
+            if len(values) != len(cases):
+                raise ValueError(f"case_values must have {len(cases)} rows (one per load case)")
+            keep |= _undominated(factors, values.reshape(len(cases), -1))
+        return [c for c, k in zip(combinations, keep) if k]
     
     @staticmethod
     def get_governing_case(loads: Dict[LoadType, float], 
@@ -196,21 +441,10 @@ class LoadCombinationEngine:
         Returns:
             Tuple of (governing LoadCombination, maximum value)
         """
-        if limit_state == LimitState.ULS:
-            combinations = LoadCombinationEngine.get_uls_combinations()
-        else:
-            combinations = LoadCombinationEngine.get_sls_combinations()
-        
-        max_combo = None
-        max_value = float('-inf')
-        
-        for combo in combinations:
-            value = combo.calculate(loads)
-            if value > max_value:
-                max_value = value
-                max_combo = combo
-        
-        return max_combo, max_value
+        combinations = LoadCombinationEngine.get_combinations(limit_state)
+        values = LoadCombinationEngine.factor_matrix(limit_state=limit_state) @ _load_vector(loads)
+        k = int(values.argmax())
+        return combinations[k], float(values[k])
     
     @staticmethod
     def calculate_all(loads: Dict[LoadType, float], 
@@ -225,14 +459,207 @@ class LoadCombinationEngine:
         Returns:
             List of (LoadCombination, calculated value) tuples
         """
-        if limit_state == LimitState.ULS:
-            combinations = LoadCombinationEngine.get_uls_combinations()
-        else:
-            combinations = LoadCombinationEngine.get_sls_combinations()
-        
-        results = []
-        for combo in combinations:
-            value = combo.calculate(loads)
-            results.append((combo, value))
-        
-        return results
+        combinations = LoadCombinationEngine.get_combinations(limit_state)
+        values = LoadCombinationEngine.factor_matrix(limit_state=limit_state) @ _load_vector(loads)
+        return list(zip(combinations, values.tolist()))
+
+
+@lru_cache(maxsize=None)
+def _uls_combinations() -> Tuple[LoadCombination, ...]:
+    """Standard ULS combinations (built once)"""
+    combinations = []
+    
+    # LC1: 1.1D + 1.3L (Permanent + Variable - Basic)
+    combinations.append(LoadCombination(
+        "LC1: 1.1D + 1.3L",
+        {LoadType.DEAD: 1.1, LoadType.LIVE: 1.3},
+        LimitState.ULS
+    ))
+    
+    # LC2: 1.1D + 1.3L + 0.8W (Permanent + Variable + Wind)
+    combinations.append(LoadCombination(
+        "LC2: 1.1D + 1.3L + 0.8W",
+        {LoadType.DEAD: 1.1, LoadType.LIVE: 1.3, LoadType.WIND: 0.8},
+        LimitState.ULS
+    ))
+    
+    # LC3: 1.1D + 0.8L + 1.3W (Wind dominant)
+    combinations.append(LoadCombination(
+        "LC3: 1.1D + 0.8L + 1.3W",
+        {LoadType.DEAD: 1.1, LoadType.LIVE: 0.8, LoadType.WIND: 1.3},
+        LimitState.ULS
+    ))
+    
+    # LC4: 1.1D + 1.3W (Permanent + Wind only)
+    combinations.append(LoadCombination(
+        "LC4: 1.1D + 1.3W",
+        {LoadType.DEAD: 1.1, LoadType.WIND: 1.3},
+        LimitState.ULS
+    ))
+    
+    # LC5: 1.0D + 0.5L + 1.0E (Seismic combination - positive)
+    combinations.append(LoadCombination(
+        "LC5: 1.0D + 0.5L + 1.0E",
+        {LoadType.DEAD: 1.0, LoadType.LIVE: 0.5, LoadType.SEISMIC: 1.0},
+        LimitState.ULS
+    ))
+    
+    # LC6: 1.0D + 0.5L - 1.0E (Seismic combination - negative)
+    combinations.append(LoadCombination(
+        "LC6: 1.0D + 0.5L - 1.0E",
+        {LoadType.DEAD: 1.0, LoadType.LIVE: 0.5, LoadType.SEISMIC: -1.0},
+        LimitState.ULS
+    ))
+    
+    # LC7: 1.0D + 1.0C (Crane load)
+    combinations.append(LoadCombination(
+        "LC7: 1.0D + 1.0C",
+        {LoadType.DEAD: 1.0, LoadType.CRANE: 1.0},
+        LimitState.ULS
+    ))
+    
+    # LC8: 0.9D + 1.3W (Uplift check - minimum dead load)
+    combinations.append(LoadCombination(
+        "LC8: 0.9D + 1.3W (Uplift)",
+        {LoadType.DEAD: 0.9, LoadType.WIND: 1.3},
+        LimitState.ULS
+    ))
+    
+    return tuple(combinations)
+
+
+@lru_cache(maxsize=None)
+def _sls_combinations() -> Tuple[LoadCombination, ...]:
+    """Standard SLS combinations (built once)"""
+    combinations = []
+    
+    # SLS1: 1.0D + 1.0L (Characteristic combination)
+    combinations.append(LoadCombination(
+        "SLS1: 1.0D + 1.0L",
+        {LoadType.DEAD: 1.0, LoadType.LIVE: 1.0},
+        LimitState.SLS
+    ))
+    
+    # SLS2: 1.0D + 0.7L + 0.7W (Frequent combination)
+    combinations.append(LoadCombination(
+        "SLS2: 1.0D + 0.7L + 0.7W",
+        {LoadType.DEAD: 1.0, LoadType.LIVE: 0.7, LoadType.WIND: 0.7},
+        LimitState.SLS
+    ))
+    
+    # SLS3: 1.0D + 0.7W (Wind deflection check)
+    combinations.append(LoadCombination(
+        "SLS3: 1.0D + 0.7W",
+        {LoadType.DEAD: 1.0, LoadType.WIND: 0.7},
+        LimitState.SLS
+    ))
+    
+    # SLS4: 1.0D (Quasi-permanent - for long-term deflection)
+    combinations.append(LoadCombination(
+        "SLS4: 1.0D (Permanent only)",
+        {LoadType.DEAD: 1.0},
+        LimitState.SLS
+    ))
+    
+    return tuple(combinations)
+
+
+def _load_vector(loads: Dict[LoadType, float]) -> np.ndarray:
+    """Load values in LOAD_TYPES order"""
+    return np.array([loads.get(t, 0.0) for t in LOAD_TYPES], dtype=np.float64)
+
+
+def _factor_matrix(combinations, load_types) -> np.ndarray:
+    rows = [c.factors if isinstance(c, LoadCombination) else c for c in combinations]
+    load_types = [_case_key(t) for t in load_types]
+    return np.array([[factors.get(t, 0.0) for t in load_types] for factors in rows],
+                    dtype=np.float64).reshape(len(rows), len(load_types))
+
+
+@lru_cache(maxsize=None)
+def _standard_factor_matrix(limit_state: LimitState, load_types: Tuple[LoadType, ...]) -> np.ndarray:
+    matrix = _factor_matrix(LoadCombinationEngine.get_combinations(limit_state), load_types)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _optional_terms(groups: Sequence[LoadGroup], attribute: str) -> List[List[Tuple]]:
+    """Per group: absent, or one of its cases at the factor `attribute`"""
+    options = []
+    for group in groups:
+        factor = getattr(group, attribute)
+        if factor:
+            options.append([()] + [(term,) for term in group.terms(factor)])
+    return options
+
+
+def _combination_terms(groups: Sequence[LoadGroup], limit_state: LimitState) -> Iterator[Tuple]:
+    """(case, factor) terms of every combination, generated lazily"""
+    permanent = [g for g in groups if g.permanent]
+    variable = [g for g in groups if not g.permanent and not g.accidental]
+    accidental = [g for g in groups if g.accidental]
+    
+    if limit_state == LimitState.SLS:
+        base = [[(case, g.service) for case in g.cases] for g in permanent]
+        leading, companion = 'service', 'service_accompanying'
+    else:
+        base = [[(case, g.leading) for case in g.cases] +
+                [(case, g.favourable) for case in g.cases if g.favourable is not None]
+                for g in permanent]
+        leading, companion = 'leading', 'accompanying'
+    
+    for dead in product(*base):
+        yield dead
+        for lead in variable:
+            others = _optional_terms([g for g in variable if g is not lead], companion)
+            for lead_term in lead.terms(getattr(lead, leading)):
+                for rest in product(*others):
+                    yield dead + (lead_term,) + sum(rest, ())
+    
+    if limit_state == LimitState.SLS:
+        return
+    base = [[(case, g.seismic) for case in g.cases] for g in permanent if g.seismic is not None]
+    others = _optional_terms([g for g in variable if g.seismic is not None], 'seismic')
+    for dead in product(*base):
+        for group in accidental:
+            for action in group.terms(group.leading):
+                for rest in product(*others):
+                    yield dead + (action,) + sum(rest, ())
+
+
+def _undominated(factors: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Rows of the factor matrix that may govern the max or min envelope
+    
+    Args:
+        factors: (n_combinations, n_cases) factor matrix
+        values: (n_cases, n_entries) case results
+    
+    Returns:
+        Boolean mask over the combinations
+    """
+    positive = (values >= 0).all(axis=1)
+    negative = (values <= 0).all(axis=1)
+    mixed = ~positive & ~negative
+    definite = positive ^ negative
+    oriented = factors[:, definite] * np.where(positive[definite], 1.0, -1.0)
+    
+    keep = np.zeros(len(factors), dtype=bool)
+    if mixed.any():
+        groups = np.unique(factors[:, mixed], axis=0, return_inverse=True)[1].ravel()
+    else:
+        groups = np.zeros(len(factors), dtype=np.int64)
+    for g in np.unique(groups):
+        rows = np.flatnonzero(groups == g)
+        D = oriented[rows]
+        order = np.arange(len(rows))
+        for start in range(0, len(rows), _PRUNE_BLOCK):
+            block = slice(start, start + _PRUNE_BLOCK)
+            ge = (D[:, None, :] >= D[None, block, :]).all(axis=2)
+            le = (D[:, None, :] <= D[None, block, :]).all(axis=2)
+            # ties go to the earlier combination; a row never beats itself
+            strict = ~(ge & le) | (order[:, None] < order[None, block])
+            max_dominated = (ge & strict).any(axis=0)
+            min_dominated = (le & strict).any(axis=0)
+            keep[rows[block]] = ~max_dominated | ~min_dominated
+    return keep
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Floor System Model Generator
+Array-backed topology for multi-storey steel floor systems.
+
+Node coordinates (float64) and member connectivity (int32) are generated with
+vectorized NumPy operations for any number of storeys. Each node and member
+also carries small integer label fields, so display names such as
+'C0_1_T' or 'SecB_2_1_0' are only formatted when they are asked for.
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+import numpy as np
+
+# Node kinds
+NODE_BASE = 0         # Column base (supported)
+NODE_COLUMN_TOP = 1   # Column top at a floor level
+NODE_SECONDARY = 2    # Secondary beam / main beam intersection
+
+# Member kinds
+MEMBER_COLUMN = 0
+MEMBER_MAIN_BEAM = 1
+MEMBER_SECONDARY_BEAM = 2
+
+_NODE_FORMATS = {
+    NODE_BASE: 'C{0}_{1}_B',
+    NODE_COLUMN_TOP: 'C{0}_{1}_T',
+    NODE_SECONDARY: 'SB{0}_{1}_{2}',
+}
+
+_MEMBER_FORMATS = {
+    (MEMBER_COLUMN, 'X'): 'Col_{0}_{1}',
+    (MEMBER_COLUMN, 'Y'): 'Col_{0}_{1}',
+    (MEMBER_MAIN_BEAM, 'X'): 'MB_Y{0}_S{1}',
+    (MEMBER_MAIN_BEAM, 'Y'): 'MB_X{0}_S{1}',
+    (MEMBER_SECONDARY_BEAM, 'X'): 'SecB_{0}_{1}_{2}',
+    (MEMBER_SECONDARY_BEAM, 'Y'): 'SecB_{0}_{1}_{2}',
+}
+
+
+@dataclass
+class FloorSystemTopology:
+    """
+    Array-backed model topology
+
+    Label fields are (kind, a, b, c, storey) rows; a/b/c are the grid indices
+    in the order they appear in the display name. Storeys are numbered from
+    1; names on storey 2 and above get a '_F{storey}' suffix so the first
+    storey keeps the historical single-floor names.
+    """
+    coords: np.ndarray          # (n_nodes, 3) float64
+    connectivity: np.ndarray    # (n_members, 2) int32
+    node_fields: np.ndarray     # (n_nodes, 5) int32
+    member_fields: np.ndarray   # (n_members, 5) int32
+    main_beam_direction: str
+    num_storeys: int
+    _node_labels: List[str] = field(default=None, init=False, repr=False)
+    _member_labels: List[str] = field(default=None, init=False, repr=False)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.coords)
+
+    @property
+    def num_members(self) -> int:
+        return len(self.connectivity)
+
+    @property
+    def node_kind(self) -> np.ndarray:
+        return self.node_fields[:, 0]
+
+    @property
+    def member_kind(self) -> np.ndarray:
+        return self.member_fields[:, 0]
+
+    @property
+    def supports(self) -> np.ndarray:
+        """Indices of the supported (column base) nodes"""
+        return np.flatnonzero(self.node_kind == NODE_BASE)
+
+    def nodes_of_kind(self, kind: int) -> np.ndarray:
+        """Indices of all nodes of one kind"""
+        return np.flatnonzero(self.node_kind == kind)
+
+    def members_of_kind(self, kind: int) -> np.ndarray:
+        """Indices of all members of one kind"""
+        return np.flatnonzero(self.member_kind == kind)
+
+    def node_label(self, index: int) -> str:
+        """Display name of a single node"""
+        kind, a, b, c, storey = self.node_fields[index].tolist()
+        return _format_label(_NODE_FORMATS[kind], a, b, c, storey)
+
+    def member_label(self, index: int) -> str:
+        """Display name of a single member"""
+        kind, a, b, c, storey = self.member_fields[index].tolist()
+        return _format_label(_MEMBER_FORMATS[(kind, self.main_beam_direction)], a, b, c, storey)
+
+    def node_labels(self) -> List[str]:
+        """Display names of all nodes (formatted on first use)"""
+        if self._node_labels is None:
+            self._node_labels = [
+                _format_label(_NODE_FORMATS[kind], a, b, c, storey)
+                for kind, a, b, c, storey in self.node_fields.tolist()
+            ]
+        return self._node_labels
+
+    def member_labels(self) -> List[str]:
+        """Display names of all members (formatted on first use)"""
+        if self._member_labels is None:
+            direction = self.main_beam_direction
+            self._member_labels = [
+                _format_label(_MEMBER_FORMATS[(kind, direction)], a, b, c, storey)
+                for kind, a, b, c, storey in self.member_fields.tolist()
+            ]
+        return self._member_labels
+
+
+def _format_label(fmt: str, a: int, b: int, c: int, storey: int) -> str:
+    label = fmt.format(a, b, c)
+    return label if storey <= 1 else f'{label}_F{storey}'
+
+
+def _fields(kind: int, a, b, c=0) -> np.ndarray:
+    """Label field rows (kind, a, b, c, storey=1) as an (n, 5) int32 array"""
+    a, b, c = np.broadcast_arrays(np.ravel(a), b, c)
+    return np.column_stack([np.full(len(a), kind), a, b, c, np.ones(len(a))]).astype(np.int32)
+
+
+def generate_floor_system(layout, num_storeys: int = None) -> FloorSystemTopology:
+    """
+    Generate the topology of a multi-storey floor system
+
+    Args:
+        layout: FloorSystemLayout (length, width, floor_height, column
+                spacings, main_beam_direction, secondary_beam_spacing)
+        num_storeys: Number of storeys (default: layout.num_storeys or 1)
+
+    Returns:
+        FloorSystemTopology with nodes ordered as column bases, then per
+        storey the column tops and secondary beam nodes; members ordered per
+        storey as columns, main beams and secondary beams
+    """
+    if num_storeys is None:
+        num_storeys = getattr(layout, 'num_storeys', 1)
+    if num_storeys < 1:
+        raise ValueError(f"num_storeys must be at least 1, got {num_storeys}")
+
+    col_x = layout.column_spacing_x
+    col_y = layout.column_spacing_y
+    H = layout.floor_height
+    sec_spacing = layout.secondary_beam_spacing
+    direction = layout.main_beam_direction
+    nx = int(layout.length / col_x) + 1
+    ny = int(layout.width / col_y) + 1
+
+    # Column grid (i-major, like the column dictionaries)
+    gi, gj = np.meshgrid(np.arange(nx), np.arange(ny), indexing='ij')
+    gi, gj = gi.ravel(), gj.ravel()
+    n_cols = nx * ny
+    col_xy = np.column_stack([gi * col_x, gj * col_y])
+
+    # Secondary beam lines inside each bay along the main beams
+    bay = col_x if direction == 'X' else col_y
+    num_sec = int(bay / sec_spacing)
+    k = np.arange(1, num_sec + 1)
+    on_grid = np.abs(k * sec_spacing - bay) < 1e-9
+    k_free = k[~on_grid]
+
+    if direction == 'X':
+        # Secondary beams run in Y at x = i * col_x + k * s
+        si, sk, sj = (a.ravel() for a in np.meshgrid(np.arange(nx - 1), k_free, np.arange(ny),
+                                                     indexing='ij'))
+        sec_xy = np.column_stack([si * col_x + sk * sec_spacing, sj * col_y])
+        sec_label = (si, sk, sj)
+    else:
+        # Secondary beams run in X at y = j * col_y + k * s
+        sj, sk, si = (a.ravel() for a in np.meshgrid(np.arange(ny - 1), k_free, np.arange(nx),
+                                                     indexing='ij'))
+        sec_xy = np.column_stack([si * col_x, sj * col_y + sk * sec_spacing])
+        sec_label = (si, sj, sk)
+    n_sec = len(sec_xy)
+    n_level = n_cols + n_sec
+
+    # ---- Nodes --------------------------------------------------------
+    storeys = np.arange(1, num_storeys + 1)
+    level_xy = np.vstack([col_xy, sec_xy])
+    coords = np.empty((n_cols + num_storeys * n_level, 3), dtype=np.float64)
+    coords[:n_cols, :2] = col_xy
+    coords[:n_cols, 2] = 0.0
+    coords[n_cols:, :2] = np.tile(level_xy, (num_storeys, 1))
+    coords[n_cols:, 2] = np.repeat(storeys * H, n_level)
+
+    level_fields = np.vstack([
+        _fields(NODE_COLUMN_TOP, gi, gj),
+        _fields(NODE_SECONDARY, *sec_label),
+    ])
+    storey_fields = np.tile(level_fields, (num_storeys, 1))
+    storey_fields[:, 4] = np.repeat(storeys, n_level)
+    node_fields = np.vstack([_fields(NODE_BASE, gi, gj), storey_fields])
+
+    # ---- Members (connectivity within storey 1, offset per storey) ----
+    def col_top(i, j):
+        return n_cols + i * ny + j
+
+    # Columns: base (storey below) to top
+    col_conn = np.column_stack([np.arange(n_cols), col_top(gi, gj)])
+
+    if direction == 'X':
+        # Main beams along rows j, span i (j-major order)
+        mj, mi = (a.ravel() for a in np.meshgrid(np.arange(ny), np.arange(nx - 1), indexing='ij'))
+        main_conn = np.column_stack([col_top(mi, mj), col_top(mi + 1, mj)])
+        main_fields = _fields(MEMBER_MAIN_BEAM, mj, mi)
+    else:
+        # Main beams along columns i, span j (i-major order)
+        mi, mj = (a.ravel() for a in np.meshgrid(np.arange(nx), np.arange(ny - 1), indexing='ij'))
+        main_conn = np.column_stack([col_top(mi, mj), col_top(mi, mj + 1)])
+        main_fields = _fields(MEMBER_MAIN_BEAM, mi, mj)
+
+    # Secondary beam node lookup: every secondary line position, with the
+    # on-grid positions mapped to the column tops they coincide with
+    sec_lookup = np.empty((len(k),) + ((nx - 1, ny) if direction == 'X' else (ny - 1, nx)),
+                          dtype=np.int64)
+    free_pos = np.flatnonzero(~on_grid)
+    sec_nodes = 2 * n_cols + np.arange(n_sec)  # after column bases and tops
+    if direction == 'X':
+        sec_lookup[free_pos] = sec_nodes.reshape(nx - 1, len(free_pos), ny).transpose(1, 0, 2)
+        if on_grid.any():
+            ii, jj = np.meshgrid(np.arange(nx - 1), np.arange(ny), indexing='ij')
+            sec_lookup[on_grid] = col_top(ii + 1, jj)
+        # SecB_{i}_{k}_{j}: position (i, k) from row j to j + 1
+        bi, bk, bj = (a.ravel() for a in np.meshgrid(np.arange(nx - 1), k, np.arange(ny - 1),
+                                                     indexing='ij'))
+        sec_conn = np.column_stack([sec_lookup[bk - 1, bi, bj], sec_lookup[bk - 1, bi, bj + 1]])
+        sec_fields = _fields(MEMBER_SECONDARY_BEAM, bi, bk, bj)
+    else:
+        sec_lookup[free_pos] = sec_nodes.reshape(ny - 1, len(free_pos), nx).transpose(1, 0, 2)
+        if on_grid.any():
+            jj, ii = np.meshgrid(np.arange(ny - 1), np.arange(nx), indexing='ij')
+            sec_lookup[on_grid] = col_top(ii, jj + 1)
+        # SecB_{i}_{j}_{k}: position (j, k) from column line i to i + 1
+        bj, bk, bi = (a.ravel() for a in np.meshgrid(np.arange(ny - 1), k, np.arange(nx - 1),
+                                                     indexing='ij'))
+        sec_conn = np.column_stack([sec_lookup[bk - 1, bj, bi], sec_lookup[bk - 1, bj, bi + 1]])
+        sec_fields = _fields(MEMBER_SECONDARY_BEAM, bi, bj, bk)
+
+    storey_conn = np.vstack([col_conn, main_conn, sec_conn])
+    storey_member_fields = np.vstack([_fields(MEMBER_COLUMN, gi, gj), main_fields, sec_fields])
+    n_storey_members = len(storey_conn)
+
+    # Storey s: everything shifts by (s - 1) levels; column bases of storey
+    # s >= 2 are the column tops of storey s - 1
+    offsets = np.repeat((storeys - 1) * n_level, n_storey_members)
+    connectivity = np.tile(storey_conn, (num_storeys, 1)) + offsets[:, None]
+    is_base = np.tile(np.arange(n_storey_members) < n_cols, num_storeys) & (offsets > 0)
+    connectivity[is_base, 0] += n_cols - n_level
+
+    member_fields = np.tile(storey_member_fields, (num_storeys, 1))
+    member_fields[:, 4] = np.repeat(storeys, n_storey_members)
+
+    return FloorSystemTopology(
+        coords=coords,
+        connectivity=connectivity.astype(np.int32),
+        node_fields=node_fields,
+        member_fields=member_fields,
+        main_beam_direction=direction,
+        num_storeys=num_storeys,
+    )
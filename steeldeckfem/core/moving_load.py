@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Moving Loads
+Influence lines and wheel-train envelopes for crane runways and vehicle lanes.
+
+Influence lines are computed once per response from the factorized stiffness
+(SparseFrameModel.influence_lines) and sampled at equally spaced positions
+along a path of members. A wheel train is then swept along the path without
+any further solve: the response for every train position is the sum of the
+wheel loads times the influence ordinates under the wheels, i.e. a discrete
+convolution of the influence lines with the train, evaluated for all
+positions and wheels in one vectorized pass.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+TRAVEL_DIRECTIONS = ('forward', 'backward')
+
+# Wheels this close outside the path (m) still count as on it
+_PATH_TOLERANCE = 1e-9
+
+
+@dataclass
+class WheelTrain:
+    """
+    Point loads at fixed distances from each other
+
+    Loads are signed along the load direction of the influence lines:
+    gravity wheel loads are negative FZ, as for add_node_load().
+
+    Arrays:
+        loads:   (n_wheels,) wheel loads (kN)
+        offsets: (n_wheels,) distance of every wheel behind the leading one (m)
+    """
+    loads: np.ndarray
+    offsets: np.ndarray
+    name: str = ''
+
+    def __post_init__(self):
+        self.loads = np.atleast_1d(np.asarray(self.loads, dtype=np.float64))
+        self.offsets = np.atleast_1d(np.asarray(self.offsets, dtype=np.float64))
+        if self.loads.shape != self.offsets.shape:
+            raise ValueError("A wheel train needs one offset per wheel load")
+        if np.any(self.offsets < 0):
+            raise ValueError("Wheel offsets are measured behind the leading wheel (>= 0)")
+
+    @property
+    def length(self) -> float:
+        """Distance from the leading to the last wheel (m)"""
+        return float(self.offsets.max())
+
+    @classmethod
+    def crane(cls, wheel_load: float, wheel_base: float, cranes: int = 1,
+              gap: float = 0.0) -> 'WheelTrain':
+        """
+        End carriages of overhead cranes on one runway beam
+
+        Args:
+            wheel_load: Maximum vertical wheel load (kN, acting downward)
+            wheel_base: Distance between the two wheels of a carriage (m)
+            cranes: Number of cranes side by side
+            gap: Distance between the nearest wheels of adjacent cranes (m)
+        """
+        offsets = [c * (wheel_base + gap) + d for c in range(cranes) for d in (0.0, wheel_base)]
+        return cls(np.full(len(offsets), -abs(wheel_load)), offsets,
+                   f'{cranes} crane(s) {abs(wheel_load):g} kN')
+
+
+@dataclass
+class InfluenceLines:
+    """
+    Responses to a unit point load moving along a path
+
+    Arrays:
+        positions: (n_positions,) equally spaced positions along the path,
+                   from 0 to its length (m)
+        values:    (n_responses, n_positions) response per unit load in the
+                   positive global `direction`
+    """
+    responses: List[str]
+    positions: np.ndarray
+    values: np.ndarray
+    direction: str = 'FZ'
+
+    @property
+    def length(self) -> float:
+        """Path length (m)"""
+        return float(self.positions[-1])
+
+    @property
+    def spacing(self) -> float:
+        """Distance between two ordinates (m)"""
+        return float(self.positions[1] - self.positions[0])
+
+    @cached_property
+    def index(self) -> Dict[str, int]:
+        """Response name -> row index"""
+        return {name: r for r, name in enumerate(self.responses)}
+
+    def at(self, x) -> np.ndarray:
+        """
+        Influence ordinates at arbitrary positions (linear interpolation)
+
+        Args:
+            x: Positions along the path (any shape); loads off the path
+               have no effect
+
+        Returns:
+            Array (n_responses,) + x.shape
+        """
+        x = np.asarray(x, dtype=np.float64)
+        u = x / self.spacing
+        i = np.clip(np.floor(u).astype(np.int64), 0, len(self.positions) - 2)
+        w = u - i
+        values = self.values[:, i] * (1 - w) + self.values[:, i + 1] * w
+        off_path = (x < -_PATH_TOLERANCE) | (x > self.length + _PATH_TOLERANCE)
+        values[:, off_path] = 0.0
+        return values
+
+    def envelope(self, train: WheelTrain, step: float = None,
+                 both_directions: bool = True) -> 'MovingLoadEnvelope':
+        """
+        Sweep a wheel train over the path
+
+        The train enters at position 0 and advances by `step` until its
+        last wheel has left the path (and, with both_directions, the same
+        from the other end).
+
+        Args:
+            train: Wheel loads and spacing
+            step: Distance between train positions (default: the spacing
+                  of the influence ordinates)
+            both_directions: Also run the train backwards (matters for
+                             unsymmetrical trains)
+
+        Returns:
+            MovingLoadEnvelope
+        """
+        step = self.spacing if step is None else step
+        if step <= 0:
+            raise ValueError("step must be positive")
+        travel = np.arange(0.0, self.length + train.length + step / 2, step)
+        wheels = travel[:, None] - train.offsets
+        layouts = [wheels, self.length - wheels][:2 if both_directions else 1]
+        values = np.stack([self.at(x) @ train.loads for x in layouts])
+        return MovingLoadEnvelope(self.responses, travel, values, train, self.length)
+
+
+@dataclass
+class MovingLoadEnvelope:
+    """
+    Responses to a wheel train at every position along a path
+
+    Arrays:
+        travel: (n_positions,) distance travelled by the leading wheel from
+                the path end where it entered (m)
+        values: (n_directions, n_responses, n_positions) responses, forward
+                then backward
+    """
+    responses: List[str]
+    travel: np.ndarray
+    values: np.ndarray
+    train: WheelTrain
+    length: float
+
+    @cached_property
+    def index(self) -> Dict[str, int]:
+        """Response name -> row index"""
+        return {name: r for r, name in enumerate(self.responses)}
+
+    @property
+    def max(self) -> np.ndarray:
+        """Largest value of every response (n_responses,)"""
+        return self.values.max(axis=(0, 2))
+
+    @property
+    def min(self) -> np.ndarray:
+        """Smallest value of every response (n_responses,)"""
+        return self.values.min(axis=(0, 2))
+
+    def wheel_positions(self, direction: int, position: int) -> np.ndarray:
+        """Positions of all wheels along the path for one train position"""
+        x = self.travel[position] - self.train.offsets
+        return x if direction == 0 else self.length - x
+
+    def governing(self, response: str) -> Dict[str, Dict]:
+        """
+        Train positions giving the largest and smallest value of a response
+
+        Returns:
+            {'max': {...}, 'min': {...}}, each with 'value', 'direction'
+            ('forward'/'backward') and 'wheels' (wheel positions along the
+            path, leading wheel first)
+        """
+        values = self.values[:, self.index[response]]
+        result = {}
+        for key, pick in (('max', np.argmax), ('min', np.argmin)):
+            d, p = np.unravel_index(pick(values), values.shape)
+            result[key] = {
+                'value': float(values[d, p]),
+                'direction': TRAVEL_DIRECTIONS[d],
+                'wheels': self.wheel_positions(d, p).tolist(),
+            }
+        return result
+
+    def summary(self, responses: Sequence[str] = None) -> List[Dict]:
+        """Extreme values and governing leading-wheel positions per response"""
+        rows = []
+        for name in self.responses if responses is None else responses:
+            governing = self.governing(name)
+            row = {'response': name}
+            for key in ('max', 'min'):
+                row[key] = governing[key]['value']
+                row[f'{key}_position'] = governing[key]['wheels'][0]
+                row[f'{key}_direction'] = governing[key]['direction']
+            rows.append(row)
+        return rows
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+Parametric Sweep Runner
+Batch FEM analysis of floor system layout variants across all CPU cores.
+
+A sweep is a grid of FloorSystemLayout parameters (column spacing, main beam
+direction, secondary beam spacing, section choices...). Every combination
+is built and solved by its own FloorSystemFEMAnalyzer in a worker process
+and summarized as one row: steel tonnage, max deflection and max reaction.
+
+Usage:
+    steeldeckfem-sweep --column-spacing-x 6 7.5 9 --main-beam-direction X Y
+    python -m steeldeckfem.core.parametric_sweep --grid sweep.json -o out.csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+from steeldeckfem.core.complete_floor_system import FloorSystemLayout, BeamSpec, ColumnSpec
+from steeldeckfem.core.vn_standards_loader import get_vn_standards
+
+STEEL_DENSITY = 7850  # kg/m³
+
+# Default layout parameters (a sweep grid overrides any of them)
+DEFAULT_PARAMETERS = {
+    'length': 30.0,
+    'width': 24.0,
+    'floor_height': 4.0,
+    'column_spacing_x': 6.0,
+    'column_spacing_y': 6.0,
+    'main_beam_direction': 'X',
+    'secondary_beam_spacing': 2.0,
+    'num_storeys': 1,
+    'column_section': 'H300x300x10x15',
+    'main_beam_section': 'H400x400x13x21',
+    'secondary_beam_section': 'H250x250x9x14',
+}
+
+DEFAULT_LOADS = {'live_load': 400, 'dead_load_finish': 30}  # kg/m²
+
+# Welded I/H section given by dimensions: H{h}x{b}x{tw}x{tf} (mm)
+_WELDED_SECTION = re.compile(r'^[HI](\d+(?:\.\d+)?)x(\d+(?:\.\d+)?)x(\d+(?:\.\d+)?)x(\d+(?:\.\d+)?)$')
+
+RESULT_COLUMNS = ('case', 'status', 'steel_tonnage', 'max_deflection', 'max_reaction', 'elapsed')
+
+
+def expand_grid(grid: Dict[str, Sequence], base: Dict = None) -> List[Dict]:
+    """
+    Cartesian product of a parameter grid
+
+    Args:
+        grid: Parameter name -> list of values to try
+        base: Fixed parameters (default: DEFAULT_PARAMETERS)
+
+    Returns:
+        One complete parameter dictionary per combination
+    """
+    base = dict(DEFAULT_PARAMETERS if base is None else base)
+    unknown = set(grid) - set(DEFAULT_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameter(s): {', '.join(sorted(unknown))}")
+
+    names = list(grid)
+    return [dict(base, **dict(zip(names, values)))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+def section_properties(name: str) -> Dict[str, float]:
+    """
+    Section properties in the FloorSystemLayout spec units (mm, cm², cm⁴, cm³)
+
+    Args:
+        name: Vietnamese database section (e.g. 'H300x300x10x15',
+              'BOX200x200x6') or a welded I-section 'H{h}x{b}x{tw}x{tf}'
+    """
+    try:
+        props = get_vn_standards().get_steel_section_properties(name)
+    except ValueError:
+        match = _WELDED_SECTION.match(name)
+        if not match:
+            raise ValueError(f"Section {name} not found in Vietnamese database "
+                             f"and is not a welded section H<h>x<b>x<tw>x<tf>")
+        h, b, tw, tf = (float(v) for v in match.groups())
+        h_cm, b_cm, tw_cm, tf_cm = h / 10, b / 10, tw / 10, tf / 10
+        ix = (b_cm * h_cm**3 / 12) - ((b_cm - tw_cm) * (h_cm - 2 * tf_cm)**3 / 12)
+        return {'h': h, 'b': b, 'tw': tw, 'tf': tf,
+                'area': 2 * b_cm * tf_cm + (h_cm - 2 * tf_cm) * tw_cm,
+                'ix': ix, 'wx': ix / (h_cm / 2)}
+
+    t = props.get('t_mm', 0)
+    return {'h': props['h_mm'], 'b': props['b_mm'],
+            'tw': props.get('tw_mm', t), 'tf': props.get('tf_mm', t),
+            'area': props['A_cm2'], 'ix': props['Ix_cm4'], 'wx': props['Wx_cm3']}
+
+
+def build_layout(params: Dict) -> FloorSystemLayout:
+    """Build a FloorSystemLayout from sweep parameters"""
+    params = dict(DEFAULT_PARAMETERS, **params)
+    column = section_properties(params['column_section'])
+    main = section_properties(params['main_beam_section'])
+    secondary = section_properties(params['secondary_beam_section'])
+
+    return FloorSystemLayout(
+        length=float(params['length']),
+        width=float(params['width']),
+        floor_height=float(params['floor_height']),
+        column_spacing_x=float(params['column_spacing_x']),
+        column_spacing_y=float(params['column_spacing_y']),
+        main_beam_direction=params['main_beam_direction'],
+        main_beam_spec=BeamSpec('Main', 'H', params['main_beam_section'], **main),
+        secondary_beam_spacing=float(params['secondary_beam_spacing']),
+        secondary_beam_spec=BeamSpec('Secondary', 'H', params['secondary_beam_section'], **secondary),
+        column_spec=ColumnSpec('H', params['column_section'], **column),
+        num_storeys=int(params['num_storeys']),
+    )
+
+
+def steel_tonnage(topology, layout) -> float:
+    """Steel weight (tonnes) of all columns and beams of a generated topology"""
+    coords = topology.coords[topology.connectivity]
+    lengths = np.linalg.norm(coords[:, 1] - coords[:, 0], axis=1)
+    # Areas indexed by member kind (MEMBER_COLUMN, MEMBER_MAIN_BEAM, MEMBER_SECONDARY_BEAM)
+    areas = np.array([layout.column_spec.area, layout.main_beam_spec.area,
+                      layout.secondary_beam_spec.area]) / 10000  # cm² to m²
+    area = areas[topology.member_kind]
+    return float((lengths * area).sum() * STEEL_DENSITY / 1000)
+
+
+def run_case(index: int, params: Dict, loads: Dict = None, engine: str = 'sparse') -> Dict:
+    """
+    Build, solve and summarize one layout variant (runs in a worker process)
+
+    Returns:
+        Result row: the parameters plus 'case', 'status', 'steel_tonnage'
+        (t), 'max_deflection' (mm), 'max_reaction' (kN) and 'elapsed' (s)
+    """
+    from steeldeckfem.core.fem_analyzer import FloorSystemFEMAnalyzer
+
+    start = time.perf_counter()
+    row = dict(params, case=index)
+    try:
+        layout = build_layout(params)
+        analyzer = FloorSystemFEMAnalyzer(engine=engine)
+        analyzer.build_fem_model(layout, DEFAULT_LOADS if loads is None else loads)
+        results = analyzer.run_analysis()
+
+        row['status'] = results['status']
+        row['steel_tonnage'] = steel_tonnage(analyzer.topology, layout)
+        if 'error' in results:
+            row['max_deflection'] = math.nan
+            row['max_reaction'] = math.nan
+        else:
+            row['max_deflection'] = results['max_deflection']['value']
+            row['max_reaction'] = float(np.abs(results['fem_results'].reactions[..., 2]).max())
+    except Exception as e:
+        row.update(status=f'Analysis failed: {e}', steel_tonnage=math.nan,
+                   max_deflection=math.nan, max_reaction=math.nan)
+    row['elapsed'] = time.perf_counter() - start
+    return row
+
+
+class ParametricSweep:
+    """
+    Parallel sweep over a grid of floor system layouts
+
+    Rows are streamed back as workers finish (not in grid order). At most
+    SUBMIT_WINDOW cases per worker are queued at a time, refilled as cases
+    complete. Call cancel() from any thread (or set the cancel event) to
+    stop submitting work and drop queued cases; cases already running
+    finish, but their rows are not yielded.
+    """
+
+    # Cases queued per worker (submission is refilled as cases complete)
+    SUBMIT_WINDOW = 2
+
+    # Seconds between checks of the cancel event while waiting for workers
+    CANCEL_POLL = 0.1
+
+    def __init__(self, grid: Dict[str, Sequence], base: Dict = None, loads: Dict = None,
+                 engine: str = 'sparse', max_workers: int = None):
+        self.cases = expand_grid(grid, base)
+        self.loads = DEFAULT_LOADS if loads is None else loads
+        self.engine = engine
+        self.max_workers = max_workers or os.cpu_count()
+        self.cancel_event = threading.Event()
+
+    def __len__(self):
+        return len(self.cases)
+
+    def cancel(self):
+        """Request cancellation of the running sweep"""
+        self.cancel_event.set()
+
+    def run(self, progress: Callable[[int, int, Dict], None] = None) -> Iterator[Dict]:
+        """
+        Run all cases and yield result rows as they complete
+
+        Args:
+            progress: Optional callback(done, total, row) after each case
+        """
+        total = len(self.cases)
+        if self.max_workers == 1:
+            # In-process (no pickling; easier to debug and profile)
+            for done, params in enumerate(self.cases, start=1):
+                if self.cancel_event.is_set():
+                    return
+                row = run_case(done - 1, params, self.loads, self.engine)
+                if progress:
+                    progress(done, total, row)
+                yield row
+            return
+
+        workers = min(self.max_workers, total or 1)
+        executor = ProcessPoolExecutor(max_workers=workers)
+        cases = iter(enumerate(self.cases))
+        pending = set()
+        done = 0
+        try:
+            while True:
+                while len(pending) < workers * self.SUBMIT_WINDOW and not self.cancel_event.is_set():
+                    case = next(cases, None)
+                    if case is None:
+                        break
+                    pending.add(executor.submit(run_case, *case, self.loads, self.engine))
+                if not pending or self.cancel_event.is_set():
+                    break
+                finished, pending = wait(pending, timeout=self.CANCEL_POLL,
+                                         return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if self.cancel_event.is_set():
+                        break
+                    done += 1
+                    row = future.result()
+                    if progress:
+                        progress(done, total, row)
+                    yield row
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run_all(self, progress: Callable[[int, int, Dict], None] = None) -> List[Dict]:
+        """Run the sweep and return all rows in grid order"""
+        return sorted(self.run(progress), key=lambda row: row['case'])
+
+
+def format_table(rows: List[Dict], parameters: Sequence[str]) -> str:
+    """Plain-text result table (one line per layout variant)"""
+    headers = ['#'] + list(parameters) + ['Steel (t)', 'Max defl. (mm)', 'Max Rz (kN)', 'Status']
+    lines = []
+    for row in rows:
+        lines.append([str(row['case'])] + [str(row[p]) for p in parameters] + [
+            f"{row['steel_tonnage']:.2f}", f"{row['max_deflection']:.2f}",
+            f"{row['max_reaction']:.1f}", 'OK' if row['status'] == 'Analysis Complete' else 'FAIL'])
+    widths = [max(len(h), *(len(line[c]) for line in lines)) if lines else len(h)
+              for c, h in enumerate(headers)]
+    fmt = '  '.join(f'{{:>{w}}}' for w in widths)
+    return '\n'.join([fmt.format(*headers), fmt.format(*('-' * w for w in widths))] +
+                     [fmt.format(*line) for line in lines])
+
+
+def write_csv(rows: List[Dict], path: str):
+    """Write result rows to a CSV file"""
+    fields = list(DEFAULT_PARAMETERS) + list(RESULT_COLUMNS)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='steeldeckfem-sweep',
+        description='Parametric FEM sweep of steel floor system layouts')
+    parser.add_argument('--grid', help='JSON file: {"parameter": [values, ...], ...}')
+    for name, default in DEFAULT_PARAMETERS.items():
+        kind = type(default) if not isinstance(default, float) else float
+        parser.add_argument('--' + name.replace('_', '-'), nargs='+', type=kind, metavar='V',
+                            help=f'values to sweep (default {default})')
+    parser.add_argument('--live-load', type=float, default=DEFAULT_LOADS['live_load'],
+                        help='live load (kg/m²)')
+    parser.add_argument('--dead-load', type=float, default=DEFAULT_LOADS['dead_load_finish'],
+                        help='finish dead load (kg/m²)')
+    parser.add_argument('--engine', choices=('sparse', 'pynite'), default='sparse')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='worker processes (default: all cores)')
+    parser.add_argument('-o', '--output', help='write results to this CSV file')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    args = _parse_args(argv)
+
+    grid = {}
+    if args.grid:
+        with open(args.grid, encoding='utf-8') as f:
+            grid.update(json.load(f))
+    for name in DEFAULT_PARAMETERS:
+        values = getattr(args, name)
+        if values:
+            grid[name] = values
+
+    loads = {'live_load': args.live_load, 'dead_load_finish': args.dead_load}
+    sweep = ParametricSweep(grid, loads=loads, engine=args.engine, max_workers=args.workers)
+
+    def report(done, total, row):
+        print(f"\r[{done}/{total}] case {row['case']}: {row['status']}", end='',
+              file=sys.stderr, flush=True)
+
+    rows = []
+    cancelled = False
+    try:
+        for row in sweep.run(progress=report):
+            rows.append(row)
+    except KeyboardInterrupt:
+        sweep.cancel()
+        cancelled = True
+    print(file=sys.stderr)
+    if cancelled:
+        print(f'Sweep cancelled: {len(rows)} of {len(sweep)} cases finished', file=sys.stderr)
+
+    # Partial results of a cancelled sweep are reported too
+    rows.sort(key=lambda row: row['case'])
+    print(format_table(rows, list(grid)))
+    if args.output:
+        write_csv(rows, args.output)
+    if cancelled:
+        return 130
+    return 0 if all(row['status'] == 'Analysis Complete' for row in rows) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,14 +8,22 @@ from plotly.subplots import make_subplots
 import numpy as np
 from typing import Dict, List, Any
 
+from steeldeckfem.core.profiling import RunProfiler
+
 
 class StructuralDiagramCreator:
     """
     Creates interactive Plotly charts for structural analysis results
     """
     
-    def __init__(self):
+    def __init__(self, profiler: RunProfiler = None):
+        """
+        Args:
+            profiler: Optional RunProfiler; dashboard phases are recorded
+                      under 'dashboard'
+        """
         self.fig = None
+        self.profiler = profiler or RunProfiler()
         
     def create_complete_analysis_dashboard(self, fem_results: Dict, layout) -> go.Figure:
         """
@@ -28,6 +36,10 @@ class StructuralDiagramCreator:
         Returns:
             Plotly figure with multiple subplots
         """
+        with self.profiler.phase('dashboard'):
+            return self._create_dashboard(fem_results, layout)
+    
+    def _create_dashboard(self, fem_results: Dict, layout) -> go.Figure:
         # Create subplots: 3 rows x 2 columns
         fig = make_subplots(
             rows=3, cols=2,
@@ -49,19 +61,24 @@ class StructuralDiagramCreator:
         )
         
         # 1. 3D Structural Model
-        self._add_3d_structure(fig, layout, fem_results, row=1, col=1)
+        with self.profiler.phase('3d_structure'):
+            self._add_3d_structure(fig, layout, fem_results, row=1, col=1)
         
         # 2. Deflection Diagram
-        self._add_deflection_diagram(fig, fem_results, row=1, col=2)
+        with self.profiler.phase('deflection'):
+            self._add_deflection_diagram(fig, fem_results, row=1, col=2)
         
         # 3. Moment Diagram
-        self._add_moment_diagram(fig, fem_results, row=2, col=2)
+        with self.profiler.phase('moment'):
+            self._add_moment_diagram(fig, fem_results, row=2, col=2)
         
         # 4. Shear Force Diagram
-        self._add_shear_diagram(fig, fem_results, row=3, col=1)
+        with self.profiler.phase('shear'):
+            self._add_shear_diagram(fig, fem_results, row=3, col=1)
         
         # 5. Axial Force Diagram
-        self._add_axial_diagram(fig, fem_results, row=3, col=2)
+        with self.profiler.phase('axial'):
+            self._add_axial_diagram(fig, fem_results, row=3, col=2)
         
         # Layout configuration
         fig.update_layout(
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Run Profiling
+Phase-level wall time, memory and object count instrumentation.
+
+A RunProfiler records named phases (nested phases are named
+'parent/child'). Wall times are always recorded; peak allocations
+(tracemalloc) and the change in garbage-collector tracked objects are
+recorded when enabled, since tracing slows down allocation-heavy code.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Union
+
+PROFILE_FORMAT = 'steeldeckfem-profile'
+
+
+class RunProfiler:
+    """
+    Collects the phases of one run
+
+    Args:
+        trace_memory: Record the peak allocation of every phase (tracemalloc)
+        count_objects: Record the change in gc-tracked objects of every phase
+    """
+
+    def __init__(self, trace_memory: bool = False, count_objects: bool = False):
+        self.trace_memory = trace_memory
+        self.count_objects = count_objects
+        self.phases: List[Dict] = []
+        self._stack: List[Dict] = []
+        self._started_tracing = False
+
+    def reset(self):
+        """Forget all recorded phases"""
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Record a phase
+
+        Args:
+            name: Phase name (prefixed with the enclosing phase names)
+        """
+        if not self._stack and self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        frame = {'name': '/'.join([f['name'] for f in self._stack[-1:]] + [name])}
+        # Objects are counted outside the traced window: the list returned
+        # by gc.get_objects() is itself a large allocation
+        if self.count_objects:
+            frame['objects'] = len(gc.get_objects())
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # reset_peak() is global: keep the enclosing phase's peak so far
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame.update(start_memory=current, peak=current)
+        self._stack.append(frame)
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            record = {'name': frame['name'], 'wall_time': time.perf_counter() - start}
+            self._stack.pop()
+            if self.trace_memory:
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                record['peak_memory'] = peak - frame['start_memory']
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            if self.count_objects:
+                record['objects'] = len(gc.get_objects()) - frame['objects']
+            self.phases.append(record)
+
+            if not self._stack and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    @property
+    def total_time(self) -> float:
+        """Wall time of all top-level phases (s)"""
+        return sum(p['wall_time'] for p in self.phases if '/' not in p['name'])
+
+    def as_dict(self) -> Dict:
+        """Phases in completion order and the total wall time"""
+        return {
+            'total_time': self.total_time,
+            'phases': [dict(p) for p in self.phases],
+        }
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        """Write the profile to a JSON file"""
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'format': PROFILE_FORMAT, **self.as_dict()}, f, indent=2)
+        return path
+
+    def summary(self, top: int = 3) -> str:
+        """One-line readout: total time and the slowest top-level phases"""
+        return format_profile(self.as_dict(), top)
+
+
+def format_profile(profile: Dict, top: int = 3) -> str:
+    """
+    One-line readout of a profile dictionary (RunProfiler.as_dict())
+
+    Args:
+        profile: {'total_time', 'phases'}
+        top: Number of slowest top-level phases to list
+    """
+    phases = sorted((p for p in profile['phases'] if '/' not in p['name']),
+                    key=lambda p: p['wall_time'], reverse=True)
+    parts = [f"{profile['total_time']:.2f} s"]
+    for p in phases[:top]:
+        text = f"{p['name']} {p['wall_time']:.2f} s"
+        if 'peak_memory' in p:
+            text += f" ({p['peak_memory'] / 2**20:.0f} MB)"
+        parts.append(text)
+    return ' | '.join(parts)
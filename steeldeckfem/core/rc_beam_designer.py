@@ -45,6 +45,11 @@ class MaterialDatabase:
         32: 804.2
     }
     
+    @staticmethod
+    def get_bar_area(diameter: int) -> float:
+        """Area of one bar (mm²), also for stirrup sizes outside REBAR_AREAS"""
+        return MaterialDatabase.REBAR_AREAS.get(diameter, math.pi * diameter ** 2 / 4)
+    
     @staticmethod
     def get_concrete_strength(grade: str) -> float:
         """Get f'c for concrete grade"""
@@ -179,7 +184,7 @@ class RCBeamDesigner:
         
         # Assume Φ8 stirrups (2 legs)
         stirrup_dia = 8
-        A_v = 2 * MaterialDatabase.REBAR_AREAS[stirrup_dia]  # mm² (2-leg)
+        A_v = 2 * MaterialDatabase.get_bar_area(stirrup_dia)  # mm² (2-leg)
         
         # Calculate required spacing
         # V_s = A_v · f_y · d / s
@@ -0,0 +1,1615 @@
+# -*- coding: utf-8 -*-
+"""
+Sparse Frame Solver
+Native 3D frame engine for large floor systems.
+
+Element stiffness matrices (12 DOF) are built in vectorized NumPy batches,
+assembled into a scipy.sparse CSR matrix and solved with a sparse direct
+(SuperLU) factorization after a fill-reducing reordering of the DOF
+(approximate minimum degree by default, so the solver does not depend on
+the node generation order). Natural modes are extracted from the same model
+with shift-invert Lanczos (eigsh) on the stiffness factorization, and
+second-order (P-Delta) combinations are iterated on the geometric stiffness
+with that factorization as preconditioner. Influence lines of moving loads
+come from one adjoint solve per response with the same factors, and load
+groups (live-load panels) are solved as blocks of right-hand sides. Rigid
+floor diaphragms tie the in-plane DOF (DX, DY, RZ) of all nodes at a level
+to a master node through a sparse transformation U = T q, and every solve
+works on the reduced stiffness Tᵀ K T. Super-elements (e.g. a floor's
+beam grid between the column tops) are condensed to their boundary DOF
+before the global factorization, identical super-elements sharing one
+condensation, and their internal displacements are recovered after every
+solve. The builder API mirrors the subset of PyNite's FEModel3D used by
+FloorSystemFEMAnalyzer, and member local axes, fixed end reactions and
+internal force sign conventions follow PyNite, so both engines give the same
+results for the same model.
+
+The member subdivision and sparsity pattern are kept between analyses. When
+only section or material properties change, the affected element matrices
+are recomputed in place and the model is re-solved by conjugate gradients
+preconditioned with the previous factorization (refactorizing only when that
+does not converge quickly).
+"""
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import LinearOperator, eigsh, splu
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from steeldeckfem.core.fem_results import ModalResults
+from steeldeckfem.core.force_recovery import COMPONENTS
+from steeldeckfem.core.moving_load import InfluenceLines
+
+DOF_PER_NODE = 6
+GRAVITY = 9.81  # m/s²
+
+# Coordinates are quantized to this grid (m) when searching for nodes that
+# lie on a member, so that floating point noise does not split lines
+_COORD_QUANTUM = 1e-6
+
+# Right-hand sides per sparse triangular solve (bounds the dense blocks)
+_SOLVE_BLOCK = 256
+
+# Equivalent nodal loads of a unit influence load below this fraction of the
+# largest one are round-off (skipped DOF in the adjoint solve)
+_LOAD_CUTOFF = 1e-12
+
+# Influence loads this close to a force station (m) act on its left side,
+# like a node load at the station in analyze()
+_STATION_TOLERANCE = 1e-9
+
+_LOCAL_DIRECTIONS = {'Fx': 0, 'Fy': 1, 'Fz': 2}
+_GLOBAL_DIRECTIONS = {'FX': 0, 'FY': 1, 'FZ': 2}
+_NODE_LOAD_DIRECTIONS = {'FX': 0, 'FY': 1, 'FZ': 2, 'MX': 3, 'MY': 4, 'MZ': 5}
+
+# DOF orderings applied before factorization -> SuperLU column ordering:
+# minimum degree on the symmetric pattern of K, reverse Cuthill-McKee
+# (banded profile), SuperLU's default COLAMD and the node numbering as is
+ORDERINGS = ('amd', 'rcm', 'colamd', 'natural')
+_PERMC_SPEC = {'amd': 'MMD_AT_PLUS_A', 'rcm': 'NATURAL', 'colamd': 'COLAMD', 'natural': 'NATURAL'}
+
+# Re-solves with a previous factorization as CG preconditioner
+_PCG_RTOL = 1e-12
+_PCG_MAXITER = 40
+
+# P-Delta: relative displacement change between axial force updates
+_PDELTA_TOL = 1e-6
+_PDELTA_MAXITER = 20
+
+
+class SparseFrameModel:
+    """
+    3D frame model solved with scipy.sparse
+
+    Physical members are subdivided at every node lying on them (like
+    PyNite's PhysMember), so secondary beams framing into a main beam are
+    connected to it without any extra modelling.
+    """
+
+    def __init__(self, ordering: str = 'amd'):
+        """
+        Args:
+            ordering: DOF ordering before factorization (see ORDERINGS)
+        """
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering '{ordering}'. Available: {', '.join(ORDERINGS)}")
+        self.ordering = ordering
+        self.nodes: Dict[str, int] = {}
+        self.members: Dict[str, int] = {}
+        self.materials: Dict[str, Tuple[float, float, float, float]] = {}
+        self.sections: Dict[str, Tuple[float, float, float, float]] = {}
+        self.load_cases: List[str] = []
+
+        self._coords: List[Tuple[float, float, float]] = []
+        self._member_nodes: List[Tuple[int, int]] = []
+        self._member_material: List[str] = []
+        self._member_section: List[str] = []
+        self._supports: Dict[int, Tuple[bool, ...]] = {}
+        self._dist_loads: List[Tuple[int, str, float, float, str]] = []
+        self._node_loads: List[Tuple[int, int, float, str]] = []
+        self._diaphragms: Dict[float, int] = {}
+        self._super_elements: Dict[str, np.ndarray] = {}
+
+        # Cached between analyses: topology/sparsity pattern, the sections
+        # whose element matrices are out of date and the last factorization
+        self._topology_valid = False
+        self._stale_sections = set()
+        self._lu = None
+        self._lu_current = False
+        self.solver_info = {}
+        self.factor_info = {}
+
+        self.solution = None
+
+    # ------------------------------------------------------------------
+    # Model definition (FEModel3D compatible subset)
+    # ------------------------------------------------------------------
+    def add_node(self, name: str, X: float, Y: float, Z: float) -> str:
+        """Add a node to the model"""
+        if name in self.nodes:
+            raise NameError(f"Node name '{name}' already exists")
+        self.nodes[name] = len(self._coords)
+        self._coords.append((X, Y, Z))
+        self._invalidate_topology()
+        return name
+
+    def add_material(self, name: str, E: float, G: float, nu: float, rho: float):
+        """Add a material (E, G in kN/m², rho in kg/m³), or redefine an existing one"""
+        if name in self.materials:
+            self._stale_sections.update(self.sections)
+            self.solution = None
+        self.materials[name] = (E, G, nu, rho)
+
+    def add_section(self, name: str, A: float, Iy: float, Iz: float, J: float):
+        """Add a cross-section (A in m², inertias in m⁴), or redefine an existing one"""
+        if name in self.sections:
+            self._stale_sections.add(name)
+            self.solution = None
+        self.sections[name] = (A, Iy, Iz, J)
+
+    def update_section(self, name: str, A: float, Iy: float, Iz: float, J: float):
+        """
+        Change the properties of an existing cross-section
+
+        The next analyze() only recomputes the elements using this section
+        and keeps the model topology and sparsity pattern.
+        """
+        if name not in self.sections:
+            raise NameError(f"Section '{name}' does not exist in the model")
+        self.add_section(name, A, Iy, Iz, J)
+
+    def add_member(self, name: str, i_node: str, j_node: str,
+                   material_name: str, section_name: str) -> str:
+        """Add a physical member between two existing nodes"""
+        if name in self.members:
+            raise NameError(f"Member name '{name}' already exists")
+        if material_name not in self.materials:
+            raise NameError(f"Material '{material_name}' does not exist in the model")
+        if section_name not in self.sections:
+            raise NameError(f"Section '{section_name}' does not exist in the model")
+        try:
+            nodes = (self.nodes[i_node], self.nodes[j_node])
+        except KeyError as e:
+            raise NameError(f"Node {e} does not exist in the model")
+
+        self.members[name] = len(self._member_nodes)
+        self._member_nodes.append(nodes)
+        self._member_material.append(material_name)
+        self._member_section.append(section_name)
+        self._invalidate_topology()
+        return name
+
+    def def_support(self, node_name: str, support_DX=False, support_DY=False, support_DZ=False,
+                    support_RX=False, support_RY=False, support_RZ=False):
+        """Define the restrained DOF of a node"""
+        try:
+            node = self.nodes[node_name]
+        except KeyError:
+            raise NameError(f"Node '{node_name}' does not exist in the model")
+        self._supports[node] = (support_DX, support_DY, support_DZ,
+                                support_RX, support_RY, support_RZ)
+        self._invalidate_topology()
+
+    def def_diaphragm(self, Z: float, master_node: str = None) -> str:
+        """
+        Make the floor at height Z a rigid diaphragm
+
+        The DX, DY and RZ displacements of every node at this height follow
+        the in-plane rigid body motion of the master node, which removes
+        their in-plane DOF from the system. Nodes at the level may not be
+        restrained in DX, DY or RZ.
+
+        Args:
+            Z: Floor level (m)
+            master_node: Node at the level carrying the diaphragm DOF
+                         (default: the node nearest to the centroid of the
+                         level)
+
+        Returns:
+            Master node name
+        """
+        coords = np.asarray(self._coords, dtype=np.float64).reshape(-1, 3)
+        level = np.flatnonzero(np.abs(coords[:, 2] - Z) <= _COORD_QUANTUM)
+        if len(level) < 2:
+            raise ValueError(f"A diaphragm needs at least two nodes at Z = {Z:g}")
+        if master_node is None:
+            centroid = coords[level, :2].mean(axis=0)
+            master = int(level[np.argmin(np.linalg.norm(coords[level, :2] - centroid, axis=1))])
+        else:
+            try:
+                master = self.nodes[master_node]
+            except KeyError:
+                raise NameError(f"Node '{master_node}' does not exist in the model")
+            if master not in level:
+                raise ValueError(f"Master node '{master_node}' is not at Z = {Z:g}")
+        self._diaphragms[float(Z)] = master
+        self._invalidate_topology()
+        return list(self.nodes)[master]
+
+    def def_super_element(self, name: str, nodes: Sequence[str]):
+        """
+        Condense nodes into a super-element
+
+        The DOF of the nodes are eliminated before the global
+        factorization (static condensation onto the nodes they connect to)
+        and recovered after every solve, so results are unchanged. The
+        nodes of different super-elements may only be connected through
+        nodes outside them.
+
+        Args:
+            name: Super-element name
+            nodes: Internal nodes
+        """
+        if name in self._super_elements:
+            raise NameError(f"Super-element '{name}' already exists")
+        try:
+            index = np.array([self.nodes[node] for node in nodes], dtype=np.int64)
+        except KeyError as e:
+            raise NameError(f"Node {e} does not exist in the model")
+        for other, other_nodes in self._super_elements.items():
+            if np.isin(index, other_nodes).any():
+                raise ValueError(f"Super-elements '{other}' and '{name}' share nodes")
+        self._super_elements[name] = index
+        self._invalidate_topology()
+
+    def add_member_dist_load(self, member_name: str, direction: str, w1: float, w2: float,
+                             x1=None, x2=None, case: str = 'Case 1'):
+        """
+        Add a linearly varying distributed load over the full member length
+
+        Args:
+            member_name: Physical member name
+            direction: 'Fx', 'Fy', 'Fz' (local) or 'FX', 'FY', 'FZ' (global)
+            w1, w2: Load intensity at the start and end of the member (kN/m)
+            x1, x2: Only full-length loads are supported; leave as None
+            case: Load case name
+        """
+        if direction not in _LOCAL_DIRECTIONS and direction not in _GLOBAL_DIRECTIONS:
+            raise ValueError(f"direction must be 'Fx', 'Fy', 'Fz', 'FX', 'FY', or 'FZ'. "
+                             f"{direction} was given.")
+        if x1 is not None or x2 is not None:
+            raise ValueError("Sparse engine only supports full-length distributed loads")
+        try:
+            member = self.members[member_name]
+        except KeyError:
+            raise NameError(f"Member '{member_name}' does not exist in the model")
+
+        if case not in self.load_cases:
+            self.load_cases.append(case)
+        self._dist_loads.append((member, direction, w1, w2, case))
+        self.solution = None
+
+    def add_node_load(self, node_name: str, direction: str, P: float, case: str = 'Case 1'):
+        """
+        Add a concentrated load to a node
+
+        Args:
+            node_name: Node name
+            direction: 'FX', 'FY', 'FZ', 'MX', 'MY' or 'MZ' (global axes)
+            P: Load magnitude (kN or kNm)
+            case: Load case name
+        """
+        if direction not in _NODE_LOAD_DIRECTIONS:
+            raise ValueError(f"direction must be 'FX', 'FY', 'FZ', 'MX', 'MY', or 'MZ'. "
+                             f"{direction} was given.")
+        try:
+            node = self.nodes[node_name]
+        except KeyError:
+            raise NameError(f"Node '{node_name}' does not exist in the model")
+
+        if case not in self.load_cases:
+            self.load_cases.append(case)
+        self._node_loads.append((node, _NODE_LOAD_DIRECTIONS[direction], P, case))
+        self.solution = None
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+    def analyze(self, check_statics: bool = False):
+        """
+        Assemble the global stiffness matrix and solve all load cases
+
+        Args:
+            check_statics: Store the load/reaction balance per case in
+                           `self.statics_check`
+        """
+        if not self._member_nodes:
+            raise ValueError("Model has no members")
+        if not self.load_cases:
+            self.load_cases.append('Case 1')
+
+        if not self._topology_valid:
+            self._build_topology()
+        self._update_stiffness()
+
+        n_nodes = len(self._coords_array)
+        n_dof = n_nodes * DOF_PER_NODE
+        n_cases = len(self.load_cases)
+        R, dofs = self._elem_R, self._elem_dofs
+
+        # Load vectors for every case (one column per case)
+        F = self._load_vectors()
+        fer = self._elem_fer
+
+        # Solve the free DOF
+        fixed, free = self._fixed, self._free
+        U = np.zeros((n_dof, n_cases))
+        U[free] = self._solve(F[free])
+
+        # Post-processing
+        K = self.K
+        reactions = K @ U - F
+        reactions[~fixed] = 0.0
+
+        d_local = np.einsum('eij,cej->cei', _block_diag(R), U[dofs].transpose(2, 0, 1))
+        self.element_forces = np.einsum('eij,cej->cei', self._elem_k, d_local) + fer
+
+        self.D = U.T.reshape(n_cases, n_nodes, DOF_PER_NODE)
+        self.reactions = reactions.T.reshape(n_cases, n_nodes, DOF_PER_NODE)
+
+        if check_statics:
+            applied = F.reshape(n_nodes, DOF_PER_NODE, n_cases)[:, :3].sum(axis=0)
+            resisted = reactions.reshape(n_nodes, DOF_PER_NODE, n_cases)[:, :3].sum(axis=0)
+            self.statics_check = {
+                case: {'applied': applied[:, c], 'reactions': resisted[:, c],
+                       'residual': float(np.abs(applied[:, c] + resisted[:, c]).max())}
+                for c, case in enumerate(self.load_cases)
+            }
+
+        self.solution = 'Linear'
+
+    def modal_analysis(self, num_modes: int = 12, mass_cases: Dict[str, float] = None,
+                       lumped: bool = True):
+        """
+        Natural frequencies and mode shapes
+
+        The mass is the member self-weight (material rho) plus, optionally,
+        the vertical loads of load cases converted to nodal masses. The
+        generalized problem K φ = ω² M φ is solved on the free DOF by
+        shift-invert Lanczos around zero, re-using the static stiffness
+        factorization.
+
+        Args:
+            num_modes: Number of lowest modes to extract
+            mass_cases: Load case -> factor of the gravity loads (downward
+                        FZ) added as mass, e.g. {'D': 1.0, 'L': 0.3}
+            lumped: Lumped (diagonal) member mass; False uses the
+                    consistent mass matrix
+
+        Returns:
+            ModalResults
+        """
+        if not self._member_nodes:
+            raise ValueError("Model has no members")
+        if not self._topology_valid:
+            self._build_topology()
+        self._update_stiffness()
+
+        n_nodes = len(self._coords_array)
+        n_dof = n_nodes * DOF_PER_NODE
+        free = self._free
+        if not 0 < num_modes < self._K_red.shape[0]:
+            raise ValueError(f"num_modes must be between 1 and {self._K_red.shape[0] - 1}")
+
+        # Member mass, scattered into the stiffness sparsity pattern (t)
+        m_global = self._element_mass(lumped)
+        data = np.bincount(self._k_scatter, weights=m_global.ravel(),
+                           minlength=len(self._k_pattern[0]))
+        indices, indptr, shape = self._ff_pattern
+        M_ff = sp.csc_matrix((data[self._ff_entries], indices, indptr), shape=shape)
+
+        # Load masses: downward vertical loads on the translational DOF
+        node_mass = np.zeros(n_nodes)
+        if mass_cases:
+            unknown = set(mass_cases) - set(self.load_cases)
+            if unknown:
+                raise ValueError(f"Unknown mass load case(s): {', '.join(sorted(unknown))}")
+            F = self._load_vectors()
+            factors = np.array([mass_cases.get(case, 0.0) for case in self.load_cases])
+            Fz = (F[2::DOF_PER_NODE] * factors).sum(axis=1)
+            node_mass = np.maximum(-Fz, 0.0) / GRAVITY
+        load_mass = np.zeros(n_dof)
+        for d in range(3):
+            load_mass[d::DOF_PER_NODE] = node_mass
+        M_ff = M_ff + sp.diags(load_mass[free], format='csc')
+        T = self._constraint
+        M_red = M_ff if T is None else (T.T @ M_ff @ T).tocsc()
+
+        if not self._lu_current:
+            self._refactorize()
+        OPinv = LinearOperator(self._K_red.shape, matvec=self._lu.solve, dtype=np.float64)
+        omega2, phi = eigsh(self._K_red, k=num_modes, M=M_red, sigma=0.0, which='LM', OPinv=OPinv)
+        order = np.argsort(omega2)
+        omega2, phi = omega2[order], self._expand(phi[:, order])
+
+        # Participation of the mass-normalized modes in X, Y, Z translation
+        r = np.zeros((len(free), 3))
+        for d in range(3):
+            r[:, d] = free % DOF_PER_NODE == d
+        Mr = M_ff @ r
+        shapes = np.zeros((num_modes, n_dof))
+        shapes[:, free] = phi.T
+        return ModalResults(
+            node_names=list(self.nodes),
+            omega=np.sqrt(np.maximum(omega2, 0.0)),
+            mode_shapes=shapes.reshape(num_modes, n_nodes, DOF_PER_NODE),
+            participation=phi.T @ Mr,
+            total_mass=np.einsum('id,id->d', r, Mr),
+        )
+
+    def analyze_pdelta(self, factors: np.ndarray, tol: float = _PDELTA_TOL,
+                       max_iter: int = _PDELTA_MAXITER) -> Dict[str, np.ndarray]:
+        """
+        Second-order (P-Delta) analysis of load combinations
+
+        Load cases do not superpose in a second-order analysis, so every
+        combination is solved with its own tangent stiffness K + Kg(N), the
+        geometric stiffness Kg following from the element axial forces N of
+        the previous iteration (starting from the linear solution). All
+        combinations are iterated together. The linear stiffness
+        factorization is never recomputed: it preconditions conjugate
+        gradient solves of the tangent systems, which differ from K only by
+        the geometric term.
+
+        Args:
+            factors: (n_combinations, n_cases) load case factors, columns in
+                     the order of self.load_cases
+            tol: Convergence tolerance on the relative change of the
+                 displacements between two axial force updates
+            max_iter: Maximum number of axial force updates
+
+        Returns:
+            Dictionary of per-combination arrays: 'D' and 'D_linear'
+            (n_combinations, n_nodes, 6) second- and first-order
+            displacements, 'reactions' (n_combinations, n_nodes, 6),
+            'element_forces' (n_combinations, n_elements, 12) and 'loads'
+            (element load intensities), plus the number of 'iterations'
+        """
+        if not self._member_nodes:
+            raise ValueError("Model has no members")
+        if not self.load_cases:
+            self.load_cases.append('Case 1')
+        factors = np.atleast_2d(np.asarray(factors, dtype=np.float64))
+        if factors.shape[1] != len(self.load_cases):
+            raise ValueError(f"factors must have {len(self.load_cases)} columns (one per load case)")
+
+        if not self._topology_valid:
+            self._build_topology()
+        self._update_stiffness()
+        if not self._lu_current:
+            self._refactorize()
+
+        n_nodes = len(self._coords_array)
+        n_dof = n_nodes * DOF_PER_NODE
+        n_comb = len(factors)
+        free, fixed = self._free, self._fixed
+        T = _block_diag(self._elem_R)
+
+        F = self._load_vectors() @ factors.T
+        fer = np.tensordot(factors, self._elem_fer, axes=1)
+        loads = np.tensordot(factors, self._elem_w, axes=1)
+
+        # Geometric stiffness per unit tension, summed into the pattern of K:
+        # the entries of Kg(N) of all combinations are then G @ N.T
+        sec_names = list(self.sections)
+        sec_props = np.asarray([self.sections[s] for s in sec_names], dtype=np.float64)
+        sec_index = np.array([sec_names.index(s) for s in self._member_section])[self._elem_member]
+        A, Iy, Iz, _ = sec_props[sec_index].T
+        kg_local = _local_geometric(self._elem_L, (Iy + Iz) / A)
+        n_elem = len(kg_local)
+        G = sp.csr_matrix(
+            (_to_global(kg_local, self._elem_R).ravel(),
+             (self._k_scatter, np.repeat(np.arange(n_elem), 144))),
+            shape=(len(self._k_pattern[0]), n_elem))
+        indices, indptr, shape = self._ff_pattern
+        k_data = self._K_ff.data
+
+        def element_forces(U, N):
+            d_local = np.einsum('eij,cej->cei', T, U[self._elem_dofs].transpose(2, 0, 1))
+            return (np.einsum('eij,cej->cei', self._elem_k, d_local) +
+                    N[..., None] * np.einsum('eij,cej->cei', kg_local, d_local) + fer)
+
+        # First order solution and its axial forces (tension positive)
+        U = np.zeros((n_dof, n_comb))
+        U[free] = self._solve_factored(F[free])
+        U_linear = U.copy()
+        N = np.zeros((n_comb, n_elem))
+        forces = element_forces(U, N)
+
+        for iteration in range(1, max_iter + 1):
+            N = (forces[..., 6] - forces[..., 0]) / 2
+            kg_data = (G @ N.T)[self._ff_entries]
+            tangent = [sp.csc_matrix((k_data + kg_data[:, c], indices, indptr), shape=shape)
+                       for c in range(n_comb)]
+            F_red = self._reduce(F[free])
+            q, _ = _pcg(lambda X: self._reduce(np.column_stack(
+                [Kt @ self._expand(X[:, c]) for c, Kt in enumerate(tangent)])),
+                F_red, self._lu.solve)
+            if q is None or np.any(np.einsum('ij,ij->j', F_red, q) < 0):
+                raise ValueError("P-Delta analysis did not converge: the axial forces exceed "
+                                 "the elastic critical load. The structure is unstable.")
+            U_f = self._expand(q)
+            change = np.linalg.norm(U_f - U[free], axis=0)
+            scale = np.maximum(np.linalg.norm(U_f, axis=0), np.finfo(float).tiny)
+            U[free] = U_f
+            forces = element_forces(U, N)
+            if np.all(change <= tol * scale):
+                break
+        else:
+            raise ValueError(f"P-Delta analysis did not converge in {max_iter} iterations")
+
+        # Reactions from the tangent stiffness of the converged state
+        kg_data = G @ N.T
+        indices, indptr, shape = self._k_pattern
+        reactions = self.K @ U - F
+        for c in range(n_comb):
+            reactions[:, c] += sp.csr_matrix((kg_data[:, c], indices, indptr), shape=shape) @ U[:, c]
+        reactions[~fixed] = 0.0
+
+        self.solver_info = {'method': 'p-delta', 'iterations': iteration}
+        return {
+            'D': U.T.reshape(n_comb, n_nodes, DOF_PER_NODE),
+            'D_linear': U_linear.T.reshape(n_comb, n_nodes, DOF_PER_NODE),
+            'reactions': reactions.T.reshape(n_comb, n_nodes, DOF_PER_NODE),
+            'element_forces': forces,
+            'loads': loads,
+            'iterations': iteration,
+        }
+
+    def analyze_load_groups(self, case: str, weights, block: int = _SOLVE_BLOCK
+                            ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Solve the distributed loads of one case split into load groups
+
+        Group g carries weights[g, m] times the distributed loads of `case`
+        on member m (e.g. the live load of one bay panel). Every group is a
+        right-hand side of the same stiffness factorization; the groups are
+        solved and yielded `block` at a time, so memory stays bounded
+        however many groups there are.
+
+        Args:
+            case: Load case whose distributed loads are split
+            weights: (n_groups, n_members) array or sparse matrix, columns
+                     in member order
+            block: Groups per solve
+
+        Yields:
+            Per block: 'groups' (slice of group indices), 'D' and
+            'reactions' (n_block, n_nodes, 6), 'element_forces'
+            (n_block, n_elements, 12) and 'loads' (element load intensities)
+        """
+        if case not in self.load_cases:
+            raise ValueError(f"Unknown load case '{case}'")
+        weights = sp.csr_matrix(weights)
+        if weights.shape[1] != len(self._member_nodes):
+            raise ValueError(f"weights must have {len(self._member_nodes)} columns (one per member)")
+        if not self._topology_valid:
+            self._build_topology()
+        self._update_stiffness()
+        if not self._lu_current:
+            self._refactorize()
+
+        n_nodes = len(self._coords_array)
+        n_dof = n_nodes * DOF_PER_NODE
+        L, R, dofs = self._elem_L, self._elem_R, self._elem_dofs
+        T = _block_diag(R)
+        self._load_vectors()
+        case_w = self._elem_w[self.load_cases.index(case)]
+        elem_weights = weights[:, self._elem_member]
+
+        for start in range(0, weights.shape[0], block):
+            groups = slice(start, min(start + block, weights.shape[0]))
+            w = elem_weights[groups].toarray()
+            n_block = len(w)
+            loads = w[:, :, None, None] * case_w
+            fer = _fixed_end_reactions(loads, L)
+            fer_global = np.einsum('eji,ceaj->ceai', R, fer.reshape(n_block, -1, 4, 3))
+            scatter = dofs.ravel() + n_dof * np.arange(n_block)[:, None]
+            F = -np.bincount(scatter.ravel(), weights=fer_global.ravel(),
+                             minlength=n_block * n_dof).reshape(n_block, n_dof).T
+
+            U = np.zeros((n_dof, n_block))
+            U[self._free] = self._solve_factored(F[self._free])
+            reactions = self.K @ U - F
+            reactions[~self._fixed] = 0.0
+            d_local = np.einsum('eij,cej->cei', T, U[dofs].transpose(2, 0, 1))
+            yield {
+                'groups': groups,
+                'D': U.T.reshape(n_block, n_nodes, DOF_PER_NODE),
+                'reactions': reactions.T.reshape(n_block, n_nodes, DOF_PER_NODE),
+                'element_forces': np.einsum('eij,cej->cei', self._elem_k, d_local) + fer,
+                'loads': loads,
+            }
+
+    def influence_lines(self, path: Sequence[str], responses: Sequence[Tuple],
+                        step: float = 0.1, direction: str = 'FZ') -> InfluenceLines:
+        """
+        Influence lines of a unit point load moving along a path of members
+
+        Every response is a linear function g·U of the displacements, so by
+        Maxwell-Betti its value for any load vector F is λ·F with K λ = g:
+        one adjoint solve per response (all in one call to the stiffness
+        factors) gives the response to a load anywhere, instead of one
+        solve per load position. A load between nodes acts through its
+        element fixed end reactions, which is exact for these elements, and
+        responses in the loaded element get their statical part directly.
+
+        Args:
+            path: Physical members in order along the path, each sharing an
+                  end node with the next (either member orientation)
+            responses: ('reaction', node, 'FX'...'MZ') for a support
+                       reaction, or (component, member, x) for an internal
+                       force at x along a member (component from
+                       force_recovery.COMPONENTS)
+            step: Largest distance between influence ordinates (m)
+            direction: Global direction of the unit load ('FX', 'FY', 'FZ')
+
+        Returns:
+            InfluenceLines, per unit load in the positive global direction
+        """
+        if direction not in _GLOBAL_DIRECTIONS:
+            raise ValueError(f"direction must be 'FX', 'FY', or 'FZ'. {direction} was given.")
+        if not path:
+            raise ValueError("The load path has no members")
+        if step <= 0:
+            raise ValueError("step must be positive")
+        if not self._member_nodes:
+            raise ValueError("Model has no members")
+        if not self._topology_valid:
+            self._build_topology()
+        self._update_stiffness()
+        if not self._lu_current:
+            self._refactorize()
+
+        # Load positions along the path -> element and position in it
+        members, flipped, start = self._path_members(path)
+        lengths = self._member_length[members]
+        total = start[-1] + lengths[-1]
+        positions = np.linspace(0.0, total, int(np.ceil(total / step - 1e-9)) + 1)
+        k = np.clip(np.searchsorted(start, positions, side='right') - 1, 0, len(members) - 1)
+        x = positions - start[k]
+        x = np.where(flipped[k], lengths[k] - x, x)
+        elem, a = np.empty(len(x), dtype=np.int64), np.empty(len(x))
+        for j, name in enumerate(path):
+            on = k == j
+            elem[on], a[on] = self._locate(name, x[on])
+
+        # Unit load in local axes and its equivalent nodal loads
+        unit = np.zeros(3)
+        unit[_GLOBAL_DIRECTIONS[direction]] = 1.0
+        R = self._elem_R[elem]
+        P = R @ unit
+        fer = _point_fixed_end_reactions(P, a, self._elem_L[elem])
+        F = -np.einsum('pji,pj->pi', _block_diag(R), fer)
+
+        # Adjoint loads g (response = g·U) as sparse columns; the -F term of
+        # a reaction (K U - F) is a -1 on its restrained DOF, added below
+        rows, cols, data = [], [], []
+        restrained = []
+        local = []
+        names = []
+        for r, (kind, target, where) in enumerate(responses):
+            if kind == 'reaction':
+                try:
+                    d = self.nodes[target] * DOF_PER_NODE + _NODE_LOAD_DIRECTIONS[where]
+                except KeyError as e:
+                    raise NameError(f"Node or direction {e} does not exist in the model")
+                if not self._fixed[d]:
+                    raise ValueError(f"Node '{target}' is not restrained in {where}")
+                row = self.K[d]
+                rows.append(row.indices)
+                data.append(row.data)
+                restrained.append((d, r))
+                names.append(f'{target} reaction {where}')
+            elif kind in COMPONENTS:
+                if target not in self.members:
+                    raise NameError(f"Member '{target}' does not exist in the model")
+                e, xe = self._locate(target, where)
+                e, xe = e[0], xe[0]
+                c = _force_selector(kind, xe)
+                rows.append(self._elem_dofs[e])
+                data.append(_block_diag(self._elem_R[e:e + 1])[0].T @ (self._elem_k[e].T @ c))
+                local.append((r, e, xe, c, kind))
+                names.append(f'{target} {kind} @ {float(where):g}')
+            else:
+                raise ValueError(f"Unknown response '{kind}'. Use 'reaction' or one of: "
+                                 f"{', '.join(COMPONENTS)}")
+            cols.append(np.full(len(rows[-1]), r))
+        n_dof = len(self._coords_array) * DOF_PER_NODE
+        G = sp.csc_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(n_dof, len(responses)))[self._free]
+
+        # λ = K⁻¹ g is only needed on the DOF actually loaded (e.g. DZ and
+        # the bending rotations for vertical loads); other DOF map to a zero
+        # row at the end of `adjoint`
+        dofs = self._elem_dofs[elem]
+        loaded = np.unique(dofs[np.abs(F) > _LOAD_CUTOFF * np.abs(F).max()])
+        adjoint = np.zeros((len(loaded) + 1, len(responses)))
+        on_free = np.flatnonzero(~self._fixed[loaded])
+        adjoint[on_free] = self._solve_restricted(G, np.searchsorted(self._free, loaded[on_free]))
+        index = np.minimum(np.searchsorted(loaded, dofs), len(loaded) - 1)
+        index[loaded[index] != dofs] = len(loaded)
+        for d, r in restrained:
+            adjoint[index[dofs == d], r] = -1.0
+        values = np.einsum('pj,pjr->rp', F, adjoint[index])
+
+        # Loads on the element of an internal force response
+        for r, e, xe, c, kind in local:
+            on = np.flatnonzero(elem == e)
+            left = a[on] <= xe + _STATION_TOLERANCE
+            values[r, on] += fer[on] @ c
+            if kind in ('axial', 'shear_y', 'shear_z'):
+                values[r, on] += left * P[on, COMPONENTS.index(kind)]
+            else:
+                axis = 2 if kind == 'moment_y' else 1
+                values[r, on] -= left * P[on, axis] * (xe - a[on])
+
+        return InfluenceLines(names, positions, values, direction)
+
+    def _solve_restricted(self, G: sp.csc_matrix, rows: np.ndarray) -> np.ndarray:
+        """
+        Rows of K_ff⁻¹ G, with the fewer solves: one per column of G, or
+        (K_ff⁻¹ being symmetric, also with diaphragms) one unit load per
+        requested row
+        """
+        n_free, n_cols = G.shape
+        result = np.empty((len(rows), n_cols))
+        if n_cols <= len(rows):
+            for s in range(0, n_cols, _SOLVE_BLOCK):
+                block = slice(s, s + _SOLVE_BLOCK)
+                result[:, block] = self._solve_factored(G[:, block].toarray())[rows]
+        else:
+            for s in range(0, len(rows), _SOLVE_BLOCK):
+                block = rows[s:s + _SOLVE_BLOCK]
+                E = np.zeros((n_free, len(block)))
+                E[block, np.arange(len(block))] = 1.0
+                result[s:s + len(block)] = (G.T @ self._solve_factored(E)).T
+        return result
+
+    def _path_members(self, path: Sequence[str]):
+        """Member indices, reversal flags and start positions along a path"""
+        try:
+            members = np.array([self.members[name] for name in path])
+        except KeyError as e:
+            raise NameError(f"Member {e} does not exist in the model")
+        ends = np.asarray(self._member_nodes)[members]
+        flipped = np.zeros(len(members), dtype=bool)
+        if len(members) > 1:
+            flipped[0] = ends[0, 0] in ends[1]
+        for j in range(1, len(members)):
+            joint = ends[j - 1, 0 if flipped[j - 1] else 1]
+            if joint not in ends[j]:
+                raise ValueError(f"Members '{path[j - 1]}' and '{path[j]}' are not connected")
+            flipped[j] = ends[j, 1] == joint
+        start = np.concatenate([[0.0], np.cumsum(self._member_length[members])[:-1]])
+        return members, flipped, start
+
+    def _element_mass(self, lumped: bool) -> np.ndarray:
+        """Global element mass matrices (n_elements, 12, 12) in t"""
+        sec_names, mat_names = list(self.sections), list(self.materials)
+        sec_props = np.asarray([self.sections[s] for s in sec_names], dtype=np.float64)
+        mat_props = np.asarray([self.materials[m] for m in mat_names], dtype=np.float64)
+        sec_index = np.array([sec_names.index(s) for s in self._member_section])[self._elem_member]
+        mat_index = np.array([mat_names.index(m) for m in self._member_material])[self._elem_member]
+
+        rho = mat_props[mat_index, 3] / 1000  # kg/m³ -> t/m³
+        A, Iy, Iz, _ = sec_props[sec_index].T
+        m_local = _local_mass(rho, A, Iy + Iz, self._elem_L, lumped)
+        return _to_global(m_local, self._elem_R)
+
+    def _load_vectors(self) -> np.ndarray:
+        """Global load vectors (n_dof, n_cases) including member fixed end reactions"""
+        n_dof = len(self._coords_array) * DOF_PER_NODE
+        n_cases = len(self.load_cases)
+        L, R, dofs = self._elem_L, self._elem_R, self._elem_dofs
+
+        elem_w = self._element_line_loads(self._elem_member, self._elem_x0, L, R)
+        fer = _fixed_end_reactions(elem_w, L)
+        F = np.zeros((n_dof, n_cases))
+        fer_global = np.einsum('eji,ceaj->ceai', R, fer.reshape(n_cases, -1, 4, 3))
+        for c in range(n_cases):
+            np.add.at(F[:, c], dofs.ravel(), -fer_global[c].reshape(-1))
+        for node, dof, P, case in self._node_loads:
+            F[node * DOF_PER_NODE + dof, self.load_cases.index(case)] += P
+        self._elem_w = elem_w
+        self._elem_fer = fer
+        return F
+
+    def _invalidate_topology(self):
+        self._topology_valid = False
+        self._lu = None
+        self._lu_current = False
+        self.solution = None
+
+    def _build_topology(self):
+        """
+        Member subdivision, element geometry and the sparsity pattern of the
+        global and free-free stiffness matrices
+        """
+        coords = np.asarray(self._coords, dtype=np.float64)
+        member_nodes = np.asarray(self._member_nodes, dtype=np.int64)
+        n_dof = len(coords) * DOF_PER_NODE
+
+        # Split physical members into elements at internal nodes
+        elem_member, elem_i, elem_j, elem_x0 = _split_members(coords, member_nodes)
+        self._coords_array = coords
+        self._elem_member = elem_member
+        self._elem_x0 = elem_x0
+        self._member_elem_ptr = np.searchsorted(elem_member, np.arange(len(member_nodes) + 1))
+        self._member_length = np.linalg.norm(
+            coords[member_nodes[:, 1]] - coords[member_nodes[:, 0]], axis=1)
+        self._elem_L = np.linalg.norm(coords[elem_j] - coords[elem_i], axis=1)
+        self._elem_R = _direction_cosines(coords[elem_i], coords[elem_j])
+
+        # CSR pattern of K: element entries are scattered into it by
+        # summing duplicates (np.bincount over _k_scatter)
+        dofs = _element_dofs(elem_i, elem_j)
+        rows = np.repeat(dofs, 12, axis=1).ravel()
+        cols = np.tile(dofs, (1, 12)).ravel()
+        entries, self._k_scatter = np.unique(rows * n_dof + cols, return_inverse=True)
+        k_rows, k_cols = np.divmod(entries, n_dof)
+        self._k_pattern = (k_cols, np.searchsorted(k_rows, np.arange(n_dof + 1)), (n_dof, n_dof))
+        self._elem_dofs = dofs
+
+        # Free-free block (K is symmetric, so its CSR arrays are also CSC)
+        fixed = np.zeros(n_dof, dtype=bool)
+        for node, restraints in self._supports.items():
+            fixed[node * DOF_PER_NODE:(node + 1) * DOF_PER_NODE] = restraints
+        free = np.flatnonzero(~fixed)
+        free_index = np.full(n_dof, -1)
+        free_index[free] = np.arange(len(free))
+        self._ff_entries = np.flatnonzero(~fixed[k_rows] & ~fixed[k_cols])
+        ff_rows = free_index[k_rows[self._ff_entries]]
+        self._ff_pattern = (free_index[k_cols[self._ff_entries]],
+                            np.searchsorted(ff_rows, np.arange(len(free) + 1)),
+                            (len(free), len(free)))
+        self._fixed, self._free = fixed, free
+        self._constraint = _diaphragm_constraint(
+            coords, fixed, self._diaphragms, list(self.nodes)) if self._diaphragms else None
+
+        self._elem_k = np.zeros((len(elem_member), 12, 12))
+        self._elem_k_global = np.zeros_like(self._elem_k)
+        self._stale_sections = set(self.sections)
+        self._topology_valid = True
+
+    def _update_stiffness(self):
+        """Recompute the element matrices of changed sections and re-assemble K"""
+        if not self._stale_sections:
+            return
+        sec_names = list(self.sections)
+        mat_names = list(self.materials)
+        sec_props = np.asarray([self.sections[s] for s in sec_names], dtype=np.float64)
+        mat_props = np.asarray([self.materials[m] for m in mat_names], dtype=np.float64)
+        sec_index = np.array([sec_names.index(s) for s in self._member_section])[self._elem_member]
+        mat_index = np.array([mat_names.index(m) for m in self._member_material])[self._elem_member]
+
+        stale = [sec_names.index(s) for s in self._stale_sections if s in self.sections]
+        elems = np.flatnonzero(np.isin(sec_index, stale))
+        E, G = mat_props[mat_index[elems], 0], mat_props[mat_index[elems], 1]
+        A, Iy, Iz, J = sec_props[sec_index[elems]].T
+        k_local = _local_stiffness(E, G, A, Iy, Iz, J, self._elem_L[elems])
+        self._elem_k[elems] = k_local
+        self._elem_k_global[elems] = _to_global(k_local, self._elem_R[elems])
+        self._stale_sections = set()
+
+        data = np.bincount(self._k_scatter, weights=self._elem_k_global.ravel(),
+                           minlength=len(self._k_pattern[0]))
+        indices, indptr, shape = self._k_pattern
+        self.K = sp.csr_matrix((data, indices, indptr), shape=shape)
+        indices, indptr, shape = self._ff_pattern
+        self._K_ff = sp.csc_matrix((data[self._ff_entries], indices, indptr), shape=shape)
+        T = self._constraint
+        self._K_red = self._K_ff if T is None else (T.T @ self._K_ff @ T).tocsc()
+        self._lu_current = False
+
+    def _solve(self, F_f: np.ndarray) -> np.ndarray:
+        """
+        Solve K_ff U = F_f, re-using the last factorization when possible
+
+        After a stiffness change the previous factorization preconditions a
+        conjugate gradient solve; the matrix is only refactorized when that
+        does not converge within _PCG_MAXITER iterations.
+        """
+        if self._lu is not None and not self._lu_current:
+            q, iterations = _pcg(self._K_red, self._reduce(F_f), self._lu.solve)
+            if q is not None:
+                self.solver_info = {'method': 'pcg', 'iterations': iterations}
+                return self._expand(q)
+        if not self._lu_current:
+            self._refactorize()
+            self.solver_info = {'method': 'lu', 'iterations': 0}
+        else:
+            self.solver_info = {'method': 'lu (reused)', 'iterations': 0}
+        return self._solve_factored(F_f)
+
+    def _solve_factored(self, F_f: np.ndarray) -> np.ndarray:
+        """Free DOF displacements for free DOF loads with the current factors"""
+        return self._expand(self._lu.solve(self._reduce(F_f)))
+
+    def _reduce(self, F_f: np.ndarray) -> np.ndarray:
+        """Free DOF loads -> loads on the diaphragm-reduced DOF (Tᵀ F)"""
+        return F_f if self._constraint is None else self._constraint.T @ F_f
+
+    def _expand(self, q: np.ndarray) -> np.ndarray:
+        """Diaphragm-reduced DOF displacements -> free DOF displacements (T q)"""
+        return q if self._constraint is None else self._constraint @ q
+
+    def _refactorize(self):
+        """Factorize K_ff and record the size, fill-in and time of the factors"""
+        start = time.perf_counter()
+        if self._super_elements:
+            self._lu = _CondensedLU(self._K_red, self._super_element_dofs(),
+                                    list(self._super_elements), self.ordering)
+        else:
+            self._lu = _factorize(self._K_red, self.ordering)
+        self._lu_current = True
+        nnz = self._K_red.nnz
+        self.factor_info = {
+            'ordering': self.ordering,
+            'dof': self._K_red.shape[0],
+            'nnz': nnz,
+            'nnz_factors': self._lu.nnz,
+            'fill_ratio': self._lu.nnz / nnz,
+            'time': time.perf_counter() - start,
+        }
+        if self._super_elements:
+            self.factor_info.update(self._lu.info)
+
+    def _super_element_dofs(self) -> List[np.ndarray]:
+        """
+        Reduced DOF internal to every super-element: those moving only
+        nodes of the super-element (a diaphragm master DOF that also moves
+        other nodes stays global)
+        """
+        owner = np.full(len(self._coords_array), -1)
+        for s, nodes in enumerate(self._super_elements.values()):
+            owner[nodes] = s
+        row_owner = owner[self._free // DOF_PER_NODE]
+        if self._constraint is None:
+            dof_owner = row_owner
+        else:
+            T = self._constraint
+            entry_owner = row_owner[T.indices]
+            lowest = np.minimum.reduceat(entry_owner, T.indptr[:-1])
+            highest = np.maximum.reduceat(entry_owner, T.indptr[:-1])
+            dof_owner = np.where(lowest == highest, lowest, -1)
+        return [np.flatnonzero(dof_owner == s) for s in range(len(self._super_elements))]
+
+    def _element_line_loads(self, elem_member, elem_x0, L, R) -> np.ndarray:
+        """
+        Local load intensities at both element ends
+
+        Returns:
+            Array (n_cases, n_elements, 3, 2): local x/y/z components at i and j
+        """
+        n_cases = len(self.load_cases)
+        n_elem = len(elem_member)
+        elem_w = np.zeros((n_cases, n_elem, 3, 2))
+        if not self._dist_loads:
+            return elem_w
+
+        load_member = np.array([d[0] for d in self._dist_loads])
+        load_dir = [d[1] for d in self._dist_loads]
+        w1 = np.array([d[2] for d in self._dist_loads], dtype=np.float64)
+        w2 = np.array([d[3] for d in self._dist_loads], dtype=np.float64)
+        load_case = np.array([self.load_cases.index(d[4]) for d in self._dist_loads])
+
+        # Unit direction of every load, in local or global axes
+        unit = np.zeros((len(load_member), 3))
+        is_global = np.zeros(len(load_member), dtype=bool)
+        for k, direction in enumerate(load_dir):
+            if direction in _GLOBAL_DIRECTIONS:
+                unit[k, _GLOBAL_DIRECTIONS[direction]] = 1.0
+                is_global[k] = True
+            else:
+                unit[k, _LOCAL_DIRECTIONS[direction]] = 1.0
+
+        # Expand each load onto the elements of its physical member
+        ptr = self._member_elem_ptr
+        counts = ptr[load_member + 1] - ptr[load_member]
+        load_idx = np.repeat(np.arange(len(load_member)), counts)
+        elem = np.concatenate([np.arange(ptr[m], ptr[m + 1]) for m in load_member])
+
+        Lm = self._member_length[load_member[load_idx]]
+        slope = (w2 - w1)[load_idx] / Lm
+        wa = w1[load_idx] + slope * elem_x0[elem]
+        wb = w1[load_idx] + slope * (elem_x0[elem] + L[elem])
+
+        direction = unit[load_idx]
+        glob = is_global[load_idx]
+        direction[glob] = np.einsum('eij,ej->ei', R[elem[glob]], direction[glob])
+
+        contrib = np.stack([direction * wa[:, None], direction * wb[:, None]], axis=-1)
+        np.add.at(elem_w, (load_case[load_idx], elem), contrib)
+        return elem_w
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+    def _check_solved(self):
+        if self.solution is None:
+            raise ValueError("Model has not been analyzed. Call analyze() first.")
+
+    def _locate(self, member_name: str, x) -> Tuple[np.ndarray, np.ndarray]:
+        """Element index and element-local position for points on a physical member"""
+        m = self.members[member_name]
+        start, stop = self._member_elem_ptr[m], self._member_elem_ptr[m + 1]
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        k = np.searchsorted(self._elem_x0[start:stop], x, side='right') - 1
+        elem = start + np.clip(k, 0, stop - start - 1)
+        return elem, x - self._elem_x0[elem]
+
+    def shear(self, member_name: str, direction: str, x, case: str = 'Case 1') -> np.ndarray:
+        """Shear 'Fy' or 'Fz' at positions x along a physical member"""
+        self._check_solved()
+        c = self.load_cases.index(case)
+        elem, xe = self._locate(member_name, x)
+        comp = {'Fy': 1, 'Fz': 2}[direction]
+        f = self.element_forces[c, elem]
+        w1, w2 = self._elem_w[c, elem, comp, 0], self._elem_w[c, elem, comp, 1]
+        L = self._elem_L[elem]
+        return f[:, comp] + w1 * xe + xe**2 * (w2 - w1) / (2 * L)
+
+    def moment(self, member_name: str, direction: str, x, case: str = 'Case 1') -> np.ndarray:
+        """Bending moment 'My' or 'Mz' at positions x along a physical member"""
+        self._check_solved()
+        c = self.load_cases.index(case)
+        elem, xe = self._locate(member_name, x)
+        f = self.element_forces[c, elem]
+        L = self._elem_L[elem]
+        if direction == 'Mz':
+            w1, w2 = self._elem_w[c, elem, 1, 0], self._elem_w[c, elem, 1, 1]
+            return f[:, 5] - f[:, 1] * xe - w1 * xe**2 / 2 - xe**3 * (w2 - w1) / (6 * L)
+        if direction == 'My':
+            w1, w2 = self._elem_w[c, elem, 2, 0], self._elem_w[c, elem, 2, 1]
+            return -f[:, 4] - f[:, 2] * xe - w1 * xe**2 / 2 - xe**3 * (w2 - w1) / (6 * L)
+        raise ValueError(f"Direction must be 'My' or 'Mz'. {direction} was given.")
+
+    def axial(self, member_name: str, x, case: str = 'Case 1') -> np.ndarray:
+        """Axial force at positions x along a physical member"""
+        self._check_solved()
+        c = self.load_cases.index(case)
+        elem, xe = self._locate(member_name, x)
+        p1, p2 = self._elem_w[c, elem, 0, 0], self._elem_w[c, elem, 0, 1]
+        L = self._elem_L[elem]
+        return self.element_forces[c, elem, 0] + p1 * xe + (p2 - p1) * xe**2 / (2 * L)
+
+    def member_length(self, member_name: str) -> float:
+        """Length of a physical member"""
+        if not self._topology_valid:
+            self._build_topology()
+        return float(self._member_length[self.members[member_name]])
+
+
+# ----------------------------------------------------------------------
+# Vectorized element kernels
+# ----------------------------------------------------------------------
+def _factorize(K_ff: sp.csc_matrix, ordering: str = 'amd'):
+    """Sparse LU factorization, rejecting singular (unstable) structures"""
+    perm = None
+    if ordering == 'rcm':
+        perm = reverse_cuthill_mckee(K_ff.tocsr(), symmetric_mode=True)
+        K_ff = K_ff[perm][:, perm].tocsc()
+    try:
+        # K is symmetric positive definite: diagonal pivots keep the fill-
+        # reducing ordering intact (row interchanges can multiply the fill,
+        # notably on diaphragm-reduced matrices)
+        lu = splu(K_ff, permc_spec=_PERMC_SPEC[ordering], diag_pivot_thresh=0.0,
+                  options={'SymmetricMode': True})
+    except RuntimeError:
+        lu = None
+    if lu is not None:
+        pivots = np.abs(lu.U.diagonal())
+        if pivots.min() > 1e-12 * pivots.max():
+            return lu if perm is None else _PermutedLU(lu, perm)
+    raise ValueError("The stiffness matrix is singular, which implies rigid body motion. "
+                     "The structure is unstable.")
+
+
+class _CondensedLU:
+    """
+    Solves K x = b with the internal DOF of super-elements condensed out
+
+    Every super-element with internal DOF I and boundary DOF B (the DOF
+    its internal DOF are coupled to) contributes its Schur complement
+    -K_bi K_ii⁻¹ K_ib to the global matrix S over all non-internal DOF,
+    which is then factorized. Super-elements with identical K_ii and K_ib
+    (e.g. the floors of repeated storeys) share one K_ii factorization and
+    one X = K_ii⁻¹ K_ib. A solve condenses the loads (b_B - Xᵀ b_I),
+    solves S and recovers x_I = K_ii⁻¹ b_I - X x_B.
+
+    Args:
+        K: Symmetric stiffness matrix
+        internal: Internal DOF of every super-element
+        names: Super-element names (for error messages)
+        ordering: DOF ordering of the factorizations
+    """
+
+    def __init__(self, K: sp.csc_matrix, internal: List[np.ndarray], names: List[str],
+                 ordering: str = 'amd'):
+        n = K.shape[0]
+        owner = np.full(n, -1)
+        for s, dofs in enumerate(internal):
+            owner[dofs] = s
+        self.boundary = np.flatnonzero(owner < 0)
+        boundary_index = np.full(n, -1)
+        boundary_index[self.boundary] = np.arange(len(self.boundary))
+        K = K.tocsr()
+
+        shared = {}
+        rows, cols, data = [], [], []
+        for s, I in enumerate(internal):
+            if not len(I):
+                continue
+            K_I = K[I]
+            B = np.setdiff1d(K_I.indices, I)
+            if np.any(owner[B] >= 0):
+                raise ValueError(f"Super-elements '{names[s]}' and '{names[owner[B].max()]}' "
+                                 f"are connected directly; connect them through global nodes")
+            K_ii, K_ib = K_I[:, I].tocsc(), K_I[:, B].tocsr()
+            key = tuple(a.tobytes() for a in (K_ii.data, K_ii.indices, K_ii.indptr,
+                                              K_ib.data, K_ib.indices, K_ib.indptr))
+            if key not in shared:
+                lu = _factorize(K_ii, ordering)
+                X = lu.solve(K_ib.toarray())
+                shared[key] = (lu, X, K_ib.T @ X, [], [])
+            _, _, schur, members, boundaries = shared[key]
+            members.append(I)
+            boundaries.append(boundary_index[B])
+            rows.append(np.repeat(boundary_index[B], len(B)))
+            cols.append(np.tile(boundary_index[B], len(B)))
+            data.append(-schur.ravel())
+
+        K_bb = K[self.boundary][:, self.boundary].tocoo()
+        S = sp.csc_matrix((np.concatenate([K_bb.data] + data),
+                           (np.concatenate([K_bb.row] + rows), np.concatenate([K_bb.col] + cols))),
+                          shape=(len(self.boundary),) * 2)
+        self.lu = _factorize(S, ordering)
+        self.groups = [(lu, X, np.array(members), np.array(boundaries))
+                       for lu, X, _, members, boundaries in shared.values()]
+        self.nnz = self.lu.nnz + sum(lu.nnz + X.size for lu, X, _, _ in self.groups)
+        self.info = {
+            'global_dof': len(self.boundary),
+            'condensed_dof': n - len(self.boundary),
+            'condensations': len(self.groups),
+        }
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        vector = b.ndim == 1
+        b = b.reshape(len(b), -1)
+        rhs = b[self.boundary]
+        recovered = []
+        for lu, X, I, B in self.groups:
+            m, n_i = I.shape
+            b_i = b[I]  # (members, internal DOF, right-hand sides)
+            y = lu.solve(b_i.transpose(1, 0, 2).reshape(n_i, -1))
+            recovered.append(y.reshape(n_i, m, -1).transpose(1, 0, 2))
+            condensed = np.matmul(X.T, b_i)
+            for k in range(m):
+                rhs[B[k]] -= condensed[k]
+
+        x = np.empty_like(b)
+        x_B = self.lu.solve(rhs)
+        x[self.boundary] = x_B
+        for (lu, X, I, B), y in zip(self.groups, recovered):
+            x[I] = y - np.matmul(X, x_B[B])
+        return x[:, 0] if vector else x
+
+
+class _PermutedLU:
+    """Factors of the symmetrically permuted K[perm][:, perm], solving K x = b"""
+
+    def __init__(self, lu, perm: np.ndarray):
+        self.lu = lu
+        self.perm = perm
+        self.inverse = np.argsort(perm)
+        self.nnz = lu.nnz
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        return self.lu.solve(b[self.perm])[self.inverse]
+
+
+def _pcg(A, B: np.ndarray, precondition, rtol: float = _PCG_RTOL,
+         maxiter: int = _PCG_MAXITER):
+    """
+    Preconditioned conjugate gradients for all columns of B at once
+
+    A is a sparse matrix, or a function applying one matrix per column
+    (A(X)[:, c] = A_c @ X[:, c]).
+
+    Returns:
+        (X, iterations), or (None, iterations) if any column did not
+        converge or A is not positive definite (negative curvature)
+    """
+    if not callable(A):
+        A = A.__matmul__
+    X = precondition(B)
+    R = B - A(X)
+    tol = rtol * np.maximum(np.linalg.norm(B, axis=0), np.finfo(float).tiny)
+    Z = precondition(R)
+    P = Z.copy()
+    rz = np.einsum('ij,ij->j', R, Z)
+    for iteration in range(maxiter + 1):
+        if np.all(np.linalg.norm(R, axis=0) <= tol):
+            return X, iteration
+        AP = A(P)
+        pap = np.einsum('ij,ij->j', P, AP)
+        if np.any(pap < 0):
+            return None, iteration
+        alpha = np.divide(rz, pap, out=np.zeros_like(rz), where=pap != 0)
+        X += alpha * P
+        R -= alpha * AP
+        Z = precondition(R)
+        rz_new = np.einsum('ij,ij->j', R, Z)
+        beta = np.divide(rz_new, rz, out=np.zeros_like(rz), where=rz != 0)
+        P = Z + beta * P
+        rz = rz_new
+    return None, maxiter
+
+
+def _direction_cosines(xi: np.ndarray, xj: np.ndarray) -> np.ndarray:
+    """
+    Direction cosine matrices [x; y; z] for a batch of elements,
+    following PyNite's Member3D.T() local axis conventions
+    """
+    d = xj - xi
+    L = np.linalg.norm(d, axis=1)
+    x = d / L[:, None]
+    n = len(x)
+
+    vertical = np.isclose(xi[:, 0], xj[:, 0]) & np.isclose(xi[:, 2], xj[:, 2])
+    horizontal = ~vertical & np.isclose(xi[:, 1], xj[:, 1])
+    other = ~vertical & ~horizontal
+
+    y = np.zeros((n, 3))
+    z = np.zeros((n, 3))
+
+    # Members parallel to global Y
+    up = vertical & (xj[:, 1] > xi[:, 1])
+    y[up] = (-1.0, 0.0, 0.0)
+    y[vertical & ~up] = (1.0, 0.0, 0.0)
+    z[vertical] = (0.0, 0.0, 1.0)
+
+    # Members in a plane parallel to global XZ
+    y[horizontal] = (0.0, 1.0, 0.0)
+    z_h = np.cross(x[horizontal], y[horizontal])
+    z[horizontal] = z_h / np.linalg.norm(z_h, axis=1)[:, None]
+
+    # Inclined members
+    if other.any():
+        proj = d[other].copy()
+        proj[:, 1] = 0.0
+        xo = x[other]
+        rising = xj[other, 1] > xi[other, 1]
+        z_o = np.where(rising[:, None], np.cross(proj, xo), np.cross(xo, proj))
+        z_o /= np.linalg.norm(z_o, axis=1)[:, None]
+        y_o = np.cross(z_o, xo)
+        y_o /= np.linalg.norm(y_o, axis=1)[:, None]
+        z[other] = z_o
+        y[other] = y_o
+
+    return np.stack([x, y, z], axis=1)
+
+
+def _local_stiffness(E, G, A, Iy, Iz, J, L) -> np.ndarray:
+    """Local 12x12 elastic stiffness matrices for a batch of elements"""
+    n = len(L)
+    k = np.zeros((n, 12, 12))
+
+    ea = E * A / L
+    gj = G * J / L
+    z12, z6, z4, z2 = 12 * E * Iz / L**3, 6 * E * Iz / L**2, 4 * E * Iz / L, 2 * E * Iz / L
+    y12, y6, y4, y2 = 12 * E * Iy / L**3, 6 * E * Iy / L**2, 4 * E * Iy / L, 2 * E * Iy / L
+
+    entries = {
+        (0, 0): ea, (0, 6): -ea, (6, 6): ea,
+        (3, 3): gj, (3, 9): -gj, (9, 9): gj,
+        (1, 1): z12, (1, 5): z6, (1, 7): -z12, (1, 11): z6,
+        (5, 5): z4, (5, 7): -z6, (5, 11): z2,
+        (7, 7): z12, (7, 11): -z6, (11, 11): z4,
+        (2, 2): y12, (2, 4): -y6, (2, 8): -y12, (2, 10): -y6,
+        (4, 4): y4, (4, 8): y6, (4, 10): y2,
+        (8, 8): y12, (8, 10): y6, (10, 10): y4,
+    }
+    for (r, c), value in entries.items():
+        k[:, r, c] = value
+        k[:, c, r] = value
+    return k
+
+
+def _local_mass(rho, A, Ip, L, lumped: bool = True) -> np.ndarray:
+    """
+    Local 12x12 mass matrices for a batch of elements
+
+    Lumped: half the element mass on the translations of each end.
+    Consistent: cubic (Hermitian) bending, linear axial and torsional
+    shape functions, rotary inertia from the polar moment Ip.
+    """
+    n = len(L)
+    m = np.zeros((n, 12, 12))
+    mass = rho * A * L
+    if lumped:
+        for dof in (0, 1, 2, 6, 7, 8):
+            m[:, dof, dof] = mass / 2
+        return m
+
+    c = mass / 420
+    axial = mass / 6
+    torsion = rho * Ip * L / 6
+    entries = {
+        (0, 0): 2 * axial, (0, 6): axial, (6, 6): 2 * axial,
+        (3, 3): 2 * torsion, (3, 9): torsion, (9, 9): 2 * torsion,
+        (1, 1): 156 * c, (1, 5): 22 * L * c, (1, 7): 54 * c, (1, 11): -13 * L * c,
+        (5, 5): 4 * L**2 * c, (5, 7): 13 * L * c, (5, 11): -3 * L**2 * c,
+        (7, 7): 156 * c, (7, 11): -22 * L * c, (11, 11): 4 * L**2 * c,
+        (2, 2): 156 * c, (2, 4): -22 * L * c, (2, 8): 54 * c, (2, 10): 13 * L * c,
+        (4, 4): 4 * L**2 * c, (4, 8): -13 * L * c, (4, 10): -3 * L**2 * c,
+        (8, 8): 156 * c, (8, 10): 22 * L * c, (10, 10): 4 * L**2 * c,
+    }
+    for (r, col), value in entries.items():
+        m[:, r, col] = value
+        m[:, col, r] = value
+    return m
+
+
+def _local_geometric(L, r2) -> np.ndarray:
+    """
+    Local 12x12 geometric stiffness matrices per unit axial tension
+    (PyNite Member3D.kg without end releases)
+
+    Args:
+        L: Element lengths
+        r2: Polar radius of gyration squared (Iy + Iz) / A
+    """
+    n = len(L)
+    k = np.zeros((n, 12, 12))
+    entries = {
+        (0, 0): 1.0, (0, 6): -1.0, (6, 6): 1.0,
+        (3, 3): r2, (3, 9): -r2, (9, 9): r2,
+        (1, 1): 6 / 5, (1, 5): L / 10, (1, 7): -6 / 5, (1, 11): L / 10,
+        (5, 5): 2 * L**2 / 15, (5, 7): -L / 10, (5, 11): -L**2 / 30,
+        (7, 7): 6 / 5, (7, 11): -L / 10, (11, 11): 2 * L**2 / 15,
+        (2, 2): 6 / 5, (2, 4): -L / 10, (2, 8): -6 / 5, (2, 10): -L / 10,
+        (4, 4): 2 * L**2 / 15, (4, 8): L / 10, (4, 10): -L**2 / 30,
+        (8, 8): 6 / 5, (8, 10): L / 10, (10, 10): 2 * L**2 / 15,
+    }
+    for (r, c), value in entries.items():
+        k[:, r, c] = value / L
+        k[:, c, r] = value / L
+    return k
+
+
+def _block_diag(R: np.ndarray) -> np.ndarray:
+    """12x12 transformation matrices from 3x3 direction cosines"""
+    T = np.zeros((len(R), 12, 12))
+    for b in range(4):
+        T[:, 3 * b:3 * b + 3, 3 * b:3 * b + 3] = R
+    return T
+
+
+def _to_global(k_local: np.ndarray, R: np.ndarray) -> np.ndarray:
+    """Global element stiffness T^T k T, computed on 3x3 blocks"""
+    n = len(R)
+    k4 = k_local.reshape(n, 4, 3, 4, 3)
+    kg = np.einsum('eji,eajbk,ekl->eaibl', R, k4, R, optimize=True)
+    return kg.reshape(n, 12, 12)
+
+
+def _element_dofs(elem_i: np.ndarray, elem_j: np.ndarray) -> np.ndarray:
+    """Global DOF numbers (n_elements, 12) of each element"""
+    local = np.arange(DOF_PER_NODE)
+    return np.hstack([elem_i[:, None] * DOF_PER_NODE + local,
+                      elem_j[:, None] * DOF_PER_NODE + local])
+
+
+def _fixed_end_reactions(elem_w: np.ndarray, L: np.ndarray) -> np.ndarray:
+    """
+    Local fixed end reactions for full-length trapezoidal loads
+    (PyNite FER_LinLoad / FER_AxialLinLoad with x1=0, x2=L)
+
+    Args:
+        elem_w: (n_cases, n_elements, 3, 2) local load intensities at i and j
+        L: (n_elements,) element lengths
+    """
+    fer = np.zeros(elem_w.shape[:2] + (12,))
+    px, wy, wz = elem_w[..., 0, :], elem_w[..., 1, :], elem_w[..., 2, :]
+
+    fer[..., 0] = -(2 * px[..., 0] + px[..., 1]) * L / 6
+    fer[..., 6] = -(px[..., 0] + 2 * px[..., 1]) * L / 6
+
+    fer[..., 1] = -(7 * wy[..., 0] + 3 * wy[..., 1]) * L / 20
+    fer[..., 7] = -(3 * wy[..., 0] + 7 * wy[..., 1]) * L / 20
+    fer[..., 5] = -(3 * wy[..., 0] + 2 * wy[..., 1]) * L**2 / 60
+    fer[..., 11] = (2 * wy[..., 0] + 3 * wy[..., 1]) * L**2 / 60
+
+    fer[..., 2] = -(7 * wz[..., 0] + 3 * wz[..., 1]) * L / 20
+    fer[..., 8] = -(3 * wz[..., 0] + 7 * wz[..., 1]) * L / 20
+    fer[..., 4] = (3 * wz[..., 0] + 2 * wz[..., 1]) * L**2 / 60
+    fer[..., 10] = -(2 * wz[..., 0] + 3 * wz[..., 1]) * L**2 / 60
+    return fer
+
+
+def _point_fixed_end_reactions(P: np.ndarray, a: np.ndarray, L: np.ndarray) -> np.ndarray:
+    """
+    Local fixed end reactions for point loads (PyNite FER_PtLoad)
+
+    Args:
+        P: (n, 3) local x/y/z load components
+        a: (n,) load position from the element start
+        L: (n,) element lengths
+    """
+    b = L - a
+    px, py, pz = P.T
+    fer = np.zeros((len(P), 12))
+    fer[:, 0] = -px * b / L
+    fer[:, 6] = -px * a / L
+
+    fer[:, 1] = -py * b**2 * (L + 2 * a) / L**3
+    fer[:, 7] = -py * a**2 * (L + 2 * b) / L**3
+    fer[:, 5] = -py * a * b**2 / L**2
+    fer[:, 11] = py * a**2 * b / L**2
+
+    fer[:, 2] = -pz * b**2 * (L + 2 * a) / L**3
+    fer[:, 8] = -pz * a**2 * (L + 2 * b) / L**3
+    fer[:, 4] = pz * a * b**2 / L**2
+    fer[:, 10] = -pz * a**2 * b / L**2
+    return fer
+
+
+def _force_selector(component: str, x: float) -> np.ndarray:
+    """
+    Weights c of the element end forces f giving an internal force at x
+    (c·f, see force_recovery) when no load acts between the start and x
+    """
+    c = np.zeros(12)
+    if component == 'moment_y':
+        c[4], c[2] = -1.0, -x
+    elif component == 'moment_z':
+        c[5], c[1] = 1.0, -x
+    else:
+        c[COMPONENTS.index(component)] = 1.0
+    return c
+
+
+def _diaphragm_constraint(coords: np.ndarray, fixed: np.ndarray, diaphragms: Dict[float, int],
+                          node_names: List[str]) -> sp.csc_matrix:
+    """
+    Rigid diaphragm transformation of the free DOF, U_free = T q
+
+    A node at (x, y) on the diaphragm of master m moves with it in plane:
+    DX = DX_m - (y - y_m) RZ_m, DY = DY_m + (x - x_m) RZ_m and RZ = RZ_m.
+    All other free DOF are kept as they are.
+
+    Args:
+        coords: (n_nodes, 3) node coordinates
+        fixed: (n_dof,) restrained DOF
+        diaphragms: Level Z -> master node index
+        node_names: Node names (for error messages)
+
+    Returns:
+        Sparse (n_free, n_reduced) matrix
+    """
+    in_plane = np.array([0, 1, 5])
+    master_of = np.full(len(coords), -1)
+    for Z, master in diaphragms.items():
+        level = np.flatnonzero(np.abs(coords[:, 2] - Z) <= _COORD_QUANTUM)
+        restrained = level[fixed.reshape(-1, DOF_PER_NODE)[level][:, in_plane].any(axis=1)]
+        if len(restrained):
+            raise ValueError(f"Node '{node_names[restrained[0]]}' of the diaphragm at Z = {Z:g} "
+                             f"is restrained in DX, DY or RZ")
+        master_of[level] = master
+        master_of[master] = -1
+
+    slaves = np.flatnonzero(master_of >= 0)
+    eliminated = np.zeros(len(fixed), dtype=bool)
+    eliminated[(slaves[:, None] * DOF_PER_NODE + in_plane).ravel()] = True
+    free_index = np.cumsum(~fixed) - 1
+    reduced_index = np.cumsum(~fixed & ~eliminated) - 1
+
+    kept = np.flatnonzero(~fixed & ~eliminated)
+    masters = master_of[slaves] * DOF_PER_NODE
+    dx, dy = (coords[slaves, :2] - coords[master_of[slaves], :2]).T
+    slave_dof = slaves * DOF_PER_NODE
+    rows = [kept, slave_dof, slave_dof, slave_dof + 1, slave_dof + 1, slave_dof + 5]
+    cols = [kept, masters, masters + 5, masters + 1, masters + 5, masters + 5]
+    data = [np.ones(len(kept)), np.ones(len(slaves)), -dy, np.ones(len(slaves)), dx,
+            np.ones(len(slaves))]
+    return sp.csc_matrix(
+        (np.concatenate(data), (free_index[np.concatenate(rows)], reduced_index[np.concatenate(cols)])),
+        shape=(int((~fixed).sum()), len(kept)))
+
+
+def _split_members(coords: np.ndarray, member_nodes: np.ndarray):
+    """
+    Subdivide physical members at the nodes lying on them
+
+    Axis-aligned members (the usual case in floor grids) are handled in one
+    vectorized pass by bucketing nodes on quantized grid lines; inclined
+    members fall back to a per-member projection test.
+
+    Returns:
+        elem_member, elem_i, elem_j, elem_x0 sorted by member, then by
+        distance of the element start from the member's i-node
+    """
+    n_members = len(member_nodes)
+    mi, mj = member_nodes[:, 0], member_nodes[:, 1]
+    d = coords[mj] - coords[mi]
+    L = np.linalg.norm(d, axis=1)
+    if np.any(L == 0):
+        raise ValueError("Zero-length member in model")
+
+    q = np.round(coords / _COORD_QUANTUM).astype(np.int64)
+    dq = q[mj] - q[mi]
+    aligned_axis = np.full(n_members, -1)
+    for axis in range(3):
+        others = [a for a in range(3) if a != axis]
+        on_axis = (dq[:, axis] != 0) & np.all(dq[:, others] == 0, axis=1)
+        aligned_axis[on_axis] = axis
+
+    seq_member, seq_node = [], []
+
+    for axis in range(3):
+        sel = np.flatnonzero(aligned_axis == axis)
+        if len(sel) == 0:
+            continue
+        others = [a for a in range(3) if a != axis]
+
+        # Sort nodes by (grid line, coordinate along the line)
+        _, line = np.unique(q[:, others], axis=0, return_inverse=True)
+        line = line.ravel()
+        order = np.lexsort((q[:, axis], line))
+        span = q[:, axis].max() - q[:, axis].min() + 1
+        key = line[order] * span + (q[order, axis] - q[:, axis].min())
+
+        a = q[mi[sel], axis]
+        b = q[mj[sel], axis]
+        base = line[mi[sel]] * span - q[:, axis].min()
+        lo = np.searchsorted(key, base + np.minimum(a, b), side='right')
+        hi = np.searchsorted(key, base + np.maximum(a, b), side='left')
+        count = hi - lo
+        forward = b > a
+
+        # Node sequence per member: i-node, internal nodes, j-node
+        length = count + 2
+        member_rep = np.repeat(sel, length)
+        offsets = np.repeat(np.cumsum(length) - length, length)
+        pos = np.arange(length.sum()) - offsets
+        lo_r, hi_r = np.repeat(lo, length), np.repeat(hi, length)
+        fwd_r, cnt_r = np.repeat(forward, length), np.repeat(count, length)
+        idx = np.where(fwd_r, lo_r + pos - 1, hi_r - pos)
+        idx = np.clip(idx, 0, len(order) - 1)
+        nodes = order[idx]
+        nodes = np.where(pos == 0, mi[member_rep], nodes)
+        nodes = np.where(pos == cnt_r + 1, mj[member_rep], nodes)
+
+        seq_member.append(member_rep)
+        seq_node.append(nodes)
+
+    # Inclined members: project every node onto the member axis
+    for m in np.flatnonzero(aligned_axis < 0):
+        u = d[m] / L[m]
+        rel = coords - coords[mi[m]]
+        t = rel @ u
+        perp = np.linalg.norm(rel - np.outer(t, u), axis=1)
+        inside = (t > 1e-9) & (t < L[m] - 1e-9) & (perp <= 1e-9 * (1 + L[m]))
+        internal = np.flatnonzero(inside)
+        internal = internal[np.argsort(t[internal])]
+        nodes = np.concatenate([[mi[m]], internal, [mj[m]]])
+        seq_member.append(np.full(len(nodes), m))
+        seq_node.append(nodes)
+
+    seq_member = np.concatenate(seq_member)
+    seq_node = np.concatenate(seq_node)
+
+    # Consecutive pairs within the same member form the elements
+    same = seq_member[1:] == seq_member[:-1]
+    elem_member = seq_member[:-1][same]
+    elem_i = seq_node[:-1][same]
+    elem_j = seq_node[1:][same]
+    elem_x0 = np.linalg.norm(coords[elem_i] - coords[mi[elem_member]], axis=1)
+
+    order = np.lexsort((elem_x0, elem_member))
+    return elem_member[order], elem_i[order], elem_j[order], elem_x0[order]
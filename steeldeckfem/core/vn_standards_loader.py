@@ -2,11 +2,270 @@
 """
 Vietnamese Construction Standards Data Loader
 Loads and provides access to TCVN standard data from JSON file
+
+Interpolated tables (wind exposure factor Ce against height, two-way slab
+moment coefficients against Ly/Lx, bearing capacity factors against the
+friction angle) are compiled once at load into sorted arrays and evaluated
+with searchsorted, for scalars and arrays alike.
+
+The parsed data and the compiled tables are kept in a binary snapshot next
+to the JSON file (or in a per-user cache directory when that is read-only),
+keyed by its modification time and size. Later starts
+memory-map the snapshot instead of parsing the JSON; the table arrays stay
+read-only views of the mapped file, so all processes of a pool share their
+pages.
 """
 
+import hashlib
 import json
+import mmap
 import os
-from typing import Dict, Any
+import pickle
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from steeldeckfem.core.analysis_cache import default_cache_dir
+
+# Bump when the snapshot layout or the compiled tables change
+SNAPSHOT_VERSION = 1
+
+_SNAPSHOT_MAGIC = b'VNSNAP\x00\x01'
+_SNAPSHOT_ALIGN = 64
+
+# The snapshot warning is printed once per process
+_snapshot_warned = False
+
+
+@dataclass(frozen=True)
+class LookupTable:
+    """
+    Tabulated values against one sorted argument
+    
+    Arrays:
+        x:      (n,) arguments, ascending
+        values: (n, n_columns) tabulated values, one column per name in
+                `columns`
+    """
+    x: np.ndarray
+    values: np.ndarray
+    columns: Tuple[str, ...]
+    
+    def __call__(self, x) -> np.ndarray:
+        """
+        Linearly interpolated values, constant beyond the table ends
+        
+        Args:
+            x: Arguments (any shape)
+        
+        Returns:
+            Array x.shape + (n_columns,)
+        """
+        x = np.clip(np.asarray(x, dtype=np.float64), self.x[0], self.x[-1])
+        if len(self.x) == 1:
+            return np.broadcast_to(self.values[0], x.shape + self.values.shape[1:]).copy()
+        i = np.clip(np.searchsorted(self.x, x, side='right') - 1, 0, len(self.x) - 2)
+        w = ((x - self.x[i]) / (self.x[i + 1] - self.x[i]))[..., None]
+        return self.values[i] * (1 - w) + self.values[i + 1] * w
+    
+    def column(self, name: str, x) -> np.ndarray:
+        """Interpolated values of one column (shape of x)"""
+        return self(x)[..., self.columns.index(name)]
+    
+    @classmethod
+    def from_keys(cls, rows: Dict[str, Any], parse) -> 'LookupTable':
+        """
+        Table from {key: value or {column: value}} with arguments parsed
+        from the keys (keys parse() rejects with ValueError are skipped)
+        """
+        parsed = []
+        for key, row in rows.items():
+            try:
+                parsed.append((parse(key), row))
+            except (ValueError, IndexError):
+                continue
+        parsed.sort(key=lambda item: item[0])
+        if not parsed:
+            raise ValueError("No tabulated values")
+        first = parsed[0][1]
+        columns = tuple(first) if isinstance(first, dict) else ('value',)
+        values = [[row[c] for c in columns] if isinstance(row, dict) else [row]
+                  for _, row in parsed]
+        return cls(np.array([x for x, _ in parsed], dtype=np.float64),
+                   np.array(values, dtype=np.float64), columns)
+
+
+def _ratio_from_key(key: str) -> float:
+    """'Ly_Lx_1_25' -> 1.25"""
+    parts = key.split('_')
+    return float(parts[2] + '.' + parts[3])
+
+
+def _height_from_key(key: str) -> float:
+    """'10m' -> 10.0"""
+    return float(key.replace('m', ''))
+
+
+def _phi_from_key(key: str) -> float:
+    """'phi_30' -> 30.0"""
+    return float(key.split('_')[1])
+
+
+def _compile_tables(data: Dict[str, Any]) -> Dict[Any, LookupTable]:
+    """Interpolation tables of the standards data"""
+    tables = {}
+    slab_data = data['slabDesign']['twoWaySlabMomentCoefficients']['coefficients']
+    for panel in ('interiorPanel', 'cornerPanel'):
+        tables['slab', panel] = LookupTable.from_keys(slab_data[panel], _ratio_from_key)
+    for edges, rows in slab_data['edgePanel'].items():
+        tables['slab', f'edgePanel_{edges}'] = LookupTable.from_keys(rows, _ratio_from_key)
+    
+    for terrain, terrain_data in data['windLoads']['terrainFactors'].items():
+        if isinstance(terrain_data, dict) and 'heights' in terrain_data:
+            tables['wind', terrain] = LookupTable.from_keys(terrain_data['heights'], _height_from_key)
+    
+    factors_data = data['geotechnicalEngineering']['bearingCapacity']['bearingCapacityFactors']
+    tables['bearing'] = LookupTable.from_keys(factors_data, _phi_from_key)
+    return tables
+
+
+def snapshot_path(json_path: os.PathLike, snapshot_dir: os.PathLike = None) -> Path:
+    """
+    Binary snapshot file of a standards JSON file: next to it, or in
+    snapshot_dir under a name unique to the JSON file's location
+    """
+    json_path = Path(json_path)
+    if snapshot_dir is None:
+        return json_path.with_name(json_path.stem + '.snapshot')
+    digest = hashlib.sha1(str(json_path.resolve()).encode('utf-8')).hexdigest()[:16]
+    return Path(snapshot_dir) / f'{json_path.stem}-{digest}.snapshot'
+
+
+def default_snapshot_dir() -> Path:
+    """Per-user snapshot directory, used when the JSON file's directory is read-only"""
+    return default_cache_dir().parent / 'standards'
+
+
+def load_standards(json_path: os.PathLike, snapshot: bool = True,
+                   snapshot_dir: os.PathLike = None) -> Tuple[Dict[str, Any], Dict]:
+    """
+    Standards data and compiled tables of a JSON file
+    
+    Args:
+        json_path: Standards JSON file
+        snapshot: Use a snapshot when it matches the file's modification
+                  time and size, else parse the JSON and (re)write the
+                  snapshot
+        snapshot_dir: Directory of the snapshot (default: next to the JSON
+                      file, falling back to default_snapshot_dir() when that
+                      directory is not writable)
+    
+    Returns:
+        (data, tables)
+    """
+    json_path = Path(json_path)
+    stat = json_path.stat()
+    key = (SNAPSHOT_VERSION, stat.st_mtime_ns, stat.st_size)
+    if snapshot_dir is None:
+        paths = [snapshot_path(json_path), snapshot_path(json_path, default_snapshot_dir())]
+    else:
+        paths = [snapshot_path(json_path, snapshot_dir)]
+    if snapshot:
+        for path in paths:
+            loaded = _read_snapshot(path, key)
+            if loaded is not None:
+                return loaded
+    
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    tables = _compile_tables(data)
+    if snapshot:
+        errors = []
+        for path in paths:
+            try:
+                _write_snapshot(path, key, (data, tables))
+                break
+            except OSError as e:
+                errors.append(e)
+        else:
+            _warn_once(f"⚠️  Could not write standards snapshot: {errors[-1]}")
+    return data, tables
+
+
+def _warn_once(message: str):
+    global _snapshot_warned
+    if not _snapshot_warned:
+        _snapshot_warned = True
+        print(message)
+
+
+def _write_snapshot(path: Path, key: Tuple, value):
+    """
+    Write a snapshot atomically (OSError when the directory is not writable)
+
+    Layout: magic | pickle payload | aligned array buffers | header pickle
+    | header length; the arrays are pickled out of band (protocol 5)
+    """
+    buffers = []
+    payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_SNAPSHOT_MAGIC)
+            payload_at = f.tell()
+            f.write(payload)
+            extents = []
+            for buffer in buffers:
+                raw = buffer.raw()
+                f.write(b'\x00' * (-f.tell() % _SNAPSHOT_ALIGN))
+                extents.append((f.tell(), raw.nbytes))
+                f.write(raw)
+            header = pickle.dumps({'key': key, 'payload': (payload_at, len(payload)),
+                                   'buffers': extents})
+            f.write(header)
+            f.write(struct.pack('<Q', len(header)))
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _read_snapshot(path: Path, key: Tuple) -> Optional[Tuple[Dict[str, Any], Dict]]:
+    """Snapshot contents, or None when missing, stale or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    view, buffers = None, []
+    try:
+        size, = struct.unpack('<Q', mapped[-8:])
+        header = pickle.loads(mapped[-8 - size:-8])
+        if mapped[:len(_SNAPSHOT_MAGIC)] != _SNAPSHOT_MAGIC or header['key'] != key:
+            mapped.close()
+            return None
+        view = memoryview(mapped)
+        buffers = [view[start:start + n] for start, n in header['buffers']]
+        start, n = header['payload']
+        # Arrays become read-only views of the mapping, which they keep open
+        return pickle.loads(view[start:start + n], buffers=buffers)
+    except Exception:
+        # Truncated or written by an incompatible version
+        try:
+            for buffer in buffers:
+                buffer.release()
+            if view is not None:
+                view.release()
+            mapped.close()
+        except BufferError:
+            pass
+        return None
 
 
 class VNStandardsLoader:
@@ -15,6 +274,13 @@ class VNStandardsLoader:
     """
     _instance = None
     _data = None
+    _tables = None
+    
+    # Read and write the binary snapshot of the JSON file, in snapshot_dir
+    # when set (see load_standards; STEELDECKFEM_SNAPSHOT_DIR sets it for
+    # every process)
+    use_snapshot = True
+    snapshot_dir = os.environ.get('STEELDECKFEM_SNAPSHOT_DIR') or None
     
     def __new__(cls):
         if cls._instance is None:
@@ -25,8 +291,16 @@ class VNStandardsLoader:
         if self._data is None:
             self._load_data()
     
+    @classmethod
+    def from_file(cls, json_path: os.PathLike, snapshot: bool = True,
+                  snapshot_dir: os.PathLike = None) -> 'VNStandardsLoader':
+        """Standalone loader (not the shared instance) of a standards file"""
+        loader = object.__new__(cls)
+        loader._data, loader._tables = load_standards(json_path, snapshot, snapshot_dir)
+        return loader
+    
     def _load_data(self):
-        """Load JSON data from file"""
+        """Load JSON data from file (through its snapshot when current)"""
         # Get the directory where this file is located
         current_dir = os.path.dirname(os.path.abspath(__file__))
         
@@ -36,8 +310,8 @@ class VNStandardsLoader:
         json_path = os.path.join(project_root, 'vn_construction_standards.json')
         
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                self._data = json.load(f)
+            self._data, self._tables = load_standards(json_path, self.use_snapshot,
+                                                     self.snapshot_dir)
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"Could not find vn_construction_standards.json at {json_path}. "
@@ -53,72 +327,72 @@ class VNStandardsLoader:
         Args:
             panel_type: 'interiorPanel', 'edgePanel_oneEdgeContinuous', 
                        'edgePanel_twoEdgesContinuous', 'cornerPanel'
-            ratio: Ly/Lx ratio
+            ratio: Ly/Lx ratio (interpolated between the tabulated ratios)
         
         Returns:
             Dictionary with mx_negative, mx_positive, my_negative, my_positive
         """
-        slab_data = self._data['slabDesign']['twoWaySlabMomentCoefficients']['coefficients']
-        
-        # Map panel type to data structure
-        if 'interior' in panel_type.lower():
-            coeffs = slab_data['interiorPanel']
-        elif 'corner' in panel_type.lower():
-            coeffs = slab_data['cornerPanel']
-        elif 'edge' in panel_type.lower():
-            if 'one' in panel_type.lower():
-                coeffs = slab_data['edgePanel']['oneEdgeContinuous']
-            else:
-                coeffs = slab_data['edgePanel']['twoEdgesContinuous']
-        else:
-            coeffs = slab_data['interiorPanel']
+        coeffs = self.two_way_slab_coefficients(panel_type, ratio)
+        return {name: float(value) for name, value in coeffs.items()}
+    
+    def two_way_slab_coefficients(self, panel_type: str, ratios) -> Dict[str, np.ndarray]:
+        """
+        Moment coefficients of two-way slabs, interpolated in Ly/Lx
         
-        # Find closest ratio
-        ratio_key = self._find_closest_ratio_key(ratio, coeffs)
+        Args:
+            panel_type: As for get_two_way_slab_coefficients
+            ratios: Ly/Lx ratios (any shape); outside the table the end
+                    values apply
         
-        return coeffs[ratio_key]
+        Returns:
+            {'mx_negative': array, ...} with the shape of ratios
+        """
+        table = self._tables['slab', self._slab_panel(panel_type)]
+        values = table(ratios)
+        return {name: values[..., c] for c, name in enumerate(table.columns)}
     
-    def _find_closest_ratio_key(self, ratio: float, coeffs: dict) -> str:
-        """Find the closest ratio key in the coefficients dictionary"""
-        # Extract ratios from keys like "Ly_Lx_1_5" -> 1.5
-        available_ratios = {}
-        for key in coeffs.keys():
-            parts = key.split('_')
-            if len(parts) >= 4:
-                try:
-                    ratio_val = float(parts[2] + '.' + parts[3])
-                    available_ratios[ratio_val] = key
-                except ValueError:
-                    continue
-        
-        if not available_ratios:
-            return list(coeffs.keys())[0]
-        
-        # Find closest ratio
-        closest = min(available_ratios.keys(), key=lambda x: abs(x - ratio))
-        return available_ratios[closest]
+    @staticmethod
+    def _slab_panel(panel_type: str) -> str:
+        """Table of a panel type"""
+        panel_type = panel_type.lower()
+        if 'interior' in panel_type:
+            return 'interiorPanel'
+        if 'corner' in panel_type:
+            return 'cornerPanel'
+        if 'edge' in panel_type:
+            if 'one' in panel_type:
+                return 'edgePanel_oneEdgeContinuous'
+            return 'edgePanel_twoEdgesContinuous'
+        return 'interiorPanel'
     
     def get_bearing_capacity_factors(self, phi_degrees: float) -> Dict[str, float]:
         """
         Get Nc, Nq, Nγ factors for given friction angle
         
         Args:
-            phi_degrees: Friction angle in degrees
+            phi_degrees: Friction angle in degrees (interpolated between the
+                         tabulated angles)
         
         Returns:
             Dictionary with Nc, Nq, Nγ
         """
-        factors_data = self._data['geotechnicalEngineering']['bearingCapacity']['bearingCapacityFactors']
+        factors = self.bearing_capacity_factors(phi_degrees)
+        return {name: float(value) for name, value in factors.items()}
+    
+    def bearing_capacity_factors(self, phi_degrees) -> Dict[str, np.ndarray]:
+        """
+        Nc, Nq, Nγ interpolated in the friction angle
         
-        # Find closest phi value
-        phi_rounded = round(phi_degrees / 5) * 5  # Round to nearest 5
-        phi_key = f'phi_{phi_rounded}'
+        Args:
+            phi_degrees: Friction angles in degrees (any shape); outside
+                         the table the end values apply
         
-        if phi_key in factors_data:
-            return factors_data[phi_key]
-        else:
-            # Default to phi_30 if not found
-            return factors_data.get('phi_30', {'Nc': 30.14, 'Nq': 18.40, 'Nγ': 18.08})
+        Returns:
+            {'Nc': array, 'Nq': array, 'Nγ': array} with the shape of phi_degrees
+        """
+        table = self._tables['bearing']
+        values = table(phi_degrees)
+        return {name: values[..., c] for c, name in enumerate(table.columns)}
     
     def get_vietnamese_soil_properties(self, soil_type: str) -> Dict[str, Any]:
         """
@@ -196,34 +470,21 @@ class VNStandardsLoader:
         Returns:
             Ce factor
         """
-        terrain_data = self._data['windLoads']['terrainFactors'][terrain_type]
-        heights = terrain_data['heights']
-        
-        # Find closest height
-        height_str = str(int(height_m)) + 'm'
-        
-        if height_str in heights:
-            return heights[height_str]
-        
-        # Interpolate if exact height not found
-        available_heights = sorted([int(h.replace('m', '')) for h in heights.keys()])
-        
-        if height_m <= available_heights[0]:
-            return heights[f'{available_heights[0]}m']
-        if height_m >= available_heights[-1]:
-            return heights[f'{available_heights[-1]}m']
-        
-        # Linear interpolation
-        for i in range(len(available_heights) - 1):
-            h1 = available_heights[i]
-            h2 = available_heights[i + 1]
-            if h1 <= height_m <= h2:
-                Ce1 = heights[f'{h1}m']
-                Ce2 = heights[f'{h2}m']
-                Ce = Ce1 + (Ce2 - Ce1) * (height_m - h1) / (h2 - h1)
-                return Ce
-        
-        return 1.0  # Fallback
+        return float(self.wind_terrain_factors(terrain_type, height_m))
+    
+    def wind_terrain_factors(self, terrain_type: str, heights_m) -> np.ndarray:
+        """
+        Wind terrain exposure factors Ce, interpolated in height
+        
+        Args:
+            terrain_type: 'terrainA', 'terrainB', 'terrainC', 'terrainD'
+            heights_m: Heights above ground (m, any shape); below and above
+                       the table the end values apply
+        
+        Returns:
+            Ce with the shape of heights_m
+        """
+        return self._tables['wind', terrain_type].column('value', heights_m)
     
     def get_wind_aerodynamic_coefficient(self, element_type: str, **kwargs) -> float:
         """
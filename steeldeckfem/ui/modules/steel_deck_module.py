@@ -36,7 +36,10 @@ except ImportError:
 # Advanced features
 try:
     from steeldeckfem.core.fem_analyzer import FloorSystemFEMAnalyzer
+    from steeldeckfem.core.analysis_cache import get_analysis_cache
+    from steeldeckfem.core.design_checks import governing_check
     from steeldeckfem.core.plotly_charts import StructuralDiagramCreator
+    from steeldeckfem.core.profiling import RunProfiler, format_profile
     HAS_ADVANCED_FEATURES = True
 except ImportError:
     HAS_ADVANCED_FEATURES = False
@@ -47,14 +50,17 @@ class FEMAnalysisThread(QThread):
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
     
-    def __init__(self, layout, loads):
+    def __init__(self, layout, loads, engine='pynite', profile=False):
         super().__init__()
         self.layout = layout
         self.loads = loads
+        self.engine = engine
+        self.profile = profile
         
     def run(self):
         try:
-            analyzer = FloorSystemFEMAnalyzer()
+            analyzer = FloorSystemFEMAnalyzer(engine=self.engine, cache=get_analysis_cache(),
+                                              profile=self.profile)
             analyzer.build_fem_model(self.layout, self.loads)
             results = analyzer.run_analysis(layout=self.layout)
             results['html_report'] = analyzer.generate_fem_report()
@@ -213,6 +219,16 @@ class SteelDeckModule(QWidget):
         gb_loads.setLayout(form_loads)
         layout.addWidget(gb_loads)
         
+        # FEM engine
+        form_engine = QFormLayout()
+        self.cbo_engine = QComboBox()
+        self.cbo_engine.addItem("PyNite", "pynite")
+        self.cbo_engine.addItem("Sparse (nhanh - lưới lớn)", "sparse")
+        form_engine.addRow("Bộ giải FEM:", self.cbo_engine)
+        self.chk_profile = QCheckBox("⏱ Đo thời gian / bộ nhớ từng bước")
+        form_engine.addRow(self.chk_profile)
+        layout.addLayout(form_engine)
+        
         # Calculate Button
         btn_calc = QPushButton("⚡ PHÂN TÍCH FEM")
         btn_calc.setStyleSheet("""
@@ -441,9 +457,10 @@ class SteelDeckModule(QWidget):
                         
                         # Determine color based on stress check
                         col_name = f"Col_{i}_{j}"
-                        if col_name in design_checks:
-                            status = design_checks[col_name]['status']
-                            unity = design_checks[col_name]['unity_check']
+                        check = governing_check(design_checks, col_name) if design_checks else None
+                        if check is not None:
+                            status = check['status']
+                            unity = check['unity_check']
                             
                             if status == 'KHÔNG ĐẠT':
                                 color = '#e74c3c'  # Red for failed
@@ -481,9 +498,10 @@ class SteelDeckModule(QWidget):
                         
                         # Check stress status
                         beam_name = f"MB_Y{j}"
-                        if beam_name in design_checks:
-                            status = design_checks[beam_name]['status']
-                            unity = design_checks[beam_name]['unity_check']
+                        check = governing_check(design_checks, beam_name) if design_checks else None
+                        if check is not None:
+                            status = check['status']
+                            unity = check['unity_check']
                             if status == 'KHÔNG ĐẠT':
                                 color = '#e74c3c'  # Red
                             elif unity > 0.8:
@@ -504,9 +522,10 @@ class SteelDeckModule(QWidget):
                         z_line = np.ones_like(y_line) * H
                         
                         beam_name = f"MB_X{i}"
-                        if beam_name in design_checks:
-                            status = design_checks[beam_name]['status']
-                            unity = design_checks[beam_name]['unity_check']
+                        check = governing_check(design_checks, beam_name) if design_checks else None
+                        if check is not None:
+                            status = check['status']
+                            unity = check['unity_check']
                             if status == 'KHÔNG ĐẠT':
                                 color = '#e74c3c'
                             elif unity > 0.8:
@@ -663,7 +682,8 @@ class SteelDeckModule(QWidget):
             self.layout_data = layout
             
             # Run analysis in background thread
-            self.fem_thread = FEMAnalysisThread(layout, loads)
+            self.fem_thread = FEMAnalysisThread(layout, loads, self.cbo_engine.currentData(),
+                                                self.chk_profile.isChecked())
             self.fem_thread.finished.connect(self.on_fem_complete)
             self.fem_thread.error.connect(self.on_fem_error)
             self.fem_thread.start()
@@ -683,6 +703,7 @@ class SteelDeckModule(QWidget):
         # Update Plotly tab
         if HAS_ADVANCED_FEATURES:
             self.update_plotly_diagrams()
+            self.show_profile()
         
         # Refresh 3D model with stress-based coloring
         self.draw_3d_model()
@@ -714,7 +735,10 @@ class SteelDeckModule(QWidget):
             return
         
         try:
-            creator = StructuralDiagramCreator()
+            profile = self.chk_profile.isChecked()
+            creator = StructuralDiagramCreator(RunProfiler(trace_memory=profile,
+                                                           count_objects=profile))
+            self.dashboard_profiler = creator.profiler
             
             # Create comprehensive dashboard
             fig = creator.create_complete_analysis_dashboard(self.fem_results, self.layout_data)
@@ -818,6 +842,21 @@ class SteelDeckModule(QWidget):
             print(f"Plotly error: {e}")
             print(traceback.format_exc())
     
+    def show_profile(self):
+        """Show the FEM and dashboard phase timings in the status bar"""
+        profile = self.fem_results.get('profile')
+        if not self.chk_profile.isChecked() or not profile:
+            return
+        text = f"⏱ FEM: {format_profile(profile)}"
+        dashboard = getattr(self, 'dashboard_profiler', None)
+        if dashboard is not None and dashboard.phases:
+            text += f"  ·  Plotly: {dashboard.summary(top=1)}"
+        window = self.window()
+        if hasattr(window, 'statusBar'):
+            window.statusBar().showMessage(text)
+        else:
+            self.setToolTip(text)
+    
     def export_plotly_html(self):
         """Export Plotly diagrams to HTML"""
         if self.fem_results and HAS_ADVANCED_FEATURES:
@@ -5,6 +5,18 @@ Pytest configuration and fixtures for VietStruct FEM tests
 import pytest
 from types import SimpleNamespace
 from steeldeckfem.core.data_models import Section, Material, GeometryParams, WindParams
+from steeldeckfem.core.vn_standards_loader import VNStandardsLoader
+
+
+@pytest.fixture(autouse=True, scope='session')
+def standards_snapshot_dir(tmp_path_factory):
+    """Keep the standards snapshot out of the source tree (also in subprocesses)"""
+    path = tmp_path_factory.mktemp('standards')
+    mp = pytest.MonkeyPatch()
+    mp.setenv('STEELDECKFEM_SNAPSHOT_DIR', str(path))
+    mp.setattr(VNStandardsLoader, 'snapshot_dir', path)
+    yield path
+    mp.undo()
 
 
 @pytest.fixture
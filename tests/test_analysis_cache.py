@@ -0,0 +1,128 @@
+"""
+Unit tests for the layout-hash analysis cache
+"""
+
+import copy
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer
+from steeldeckfem.core.analysis_cache import AnalysisCache, analysis_key
+
+
+class TestAnalysisKey:
+    """Tests for the stable layout hash"""
+    
+    def test_key_is_stable(self, simple_layout, simple_loads):
+        """Test that equal inputs give equal keys, independent of number types"""
+        other = copy.deepcopy(simple_layout)
+        other.length = int(other.length)
+        assert analysis_key(simple_layout, simple_loads, engine='sparse') == \
+            analysis_key(other, dict(reversed(list(simple_loads.items()))), engine='sparse')
+    
+    def test_key_changes_with_inputs(self, simple_layout, simple_loads):
+        """Test that sections, loads and options are part of the key"""
+        key = analysis_key(simple_layout, simple_loads, engine='sparse')
+        resized = copy.deepcopy(simple_layout)
+        resized.main_beam_spec.ix *= 1.1
+        assert analysis_key(resized, simple_loads, engine='sparse') != key
+        assert analysis_key(simple_layout, dict(simple_loads, live_load=500), engine='sparse') != key
+        assert analysis_key(simple_layout, simple_loads, engine='pynite') != key
+
+
+class TestAnalysisCache:
+    """Tests for the LRU and on-disk store"""
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted from memory"""
+        cache = AnalysisCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1 and cache.get('c') == 3
+    
+    def test_memory_byte_cap(self, tmp_path):
+        """Test that entries are evicted by array size, not count"""
+        cache = AnalysisCache(max_memory_bytes=2000, cache_dir=tmp_path)
+        cache.put('a', {'forces': np.zeros(100)})
+        cache.put('b', {'forces': np.zeros(100)})
+        assert len(cache) == 2 and cache.memory_bytes == 1600 + 2 * len('forces')
+        cache.put('c', {'forces': np.zeros(100)})
+        assert len(cache) == 2 and 'a' not in cache._memory
+        
+        # Larger than the cap: kept on disk only
+        cache.put('big', {'forces': np.zeros(1000)})
+        assert 'big' not in cache._memory and cache.memory_bytes <= 2000
+        assert cache.get('big')['forces'].shape == (1000,)
+    
+    def test_disk_store_survives_new_instance(self, tmp_path):
+        """Test that entries are reloaded from disk by a fresh cache"""
+        AnalysisCache(cache_dir=tmp_path).put('key', {'value': np.arange(3)})
+        cache = AnalysisCache(cache_dir=tmp_path)
+        assert cache.get('key')['value'].tolist() == [0, 1, 2]
+        assert cache.hits == 1
+    
+    def test_corrupt_file_is_a_miss(self, tmp_path):
+        """Test that an unreadable file is discarded"""
+        (tmp_path / 'key.pkl').write_bytes(b'not a pickle')
+        cache = AnalysisCache(cache_dir=tmp_path)
+        assert cache.get('key') is None
+        assert not (tmp_path / 'key.pkl').exists()
+
+    
+    def test_unwritable_store_warns_once(self, tmp_path, capsys):
+        """Test that failed disk writes warn once and keep the memory entries"""
+        blocker = tmp_path / 'file'
+        blocker.write_text('')
+        cache = AnalysisCache(cache_dir=blocker / 'cache')
+        for key in ('a', 'b', 'c'):
+            cache.put(key, {'value': 1})
+        assert capsys.readouterr().out.count('Could not write analysis cache') == 1
+        assert cache.get('c') == {'value': 1}
+
+
+class TestAnalyzerCache:
+    """Tests for cached FloorSystemFEMAnalyzer runs"""
+    
+    def test_repeated_analysis_served_from_cache(self, simple_layout, simple_loads, tmp_path):
+        """Test that an identical analysis is not solved again, also after a restart"""
+        first = FloorSystemFEMAnalyzer(engine='sparse', cache=AnalysisCache(cache_dir=tmp_path))
+        first.build_fem_model(simple_layout, simple_loads)
+        expected = first.run_analysis()
+        
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse', cache=AnalysisCache(cache_dir=tmp_path))
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        results = analyzer.run_analysis()
+        
+        assert analyzer.model.solution is None  # not analyzed
+        assert analyzer.cache.hits == 1
+        assert analyzer.cache.memory_bytes > first.case_results.displacements.nbytes
+        assert results['max_deflection'] == expected['max_deflection']
+        assert dict(results['deflections']) == dict(expected['deflections'])
+        assert analyzer.case_results is not None
+        
+        # Callers may add keys to the returned dict (the UI adds its report)
+        results['html_report'] = '<html/>'
+        assert 'html_report' not in analyzer.cache.get(analyzer._cache_key)
+        
+        # ...or edit its summaries; a later hit still gets the analyzed values
+        assert 'solver' in expected and 'solver' not in results
+        results['combinations'].clear()
+        results['max_deflection']['value'] = -1.0
+        again = analyzer.run_analysis()
+        assert again['combinations'] == expected['combinations']
+        assert again['max_deflection'] == expected['max_deflection']
+    
+    def test_changed_section_is_a_miss(self, simple_layout, simple_loads):
+        """Test that a resized member is analyzed again"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse', cache=AnalysisCache())
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        before = analyzer.run_analysis()['max_deflection']['value']
+        
+        simple_layout.main_beam_spec.ix *= 2
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        after = analyzer.run_analysis()['max_deflection']['value']
+        assert analyzer.cache.misses == 2
+        assert after == pytest.approx(before, rel=0.5) and after < before
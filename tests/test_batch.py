@@ -0,0 +1,125 @@
+"""
+Unit tests for the headless batch runner
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from steeldeckfem.batch import main, read_jobs, run_batch, run_job
+
+BEAM = {'id': 'B1', 'type': 'rc_beam', 'b': 300, 'h': 600, 'L': 6.0, 'M_u': 180,
+        'checks': ['design_flexure']}
+
+
+class TestJobs:
+    """Tests for job dispatch"""
+    
+    def test_design_job_runs_checks_with_parameters(self):
+        """Test that only checks whose arguments are given are run"""
+        record = run_job({'id': 'S1', 'type': 'rc_slab', 'thickness': 120, 'L': 3.0, 'q': 8.0})
+        assert record['status'] == 'ok'
+        assert list(record['results']) == ['design_one_way']
+        assert record['results']['design_one_way']['status'] == 'OK'
+    
+    def test_beam_job_default_checks(self):
+        """Test the documented beam job runs flexure and shear (Φ8 stirrups)"""
+        record = run_job({'id': 'B1', 'type': 'rc_beam', 'b': 300, 'h': 600, 'L': 6.0,
+                          'M_u': 180, 'V_u': 120})
+        assert record['status'] == 'ok', record.get('error')
+        assert list(record['results']) == ['design_flexure', 'design_shear']
+        assert record['results']['design_shear']['stirrup_size'] == 8
+    
+    def test_static_designer(self):
+        """Test designers without a constructor (static check methods)"""
+        record = run_job({'type': 'connection', 'n_bolts': 4, 'bolt_dia': 20,
+                          'bolt_grade': '8.8', 'V': 150})
+        assert record['status'] == 'ok'
+        assert record['results']['check_bolted_connection']['V_ratio'] < 1
+    
+    def test_invalid_jobs_become_error_records(self):
+        """Test that bad jobs are reported without stopping the batch"""
+        jobs = [{'id': 1, 'type': 'nope'},
+                {'id': 2, 'type': 'rc_beam', 'b': 300, 'L': 6.0, 'M_u': 180},
+                dict(BEAM, id=3, checks=['design_torsion']),
+                {'id': 4, 'type': 'floor_system', 'engine': 'pynite'},
+                BEAM]
+        records = list(run_batch(jobs, workers=1))
+        assert [r['status'] for r in records] == ['error'] * 4 + ['ok']
+        assert "missing parameter 'h'" in records[1]['error']
+    
+    def test_floor_system_job(self):
+        """Test a small floor system FEM job"""
+        record = run_job({'type': 'floor_system', 'length': 12.0, 'width': 12.0, 'live_load': 300})
+        assert record['status'] == 'ok'
+        assert record['results']['max_deflection'] > 0
+        assert record['results']['steel_tonnage'] > 0
+
+
+class TestJobFiles:
+    """Tests for job files and the command line"""
+    
+    def test_read_csv_coerces_values(self, tmp_path):
+        """Test CSV rows become typed jobs"""
+        path = tmp_path / 'jobs.csv'
+        path.write_text('id,type,b,h,L,M_u,concrete_grade,checks\n'
+                        'B1,rc_beam,300,600,6.0,180,B30,design_flexure\n'
+                        ',rc_beam,250,500,5,120,,\n', encoding='utf-8')
+        jobs = read_jobs(str(path))
+        assert jobs[0]['b'] == 300 and jobs[0]['L'] == 6.0 and jobs[0]['concrete_grade'] == 'B30'
+        assert jobs[0]['checks'] == ['design_flexure']
+        assert jobs[1]['id'] == 2 and 'concrete_grade' not in jobs[1]
+    
+    def test_main_writes_json_lines(self, tmp_path):
+        """Test the command line on a JSON job file with a process pool"""
+        jobs = tmp_path / 'jobs.json'
+        jobs.write_text(json.dumps({'jobs': [BEAM, dict(BEAM, id='B2', M_u=250), {'type': 'x'}]}))
+        out = tmp_path / 'out.jsonl'
+        assert main([str(jobs), '-o', str(out), '-j', '2']) == 1
+        records = [json.loads(line) for line in out.read_text(encoding='utf-8').splitlines()]
+        assert [r['id'] for r in records] == ['B1', 'B2', 3]
+        assert records[1]['results']['design_flexure']['As_required'] > \
+            records[0]['results']['design_flexure']['As_required']
+    
+    def test_bad_job_file(self, tmp_path):
+        """Test that an unreadable job file exits with status 2"""
+        path = tmp_path / 'jobs.json'
+        path.write_text('[1, 2]')
+        assert main([str(path)]) == 2
+    
+    def test_read_single_job_object(self, tmp_path):
+        """Test that a JSON file holding one job object reads as one job"""
+        path = tmp_path / 'job.json'
+        path.write_text(json.dumps(BEAM))
+        assert read_jobs(str(path)) == [BEAM]
+    
+    def test_jobs_key_not_a_list(self, tmp_path):
+        """Test that a 'jobs' entry that is not a list exits with status 2"""
+        path = tmp_path / 'jobs.json'
+        path.write_text(json.dumps({'jobs': BEAM}))
+        assert main([str(path)]) == 2
+    
+    def test_headless_imports(self, tmp_path):
+        """Test that a batch run never imports Qt, matplotlib or plotly"""
+        jobs = tmp_path / 'jobs.jsonl'
+        jobs.write_text('\n'.join(json.dumps(j) for j in [
+            BEAM, {'type': 'floor_system', 'length': 12.0, 'width': 12.0}]))
+        code = ("import sys; from steeldeckfem.batch import main; "
+                f"rc = main([{str(jobs)!r}, '-j', '1', '-o', {str(tmp_path / 'out.jsonl')!r}]); "
+                "print(sorted(m for m in ('PyQt5', 'matplotlib', 'plotly', 'Pynite') "
+                "if m in sys.modules)); sys.exit(rc)")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parents[1])
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == '[]'
+    
+    def test_core_package_imports_lazily(self):
+        """Test that importing steeldeckfem.core does not load scipy or the FEM stack"""
+        code = ("import sys, steeldeckfem.core as core; "
+                "print(sorted(m for m in ('scipy', 'steeldeckfem.core.fem_analyzer') "
+                "if m in sys.modules)); print(core.FloorSystemFEMAnalyzer.__name__)")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parents[1])
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split() == ['[]', 'FloorSystemFEMAnalyzer']
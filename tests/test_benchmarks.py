@@ -0,0 +1,80 @@
+"""
+Unit tests for the scaling benchmark harness
+"""
+
+import json
+
+from benchmarks.floor_system import (PHASE_GROUPS, benchmark_case, check_regressions,
+                                     format_table, main, read_history)
+from benchmarks.standards_startup import MODES, benchmark_startup, scaled_standards
+from benchmarks.standards_startup import format_table as startup_table
+
+THRESHOLDS = {'default': {'ratio': 1.25, 'min_seconds': 0.05}}
+
+
+def _record(seconds, case='sparse-2x2-1s', machine='m', **extra):
+    return dict({'case': case, 'machine': machine, 'status': 'ok', 'dof': 180,
+                 'timings': {'solve': seconds}, 'regressions': []}, **extra)
+
+
+class TestBenchmarks:
+    """Tests for the benchmark cases and regression thresholds"""
+    
+    def test_benchmark_case_phases(self):
+        """Test that the smallest case times every phase except the charts"""
+        record = benchmark_case(2, 1, 'sparse', charts=False, repeat=2)
+        
+        assert record['status'] == 'ok'
+        assert record['dof'] == 180
+        assert set(record['timings']) == set(PHASE_GROUPS) - {'charts'} | {'total'}
+        assert record['timings']['solve'] > 0
+        assert 'sparse-2x2-1s' in format_table([record])
+    
+    def test_skipped_above_max_dof(self):
+        """Test that models larger than max_dof are not analysed"""
+        record = benchmark_case(2, 1, 'pynite', charts=False, max_dof=100)
+        assert record['status'] == 'skipped'
+        assert record['timings'] == {}
+    
+    def test_check_regressions(self):
+        """Test the median baseline, the ratio and the absolute floor"""
+        history = [_record(1.0), _record(1.2), _record(0.8),
+                   _record(0.1, machine='other'), _record(0.1, regressions=['slow'])]
+        
+        assert check_regressions(_record(1.2), history, THRESHOLDS) == []
+        assert len(check_regressions(_record(1.3), history, THRESHOLDS)) == 1
+        # +50 % but only 5 ms: below the absolute floor
+        assert check_regressions(_record(0.015), [_record(0.01)], THRESHOLDS) == []
+        assert check_regressions(_record(9.0, case='sparse-5x5-1s'), history, THRESHOLDS) == []
+    
+    def test_main_history_and_exit_code(self, tmp_path):
+        """Test that a run appends to the history and fails on a regression"""
+        history = tmp_path / 'history.jsonl'
+        thresholds = tmp_path / 'thresholds.json'
+        thresholds.write_text(json.dumps({'default': {'ratio': 1.25, 'min_seconds': 0.0}}))
+        argv = ['--bays', '2', '--storeys', '1', '--engine', 'sparse', '--no-charts',
+                '--history', str(history), '--thresholds', str(thresholds)]
+        
+        assert main(argv) == 0
+        record, = read_history(history)
+        assert record['case'] == 'sparse-2x2-1s'
+        assert {'commit', 'machine', 'numpy', 'scipy', 'timestamp'} <= set(record)
+        
+        record['timings'] = {phase: 1e-9 for phase in record['timings']}
+        history.write_text(json.dumps(record) + '\n')
+        assert main(argv) == 1
+        assert len(read_history(history)[-1]['regressions']) > 0
+
+
+class TestStartupBenchmark:
+    """Tests for the standards startup benchmark"""
+    
+    def test_cold_and_warm_starts(self, tmp_path):
+        """Test every mode is timed and the snapshot is left behind"""
+        path = scaled_standards(tmp_path / 'standards.json', 2)
+        record = benchmark_startup(path, repeat=1)
+        
+        assert {'cold', 'warm', 'json'} <= set(record)
+        assert all(record[mode] > 0 for mode in MODES)
+        assert record['snapshot_bytes'] > 0
+        assert 'warm ms' in startup_table([record])
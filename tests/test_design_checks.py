@@ -0,0 +1,111 @@
+"""
+Unit tests for the vectorized member design checks
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer, StabilityCalculator
+from steeldeckfem.core.design_checks import (
+    STATUS_FAIL, MemberDesignChecker, buckling_coefficient, governing_check
+)
+from steeldeckfem.core.fem_results import FEMResults
+from steeldeckfem.core.force_recovery import ElementForces
+from steeldeckfem.core.steel_designer import SteelIBeamDesigner
+
+SECTION = 'H300x300x10x15'
+
+
+def simply_supported_beam(L, q):
+    """Results of a single simply supported beam under a uniform load q (kN/m)"""
+    forces = np.zeros((1, 1, 12))
+    forces[0, 0, 2] = -q * L / 2
+    loads = np.zeros((1, 1, 3, 2))
+    loads[0, 0, 2] = q
+    element_forces = ElementForces(
+        members=['B1'], forces=forces, loads=loads, length=np.array([L]),
+        x0=np.array([0.0]), member_ptr=np.array([0, 1]), member_length=np.array([L]))
+    return FEMResults(['N1', 'N2'], [], ['LC'], np.zeros((1, 2, 3)), np.zeros((1, 0, 3)),
+                      element_forces)
+
+
+class TestMemberDesignChecker:
+    """Tests against the single-member designers"""
+    
+    def test_buckling_coefficient_matches_stability_calculator(self):
+        """Test the array formula against StabilityCalculator"""
+        lambda_bar = np.array([0.1, 0.2, 0.5, 1.0, 1.7, 3.0])
+        expected = [StabilityCalculator().calculate_buckling_coefficient(x, 'c') for x in lambda_bar]
+        assert buckling_coefficient(lambda_bar, 'c') == pytest.approx(expected)
+    
+    def test_beam_matches_steel_i_beam_designer(self):
+        """Test strength, shear and deflection of a simply supported beam"""
+        L, q = 6.0, 40.0
+        designer = SteelIBeamDesigner(SECTION)
+        spec = SimpleNamespace(name=SECTION, h=designer.h, b=designer.b, tf=designer.t_f,
+                               tw=designer.t_w, area=designer.A / 100, ix=designer.Ix / 1e4,
+                               wx=designer.Wx / 1000)
+        results = simply_supported_beam(L, q)
+        
+        checks = {}
+        for limit_state in ('ULS', 'SLS'):
+            checks[limit_state] = MemberDesignChecker().check(
+                results, [limit_state], {'secondary_beam': ['B1']}, {'secondary_beam': spec})
+        ratios = dict(zip(('strength', 'shear', 'stability', 'deflection'),
+                          checks['ULS'].ratios[:, 0]))
+        
+        assert ratios['strength'] == pytest.approx(designer.check_bending(q * L**2 / 8)['ratio'])
+        assert ratios['shear'] == pytest.approx(designer.check_shear(q * L / 2)['ratio'])
+        assert ratios['stability'] == 0.0
+        assert checks['SLS'].ratios[3, 0] == pytest.approx(
+            designer.check_deflection(L, q)['ratio'], rel=1e-6)
+
+
+class TestAnalyzerDesignChecks:
+    """Tests for design checks in FloorSystemFEMAnalyzer.run_analysis"""
+    
+    def test_every_member_is_checked(self, simple_layout, simple_loads):
+        """Test that design_checks covers all columns and beams"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, dict(simple_loads, wind_load=50))
+        checks = analyzer.run_analysis(layout=simple_layout)['design_checks']
+        
+        members = analyzer.column_members + analyzer.main_beam_members + analyzer.sec_beam_members
+        assert sorted(checks) == sorted(members)
+        column = checks[analyzer.column_members[0]]
+        assert column['stability'] > 0 and column['deflection'] > 0
+        assert column['unity_check'] == max(column[k] for k in
+                                            ('strength', 'shear', 'stability', 'deflection'))
+        assert column['combination'] in [c.name for c in analyzer.combinations]
+    
+    def test_undersized_beams_fail(self, simple_layout, simple_loads):
+        """Test that overloaded beams fail in strength under a ULS combination"""
+        simple_layout.secondary_beam_spec.ix /= 20
+        simple_layout.secondary_beam_spec.area /= 5
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, dict(simple_loads, live_load=1000))
+        analyzer.run_analysis()
+        result = analyzer.check_design(simple_layout)
+        checks = result.as_dict()
+        
+        assert set(analyzer.sec_beam_members) <= set(result.failing())
+        beam = checks[analyzer.sec_beam_members[0]]
+        assert beam['status'] == STATUS_FAIL
+        assert beam['governing'] in ('strength', 'deflection')
+        
+        # Main beam lines are looked up by their governing span
+        line = analyzer.main_beam_members[0].rsplit('_', 1)[0]
+        spans = [checks[name]['unity_check'] for name in checks if name.startswith(line + '_')]
+        assert governing_check(checks, line)['unity_check'] == max(spans)
+    
+    def test_governing_check_by_storey(self):
+        """Test that a plan lookup only takes the spans of its own storey"""
+        checks = {'MB_Y0_S0': {'unity_check': 0.4}, 'MB_Y0_S1': {'unity_check': 0.6},
+                  'MB_Y0_S0_F2': {'unity_check': 0.9}, 'MB_Y0_S1_F3': {'unity_check': 1.2},
+                  'Col_1_1': {'unity_check': 0.3}, 'Col_1_1_F2': {'unity_check': 0.8}}
+        assert governing_check(checks, 'MB_Y0')['unity_check'] == 0.6
+        assert governing_check(checks, 'MB_Y0', storey=2)['unity_check'] == 0.9
+        assert governing_check(checks, 'Col_1_1')['unity_check'] == 0.3
+        assert governing_check(checks, 'Col_1_1', storey=2)['unity_check'] == 0.8
+        assert governing_check(checks, 'MB_Y1') is None
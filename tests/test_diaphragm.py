@@ -0,0 +1,106 @@
+"""
+Unit tests for rigid floor diaphragms
+"""
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer, SparseFrameModel
+
+CORNERS = [(0.0, 0.0), (6.0, 0.0), (6.0, 4.0), (0.0, 4.0)]
+
+
+def box_frame(diaphragm: bool, beam_stiffness: float = 1e-4):
+    """
+    One-storey box of four columns and four edge beams under lateral loads
+
+    beam_stiffness: Area and in-plane inertia of the beams
+    """
+    model = SparseFrameModel()
+    model.add_material('S', 2e8, 7.7e7, 0.3, 7850)
+    model.add_section('Col', 0.01, 2e-4, 1e-4, 1e-6)
+    model.add_section('Beam', beam_stiffness, 2e-4, beam_stiffness, 1e-6)
+    for k, (x, y) in enumerate(CORNERS):
+        model.add_node(f'B{k}', x, y, 0.0)
+        model.add_node(f'T{k}', x, y, 3.5)
+        model.def_support(f'B{k}', True, True, True, True, True, True)
+        model.add_member(f'C{k}', f'B{k}', f'T{k}', 'S', 'Col')
+    for k in range(4):
+        model.add_member(f'G{k}', f'T{k}', f'T{(k + 1) % 4}', 'S', 'Beam')
+    model.add_node_load('T0', 'FX', 10.0, 'H')
+    model.add_node_load('T1', 'FY', 5.0, 'H')
+    model.add_node_load('T2', 'FZ', -200.0, 'P')
+    model.add_member_dist_load('G0', 'FZ', -5.0, -5.0, case='P')
+    if diaphragm:
+        model.def_diaphragm(3.5)
+    return model
+
+
+class TestSparseDiaphragm:
+    """Tests for SparseFrameModel.def_diaphragm"""
+    
+    def test_matches_rigid_beams(self):
+        """Test the diaphragm against in-plane rigid edge beams"""
+        constrained = box_frame(True)
+        rigid = box_frame(False, beam_stiffness=1e3)
+        constrained.analyze(check_statics=True)
+        rigid.analyze()
+        
+        assert np.allclose(constrained.D, rigid.D, atol=1e-9)
+        assert constrained.factor_info['dof'] == rigid.factor_info['dof'] - 9
+        for check in constrained.statics_check.values():
+            assert check['residual'] < 1e-9
+        
+        # Second order: the beams of the rigid model also carry axial force
+        second = constrained.analyze_pdelta([[1.0, 1.0]])['D'][0, 1]
+        linear = constrained.D[:, 1].sum(axis=0)
+        expected = box_frame(False, 1e3).analyze_pdelta([[1.0, 1.0]])['D'][0, 1]
+        assert abs(second[0]) > abs(linear[0])
+        assert second[:2] == pytest.approx(expected[:2], rel=1e-2)
+    
+    def test_default_master_and_validation(self):
+        """Test the master node choice and rejected diaphragms"""
+        model = box_frame(False)
+        assert model.def_diaphragm(3.5) == 'T0'
+        assert model.def_diaphragm(3.5, 'T2') == 'T2'
+        with pytest.raises(ValueError, match='not at Z'):
+            model.def_diaphragm(3.5, 'B0')
+        with pytest.raises(ValueError, match='at least two nodes'):
+            model.def_diaphragm(7.0)
+        
+        model.def_diaphragm(0.0)
+        with pytest.raises(ValueError, match='restrained'):
+            model.analyze()
+
+
+class TestAnalyzerDiaphragm:
+    """Tests for FloorSystemFEMAnalyzer(rigid_diaphragm=True)"""
+    
+    def test_floors_move_rigidly(self, simple_layout, simple_loads):
+        """Test in-plane rigid floor motion, fewer DOF and stiffer sway modes"""
+        loads = dict(simple_loads, wind_load=50)
+        analyzers = {}
+        for rigid in (False, True):
+            analyzer = FloorSystemFEMAnalyzer(engine='sparse', rigid_diaphragm=rigid)
+            analyzer.build_fem_model(simple_layout, loads)
+            analyzer.run_analysis()
+            analyzers[rigid] = analyzer
+        analyzer = analyzers[True]
+        model = analyzer.model
+        
+        assert model.factor_info['dof'] < analyzers[False].model.factor_info['dof']
+        coords = np.asarray(model._coords)
+        floor = np.flatnonzero(coords[:, 2] > 0)
+        for c in range(len(model.load_cases)):
+            D = model.D[c, floor]
+            # In-plane displacements of a rigid body: DX + y RZ and DY - x RZ are constant
+            assert np.ptp(D[:, 5]) < 1e-12
+            assert np.ptp(D[:, 0] + coords[floor, 1] * D[:, 5]) < 1e-12
+            assert np.ptp(D[:, 1] - coords[floor, 0] * D[:, 5]) < 1e-12
+        
+        modes = [a.run_modal_analysis(3).omega[0] for a in analyzers.values()]
+        assert modes[1] >= modes[0] * (1 - 1e-9)
+    
+    def test_pynite_engine_rejected(self):
+        """Test rigid diaphragms require the sparse engine"""
+        with pytest.raises(ValueError, match='sparse'):
+            FloorSystemFEMAnalyzer(engine='pynite', rigid_diaphragm=True)
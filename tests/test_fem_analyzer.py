@@ -2,8 +2,14 @@
 Unit tests for FEM Analyzer module
 """
 
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
 from steeldeckfem.core import FloorSystemFEMAnalyzer
+from steeldeckfem.core.load_combination_engine import LoadType
+from steeldeckfem.core.parametric_sweep import DEFAULT_PARAMETERS, build_layout
+from steeldeckfem.core.sparse_solver import ORDERINGS
 
 
 class TestFloorSystemFEMAnalyzer:
@@ -150,3 +156,195 @@ class TestFEMAnalyzerEdgeCases:
         
         assert model is not None
         assert len(analyzer.column_members) == 4  # 2x2 grid
+
+
+class TestSparseEngine:
+    """Tests for the native scipy.sparse engine"""
+    
+    def test_invalid_engine_rejected(self):
+        """Test that an unknown engine name raises"""
+        with pytest.raises(ValueError, match="Unknown FEM engine"):
+            FloorSystemFEMAnalyzer(engine='abaqus')
+    
+    def test_sparse_results_have_same_shape(self, simple_layout, simple_loads):
+        """Test that the sparse engine returns the standard results keys"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        results = analyzer.run_analysis()
+        
+        assert results['status'] == 'Analysis Complete'
+        assert set(results['deflections']) == set(analyzer.model.nodes)
+        assert set(results['reactions']) == {n['base'] for n in analyzer.column_nodes.values()}
+        assert set(results['member_forces']) == set(analyzer.main_beam_members)
+        assert results['max_deflection']['value'] > 0
+    
+    @pytest.mark.parametrize('direction', ['X', 'Y'])
+    def test_sparse_matches_pynite(self, simple_layout, simple_loads, direction):
+        """Test that both engines give the same deflections, reactions and forces"""
+        simple_layout.main_beam_direction = direction
+        results = {}
+        for engine in FloorSystemFEMAnalyzer.ENGINES:
+            analyzer = FloorSystemFEMAnalyzer(engine=engine)
+            analyzer.build_fem_model(simple_layout, simple_loads)
+            results[engine] = analyzer.run_analysis()
+        
+        pynite, sparse = results['pynite'], results['sparse']
+        for node, defl in pynite['deflections'].items():
+            for key in ('dx', 'dy', 'dz'):
+                assert sparse['deflections'][node][key] == pytest.approx(defl[key], abs=1e-9)
+        for node, rxn in pynite['reactions'].items():
+            for key in ('Fx', 'Fy', 'Fz'):
+                assert sparse['reactions'][node][key] == pytest.approx(rxn[key], abs=1e-6)
+        for member, forces in pynite['member_forces'].items():
+            for key in ('shear', 'moment', 'axial'):
+                assert sparse['member_forces'][member][key] == pytest.approx(forces[key], abs=1e-6)
+    
+    def test_vertical_load_equilibrium(self, simple_layout, simple_loads):
+        """Test that base reactions balance the total applied gravity load"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        results = analyzer.run_analysis()
+        
+        total_rz = sum(r['Fz'] for r in results['reactions'].values())
+        lengths = analyzer.model._member_length
+        total_load = sum(-w1 * lengths[m] for m, _, w1, _, _ in analyzer.model._dist_loads)
+        assert total_rz == pytest.approx(total_load, rel=1e-9)
+    
+    def test_unstable_model_reports_failure(self, simple_layout, simple_loads):
+        """Test that a singular stiffness matrix is reported, not returned as garbage"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        analyzer.model._supports.clear()
+        results = analyzer.run_analysis()
+        
+        assert results['status'].startswith('Analysis failed')
+        assert 'singular' in results['error']
+    
+    def test_orderings_agree_and_reduce_fill(self, simple_loads):
+        """Test that every DOF ordering gives the same results and reports its fill-in"""
+        layout = build_layout(dict(DEFAULT_PARAMETERS, length=36.0, width=24.0))
+        results = {}
+        for ordering in ORDERINGS:
+            analyzer = FloorSystemFEMAnalyzer(engine='sparse', ordering=ordering)
+            analyzer.build_fem_model(layout, dict(simple_loads, wind_load=50))
+            results[ordering] = analyzer.run_analysis()
+        
+        reference = results['natural']['fem_results'].displacements
+        for ordering, result in results.items():
+            solver = result['solver']
+            assert solver['ordering'] == ordering and solver['method'] == 'lu'
+            assert solver['fill_ratio'] == solver['nnz_factors'] / solver['nnz']
+            assert np.allclose(result['fem_results'].displacements, reference, atol=1e-12)
+        assert results['amd']['solver']['fill_ratio'] < results['natural']['solver']['fill_ratio']
+        
+        with pytest.raises(ValueError, match="Unknown ordering"):
+            FloorSystemFEMAnalyzer(engine='sparse', ordering='metis')
+
+
+class TestIncrementalReanalysis:
+    """Tests for re-analysis when only member sections change"""
+    
+    @staticmethod
+    def _resize_main_beams(layout, factor):
+        spec = layout.main_beam_spec
+        layout.main_beam_spec = SimpleNamespace(**dict(vars(spec), area=spec.area * factor,
+                                                       ix=spec.ix * factor))
+    
+    @pytest.mark.parametrize('engine', FloorSystemFEMAnalyzer.ENGINES)
+    def test_section_update_matches_rebuild(self, simple_layout, simple_loads, engine):
+        """Test that an in-place section update gives the results of a new model"""
+        analyzer = FloorSystemFEMAnalyzer(engine=engine)
+        model = analyzer.build_fem_model(simple_layout, simple_loads)
+        analyzer.run_analysis()
+        
+        self._resize_main_beams(simple_layout, 2.0)
+        assert analyzer.build_fem_model(simple_layout, simple_loads) is model
+        updated = analyzer.run_analysis()['fem_results']
+        
+        reference = FloorSystemFEMAnalyzer(engine=engine)
+        reference.build_fem_model(simple_layout, simple_loads)
+        expected = reference.run_analysis()['fem_results']
+        assert np.allclose(updated.displacements, expected.displacements, rtol=1e-9, atol=1e-14)
+        assert np.allclose(updated.element_forces.forces, expected.element_forces.forces,
+                           rtol=1e-9, atol=1e-8)
+    
+    def test_sparse_reuses_factorization(self, simple_layout, simple_loads):
+        """Test that the sparse engine re-solves from its previous factorization"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        analyzer.run_analysis()
+        assert analyzer.model.solver_info['method'] == 'lu'
+        
+        self._resize_main_beams(simple_layout, 1.5)
+        analyzer.update_sections(simple_layout)
+        analyzer.run_analysis()
+        assert analyzer.model.solver_info['method'] == 'pcg'
+    
+    def test_geometry_change_rebuilds(self, simple_layout, simple_loads):
+        """Test that a changed layout geometry is not applied in place"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        model = analyzer.build_fem_model(simple_layout, simple_loads)
+        
+        simple_layout.secondary_beam_spacing = 1.0
+        with pytest.raises(ValueError, match="geometry changed"):
+            analyzer.update_sections(simple_layout)
+        assert analyzer.build_fem_model(simple_layout, simple_loads) is not model
+
+
+class TestLoadCombinations:
+    """Tests for primary load cases and combination superposition"""
+    
+    def test_primary_load_cases(self, simple_layout, simple_loads):
+        """Test that gravity and lateral loads become separate load cases"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        assert analyzer.load_cases == ['D', 'L']
+        
+        analyzer.build_fem_model(simple_layout, dict(simple_loads, wind_load=50))
+        assert analyzer.load_cases == ['D', 'L', 'W']
+        assert analyzer.model.load_cases == ['D', 'L', 'W']
+    
+    def test_combination_is_superposition(self, simple_layout, simple_loads):
+        """Test that a combination equals the factored sum of its load cases"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        analyzer.run_analysis()
+        
+        dead = analyzer.combine({LoadType.DEAD: 1.0})
+        live = analyzer.combine({LoadType.LIVE: 1.0})
+        lc1 = analyzer.combine({LoadType.DEAD: 1.1, LoadType.LIVE: 1.3})
+        for node, defl in lc1['deflections'].items():
+            expected = 1.1 * dead['deflections'][node]['dz'] + 1.3 * live['deflections'][node]['dz']
+            assert defl['dz'] == pytest.approx(expected, abs=1e-12)
+        for member, forces in lc1['member_forces'].items():
+            expected = [1.1 * d + 1.3 * l for d, l in zip(dead['member_forces'][member]['moment'],
+                                                          live['member_forces'][member]['moment'])]
+            assert forces['moment'] == pytest.approx(expected, abs=1e-9)
+    
+    def test_envelopes_cover_combinations(self, simple_layout, simple_loads):
+        """Test that the envelopes bound every combination of their limit state"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, dict(simple_loads, wind_load=50))
+        results = analyzer.run_analysis()
+        
+        assert len(results['combinations']) == 12
+        for limit_state, envelope in results['envelopes'].items():
+            combos = [c for c in results['combinations'].values() if c['limit_state'] == limit_state]
+            assert envelope['max_deflection']['value'] == pytest.approx(
+                max(c['max_deflection']['value'] for c in combos))
+            assert envelope['max_moment']['value'] == pytest.approx(
+                max(c['max_moment']['value'] for c in combos))
+    
+    def test_engines_agree_on_combinations(self, simple_layout, simple_loads):
+        """Test that both engines give the same combination results with wind"""
+        loads = dict(simple_loads, wind_load=50)
+        summaries = {}
+        for engine in FloorSystemFEMAnalyzer.ENGINES:
+            analyzer = FloorSystemFEMAnalyzer(engine=engine)
+            analyzer.build_fem_model(simple_layout, loads)
+            summaries[engine] = analyzer.run_analysis()['combinations']
+        
+        for name, combo in summaries['pynite'].items():
+            other = summaries['sparse'][name]
+            for key in ('max_deflection', 'max_reaction', 'max_moment', 'max_shear'):
+                assert other[key]['value'] == pytest.approx(combo[key]['value'], rel=1e-6, abs=1e-9)
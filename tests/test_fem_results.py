@@ -0,0 +1,157 @@
+"""
+Unit tests for the columnar FEM results store
+"""
+
+import pickle
+from collections.abc import Mapping
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer
+from steeldeckfem.core import fem_results
+from steeldeckfem.core.fem_results import FEMResults
+
+
+@pytest.fixture
+def analyzed(simple_layout, simple_loads):
+    """Sparse analyzer with results for D, L and W"""
+    analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+    analyzer.build_fem_model(simple_layout, dict(simple_loads, wind_load=50))
+    analyzer.run_analysis()
+    return analyzer
+
+
+class TestFEMResults:
+    """Tests for FEMResults queries"""
+    
+    def test_array_layout(self, analyzed):
+        """Test that results are stored as (case, node, component) arrays"""
+        store = analyzed.results['fem_results']
+        assert isinstance(store, FEMResults)
+        assert store.displacements.shape == (3, len(analyzed.model.nodes), 3)
+        assert store.reactions.shape == (3, len(analyzed.column_nodes), 3)
+        assert store.displacements.flags['C_CONTIGUOUS']
+    
+    def test_max_abs_displacement(self, analyzed):
+        """Test the vectorized max |dz| against a Python scan of the dict view"""
+        store = analyzed.case_results
+        values, nodes = store.max_abs_displacement('dz')
+        for c, case in enumerate(store.load_cases):
+            view = store.deflections_view(case)
+            name = max(view, key=lambda n: abs(view[n]['dz']))
+            assert store.node_names[nodes[c]] == name
+            assert values[c] == pytest.approx(abs(view[name]['dz']))
+    
+    def test_reaction_totals_by_group(self, analyzed):
+        """Test summed reactions per support group"""
+        store = analyzed.case_results
+        edge = [name for name in store.support_nodes if name.startswith('C0_')]
+        totals = store.reaction_totals({'all': store.support_nodes, 'edge': edge})
+        
+        np.testing.assert_allclose(totals['all'], store.reactions.sum(axis=1))
+        assert totals['edge'].shape == (3, 3)
+        assert abs(totals['edge'][0, 2]) < abs(totals['all'][0, 2])
+    
+    def test_members_exceeding(self, analyzed):
+        """Test selecting members by utilization ratio"""
+        store = analyzed.case_results
+        peaks = store.member_peaks('moment_y').max(axis=0)
+        threshold = np.median(peaks)
+        
+        exceeding = store.members_exceeding(threshold, 'moment_y')
+        assert set(exceeding) == {name for name, p in zip(store.member_names, peaks) if p > threshold}
+        
+        beam = analyzed.main_beam_members[0]
+        only_beam = store.members_exceeding({beam: 1e-9}, 'moment_y')
+        assert only_beam == [beam]
+    
+    def test_combine_matches_manual_superposition(self, analyzed):
+        """Test that combined arrays are the factored sum of the cases"""
+        store = analyzed.case_results
+        combined = store.combine(np.array([[1.1, 1.3, 0.8]]), ['LC2'])
+        
+        expected = 1.1 * store.displacements[0] + 1.3 * store.displacements[1] + 0.8 * store.displacements[2]
+        np.testing.assert_allclose(combined.displacements[0], expected)
+        assert combined.load_cases == ['LC2']
+
+
+class TestResultsViews:
+    """Tests for the dict-compatible views"""
+    
+    def test_views_are_mappings(self, analyzed):
+        """Test that primary results behave like the historical nested dicts"""
+        results = analyzed.results
+        for key in ('deflections', 'reactions', 'member_forces', 'member_extremes'):
+            assert isinstance(results[key], Mapping)
+        
+        node = next(iter(results['deflections']))
+        assert set(results['deflections'][node]) == {'dx', 'dy', 'dz'}
+        assert set(results['member_forces']) == set(analyzed.main_beam_members)
+        assert 'missing' not in results['deflections']
+        with pytest.raises(KeyError):
+            results['reactions']['missing']
+    
+    def test_view_values_match_arrays(self, analyzed):
+        """Test that view rows read the service combination arrays"""
+        results = analyzed.results
+        store = analyzed.case_results
+        n = store.node_index['C1_1_T']
+        # Primary results are 1.0D + 1.0L
+        expected = store.displacements[0, n] + store.displacements[1, n]
+        assert [results['deflections']['C1_1_T'][k] for k in ('dx', 'dy', 'dz')] == pytest.approx(expected)
+    
+    def test_member_view_recovers_read_block_only(self, analyzed, monkeypatch):
+        """Test that reading one member recovers its block, not every member"""
+        monkeypatch.setattr(fem_results, '_VIEW_BLOCK', 4)
+        store = analyzed.case_results
+        view = store.member_forces_view('D')
+        name = store.member_names[-1]
+        expected = store.diagrams([name])
+        row = view[name]
+        
+        assert len(store.member_names) > 8
+        assert list(view._blocks) == [(len(store.member_names) - 1) // 4]
+        assert len(view._blocks[(len(store.member_names) - 1) // 4].members) <= 4
+        assert row['moment'] == expected.values['moment_y'][0, 0].tolist()
+        assert row['positions'] == expected.positions[0].tolist()
+    
+    def test_results_pickle(self, analyzed):
+        """Test that results (with views) survive pickling"""
+        results = pickle.loads(pickle.dumps(analyzed.results))
+        assert dict(results['deflections']) == dict(analyzed.results['deflections'])
+
+
+class TestResultsFile:
+    """Tests for the memory-mapped results file format"""
+    
+    def test_save_load_roundtrip(self, analyzed, tmp_path):
+        """Test that loaded results are memory-mapped and equal to the originals"""
+        store = analyzed.case_results
+        loaded = FEMResults.load(store.save(tmp_path / 'cases'))
+        
+        assert isinstance(loaded.element_forces.forces, np.memmap)
+        assert loaded.load_cases == store.load_cases
+        assert loaded.member_names == store.member_names
+        np.testing.assert_array_equal(loaded.displacements, store.displacements)
+        beam = analyzed.main_beam_members[0]
+        assert loaded.member_forces_view('L', [beam])[beam] == store.member_forces_view('L', [beam])[beam]
+    
+    def test_load_missing_results(self, tmp_path):
+        """Test that a directory without a manifest is rejected"""
+        with pytest.raises(FileNotFoundError):
+            FEMResults.load(tmp_path)
+    
+    def test_analyzer_reopens_results(self, analyzed, tmp_path):
+        """Test that a fresh analyzer reopens saved results and reports them"""
+        path = analyzed.save_results(tmp_path / 'floor.femres')
+        
+        reopened = FloorSystemFEMAnalyzer()
+        results = reopened.load_results(path)
+        expected = analyzed.results
+        
+        assert reopened.model is None
+        assert results['max_deflection'] == expected['max_deflection']
+        assert results['combinations'] == expected['combinations']
+        assert dict(results['reactions']) == dict(expected['reactions'])
+        assert dict(results['member_forces']) == dict(expected['member_forces'])
+        assert f"{expected['max_deflection']['value']:.2f} mm" in reopened.generate_fem_report()
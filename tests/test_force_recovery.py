@@ -0,0 +1,122 @@
+"""
+Unit tests for vectorized member force recovery
+"""
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer, SparseFrameModel
+from steeldeckfem.core.force_recovery import COMPONENTS, ElementForces
+
+
+def _cantilever(w=-10.0, L=4.0):
+    """Horizontal cantilever along X with a full-length gravity load"""
+    model = SparseFrameModel()
+    model.add_node('N1', 0, 0, 0)
+    model.add_node('N2', L, 0, 0)
+    model.add_material('Steel', 200e6, 77e6, 0.3, 7850)
+    model.add_section('S', 0.01, 1e-4, 1e-4, 2e-4)
+    model.add_member('M1', 'N1', 'N2', 'Steel', 'S')
+    model.def_support('N1', True, True, True, True, True, True)
+    model.add_member_dist_load('M1', 'FZ', w, w)
+    model.analyze()
+    return ElementForces.from_sparse_model(model, ['Case 1'])
+
+
+class TestElementForces:
+    """Tests for ElementForces diagrams and extremes"""
+    
+    def test_cantilever_closed_form(self):
+        """Test cantilever shear and moment against hand formulas"""
+        w, L = -10.0, 4.0
+        diagrams = _cantilever(w, L).diagrams(5)
+        x = diagrams.positions[0]
+        
+        assert diagrams.values['shear_z'][0, 0] == pytest.approx(-w * (L - x))
+        assert np.abs(diagrams.values['moment_y'][0, 0]) == pytest.approx(-w * (L - x)**2 / 2)
+    
+    def test_cantilever_extreme_location(self):
+        """Test that the peak moment is found at the fixed end"""
+        w, L = -10.0, 4.0
+        extremes = _cantilever(w, L).extremes()
+        peak = max(abs(extremes['moment_y']['max'][0, 0]), abs(extremes['moment_y']['min'][0, 0]))
+        
+        assert peak == pytest.approx(-w * L**2 / 2)
+        key = 'x_max' if abs(extremes['moment_y']['max'][0, 0]) > abs(extremes['moment_y']['min'][0, 0]) else 'x_min'
+        assert extremes['moment_y'][key][0, 0] == pytest.approx(0.0)
+    
+    def test_diagrams_match_model_results(self, simple_layout, simple_loads):
+        """Test that recovered diagrams equal the sparse model's own member results"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        model = analyzer.build_fem_model(simple_layout, simple_loads)
+        model.analyze()
+        diagrams = ElementForces.from_sparse_model(model, ['D']).diagrams(11)
+        
+        for m, name in enumerate(diagrams.members):
+            x = diagrams.positions[m]
+            assert diagrams.values['shear_z'][0, m] == pytest.approx(model.shear(name, 'Fz', x, 'D'), abs=1e-9)
+            assert diagrams.values['moment_y'][0, m] == pytest.approx(model.moment(name, 'My', x, 'D'), abs=1e-9)
+            assert diagrams.values['axial'][0, m] == pytest.approx(model.axial(name, x, 'D'), abs=1e-9)
+    
+    def test_extremes_bound_dense_sampling(self, simple_layout, simple_loads):
+        """Test that exact extremes are never exceeded by sampled values"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        model = analyzer.build_fem_model(simple_layout, simple_loads)
+        model.analyze()
+        element_forces = ElementForces.from_sparse_model(model, ['D', 'L'])
+        extremes = element_forces.extremes()
+        dense = element_forces.diagrams(401)
+        
+        for component in COMPONENTS:
+            values = dense.values[component]
+            assert np.all(extremes[component]['max'] >= values.max(axis=2) - 1e-9)
+            assert np.all(extremes[component]['min'] <= values.min(axis=2) + 1e-9)
+    
+    def test_combine_is_linear(self, simple_layout, simple_loads):
+        """Test that combined element forces give superposed diagrams"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        model = analyzer.build_fem_model(simple_layout, simple_loads)
+        model.analyze()
+        element_forces = ElementForces.from_sparse_model(model, ['D', 'L'])
+        per_case = element_forces.diagrams().values['moment_y']
+        combined = element_forces.combine(np.array([[1.1, 1.3]])).diagrams().values['moment_y']
+        
+        np.testing.assert_allclose(combined[0], 1.1 * per_case[0] + 1.3 * per_case[1], atol=1e-9)
+    
+    def test_engines_agree_for_all_members(self, simple_layout, simple_loads):
+        """Test that PyNite and sparse force recovery agree on every member"""
+        values = {}
+        for engine in FloorSystemFEMAnalyzer.ENGINES:
+            analyzer = FloorSystemFEMAnalyzer(engine=engine)
+            analyzer.build_fem_model(simple_layout, dict(simple_loads, wind_load=50))
+            analyzer.run_analysis()
+            values[engine] = analyzer.case_results.element_forces.diagrams().values
+        
+        for component in COMPONENTS:
+            np.testing.assert_allclose(values['sparse'][component], values['pynite'][component],
+                                       atol=1e-6)
+
+
+class TestAnalyzerForceRecovery:
+    """Tests for force recovery in FloorSystemFEMAnalyzer results"""
+    
+    def test_member_extremes_cover_all_members(self, simple_layout, simple_loads):
+        """Test that extremes are reported for columns and secondary beams too"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        results = analyzer.run_analysis()
+        
+        extremes = results['member_extremes']
+        assert set(extremes) == set(analyzer.model.members)
+        assert extremes[analyzer.sec_beam_members[0]]['moment_y']['min'] < 0
+        # Columns carry gravity in compression (positive axial, PyNite convention)
+        assert extremes[analyzer.column_members[0]]['axial']['min'] > 0
+    
+    def test_configurable_sample_count(self, simple_layout, simple_loads):
+        """Test that the number of diagram points follows n_points"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse', n_points=51)
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        results = analyzer.run_analysis()
+        
+        forces = next(iter(results['member_forces'].values()))
+        assert len(forces['positions']) == 51
+        assert len(forces['moment']) == 51
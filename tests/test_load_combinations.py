@@ -0,0 +1,188 @@
+"""
+Unit tests for the load combination engine
+"""
+
+import numpy as np
+import pytest
+from steeldeckfem.core.load_combination_engine import (
+    LOAD_TYPES, TCVN_LOAD_GROUPS, LimitState, LoadCombinationEngine, LoadGroup, LoadType
+)
+
+WIND_CASES = ['WX+', 'WX-', 'WY+', 'WY-']
+PROJECT_GROUPS = [
+    LoadGroup('Dead', 'D', leading=1.1, favourable=0.9, seismic=1.0, permanent=True),
+    LoadGroup('Floor live', 'L1', leading=1.3, accompanying=0.9, seismic=0.5),
+    LoadGroup('Roof live', 'L2', leading=1.3, accompanying=0.9, seismic=0.3),
+    LoadGroup('Wind', WIND_CASES, leading=1.2, accompanying=0.9),
+    LoadGroup('Seismic', ['EX', 'EY'], leading=1.0, accidental=True, reversible=True),
+]
+PROJECT_CASES = ['D', 'L1', 'L2'] + WIND_CASES + ['EX', 'EY']
+
+
+class TestFactorMatrix:
+    """Tests for the matrix form of the combinations"""
+    
+    def test_standard_matrix_is_cached(self):
+        """Test the standard combinations and their factor matrix are built once"""
+        first = LoadCombinationEngine.get_uls_combinations()
+        second = LoadCombinationEngine.get_uls_combinations()
+        matrix = LoadCombinationEngine.factor_matrix()
+        
+        assert first is not second
+        assert all(a is b for a, b in zip(first, second))
+        assert matrix is LoadCombinationEngine.factor_matrix()
+        assert matrix.shape == (len(first), len(LOAD_TYPES))
+        assert not matrix.flags.writeable
+        for row, combo in zip(matrix, first):
+            assert dict(zip(LOAD_TYPES, row)) == {t: combo.factors.get(t, 0.0) for t in LOAD_TYPES}
+    
+    def test_custom_columns(self):
+        """Test factor dictionaries with chosen load type columns"""
+        matrix = LoadCombinationEngine.factor_matrix(
+            [{LoadType.DEAD: 1.1, LoadType.WIND: 1.3}, {LoadType.LIVE: 1.0}],
+            [LoadType.WIND, LoadType.DEAD])
+        
+        assert np.array_equal(matrix, [[1.3, 1.1], [0.0, 0.0]])
+        assert matrix.flags.writeable
+    
+    @pytest.mark.parametrize('limit_state', list(LimitState))
+    def test_scalar_queries_match_combinations(self, limit_state):
+        """Test calculate_all and get_governing_case against LoadCombination.calculate"""
+        loads = {LoadType.DEAD: 12.0, LoadType.LIVE: 8.0, LoadType.WIND: -5.0,
+                 LoadType.SEISMIC: 3.0}
+        results = LoadCombinationEngine.calculate_all(loads, limit_state)
+        combo, value = LoadCombinationEngine.get_governing_case(loads, limit_state)
+        
+        for c, v in results:
+            assert v == pytest.approx(c.calculate(loads))
+        assert value == pytest.approx(max(c.calculate(loads) for c, _ in results))
+        assert combo.calculate(loads) == pytest.approx(value)
+
+
+class TestEnvelope:
+    """Tests for LoadCombinationEngine.envelope"""
+    
+    def test_matches_explicit_combinations(self):
+        """Test envelope values and governing combinations per entry"""
+        rng = np.random.default_rng(0)
+        cases = rng.normal(size=(3, 40, 11))
+        factors = np.array([[1.1, 1.3, 0.0], [1.1, 0.8, 1.3], [0.9, 0.0, -1.3]])
+        combined = LoadCombinationEngine.combine(cases, factors)
+        envelope = LoadCombinationEngine.envelope(cases, factors)
+        
+        assert combined.shape == (3, 40, 11)
+        assert np.allclose(envelope.max, combined.max(axis=0))
+        assert np.allclose(envelope.min, combined.min(axis=0))
+        assert np.array_equal(envelope.max_index, combined.argmax(axis=0))
+        assert np.array_equal(envelope.min_index, combined.argmin(axis=0))
+        assert np.allclose(envelope.abs_max, np.abs(combined).max(axis=0))
+        assert np.array_equal(envelope.abs_max_index, np.abs(combined).argmax(axis=0))
+    
+    @pytest.mark.parametrize('memory_budget', [None, 2**16, 2**10])
+    def test_streamed_blocks_match_dense(self, memory_budget):
+        """Test blocks of entries and of combinations give the dense envelope"""
+        rng = np.random.default_rng(1)
+        # small integers: many ties, which go to the first combination
+        cases = rng.integers(-3, 4, size=(4, 9000, 2)).astype(float)
+        factors = rng.integers(0, 3, size=(300, 4)).astype(float)
+        combined = LoadCombinationEngine.combine(cases, factors)
+        envelope = LoadCombinationEngine.envelope(cases, factors, memory_budget)
+        
+        assert envelope.max.shape == (9000, 2)
+        assert np.array_equal(envelope.max, combined.max(axis=0))
+        assert np.array_equal(envelope.min, combined.min(axis=0))
+        assert np.array_equal(envelope.max_index, combined.argmax(axis=0))
+        assert np.array_equal(envelope.min_index, combined.argmin(axis=0))
+    
+    def test_memory_mapped_cases(self, tmp_path):
+        """Test case results read block by block from a file"""
+        rng = np.random.default_rng(2)
+        cases = np.lib.format.open_memmap(tmp_path / 'cases.npy', mode='w+',
+                                          dtype=np.float32, shape=(3, 5000, 6))
+        cases[:] = rng.normal(size=cases.shape)
+        factors = np.array([[1.1, 1.3, 0.0], [1.1, 0.8, 1.3], [0.9, 0.0, -1.3]])
+        envelope = LoadCombinationEngine.envelope(cases, factors, memory_budget=2**16)
+        expected = LoadCombinationEngine.envelope(np.array(cases, dtype=np.float64), factors)
+        
+        assert np.allclose(envelope.max, expected.max)
+        assert np.array_equal(envelope.min_index, expected.min_index)
+    
+    def test_column_count_checked(self):
+        """Test a factor matrix with the wrong number of cases is rejected"""
+        with pytest.raises(ValueError, match='columns'):
+            LoadCombinationEngine.envelope(np.zeros((2, 5)), np.ones((4, 3)))
+
+
+class TestGenerator:
+    """Tests for combinations generated from load groups"""
+    
+    def test_default_groups_cover_standard_combinations(self):
+        """Test every standard factor set is generated from the default groups"""
+        for limit_state in LimitState:
+            generated = LoadCombinationEngine.factor_matrix(
+                list(LoadCombinationEngine.generate(TCVN_LOAD_GROUPS, limit_state)))
+            standard = LoadCombinationEngine.factor_matrix(limit_state=limit_state)
+            
+            rows = {tuple(row) for row in generated}
+            assert len(rows) == len(generated)
+            missing = [row for row in standard if tuple(row) not in rows]
+            # 1.0D + 1.0C and the 0.7L + 0.7W frequent combination are not basic patterns
+            assert len(missing) <= 2
+    
+    def test_exclusive_cases_and_directions(self):
+        """Test one case per group, seismic both ways, lazy enumeration"""
+        combinations = LoadCombinationEngine.generate(PROJECT_GROUPS)
+        first = next(combinations)
+        rest = list(combinations)
+        
+        assert first.factors == {LoadType.DEAD: 1.1}
+        assert first.name == 'LC1: 1.1D'
+        for combo in rest:
+            cases = [c for c, f in combo.factors.items() if f != 0]
+            assert sum(c in WIND_CASES for c in cases) <= 1
+            assert sum(c in ('EX', 'EY') for c in cases) <= 1
+            if 'EX' in cases or 'EY' in cases:
+                assert combo.factors[LoadType.DEAD] == 1.0
+                assert not any(c in WIND_CASES for c in cases)
+        seismic = {(c, f) for combo in rest for c, f in combo.factors.items() if c in ('EX', 'EY')}
+        assert seismic == {('EX', 1.0), ('EX', -1.0), ('EY', 1.0), ('EY', -1.0)}
+        # 2 dead factors x (alone + L1, L2 or one of 4 wind cases leading,
+        # the other groups accompanying or absent) + 4 seismic actions
+        basic = 2 * (1 + 2 * 2 * 5 + 4 * 2 * 2)
+        assert len(rest) + 1 == basic + 4 * 2 * 2
+    
+    @pytest.mark.parametrize('signs', ['definite', 'mixed'])
+    def test_pruning_keeps_envelope(self, signs):
+        """Test pruned combinations give the same envelope as all of them"""
+        rng = np.random.default_rng(3)
+        values = rng.normal(size=(len(PROJECT_CASES), 30, 7))
+        if signs == 'definite':
+            # gravity cases act downward everywhere (e.g. column axial forces)
+            values[:3] = -np.abs(values[:3])
+        combinations = list(LoadCombinationEngine.generate(PROJECT_GROUPS))
+        kept = LoadCombinationEngine.prune_dominated(combinations, values, PROJECT_CASES)
+        full = LoadCombinationEngine.envelope(
+            values, LoadCombinationEngine.factor_matrix(combinations, PROJECT_CASES))
+        pruned = LoadCombinationEngine.envelope(
+            values, LoadCombinationEngine.factor_matrix(kept, PROJECT_CASES))
+        
+        assert np.allclose(pruned.max, full.max)
+        assert np.allclose(pruned.min, full.min)
+        assert all(c in combinations for c in kept)
+        if signs == 'definite':
+            assert len(kept) < len(combinations) / 2
+        else:
+            assert len(kept) == len(combinations)
+    
+    def test_pruning_several_arrays(self):
+        """Test a combination governing any of the arrays is kept"""
+        combinations = list(LoadCombinationEngine.generate(TCVN_LOAD_GROUPS))
+        downward = -np.ones((len(LOAD_TYPES), 4))
+        reversing = np.array([[-1.0, 1.0]] * len(LOAD_TYPES))
+        
+        kept = LoadCombinationEngine.prune_dominated(combinations, downward)
+        both = LoadCombinationEngine.prune_dominated(combinations, [downward, reversing])
+        
+        assert len(kept) < len(both) <= len(combinations)
+        with pytest.raises(ValueError, match='rows'):
+            LoadCombinationEngine.prune_dominated(combinations, np.ones((2, 4)))
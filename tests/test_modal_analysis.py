@@ -0,0 +1,73 @@
+"""
+Unit tests for the sparse modal analysis
+"""
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer, ModalResults, SparseFrameModel
+
+H, E, A, I, RHO = 4.0, 200e6, 0.01, 1e-4, 7850
+
+
+def cantilever(n=20):
+    """Fixed-base column of n elements without added mass"""
+    model = SparseFrameModel()
+    for k in range(n + 1):
+        model.add_node(f'N{k}', 0, 0, H * k / n)
+    model.add_material('S', E, 77e6, 0.3, RHO)
+    model.add_section('Sec', A, I, I, 2 * I)
+    model.add_member('C', 'N0', f'N{n}', 'S', 'Sec')
+    model.def_support('N0', True, True, True, True, True, True)
+    return model
+
+
+class TestSparseModalAnalysis:
+    """Tests for SparseFrameModel.modal_analysis"""
+    
+    @pytest.mark.parametrize('lumped, rel', [(False, 1e-4), (True, 1e-2)])
+    def test_cantilever_first_frequency(self, lumped, rel):
+        """Test the first bending frequency against the closed-form solution"""
+        results = cantilever().modal_analysis(4, lumped=lumped)
+        mass = RHO / 1000 * A
+        expected = 1.875104**2 / (2 * np.pi) * np.sqrt(E * I / (mass * H**4))
+        
+        # Two identical bending modes (X and Y) come first
+        assert results.frequencies[:2] == pytest.approx([expected] * 2, rel=rel)
+        assert np.all(np.diff(results.frequencies) >= 0)
+        assert results.periods[0] == pytest.approx(1 / results.frequencies[0])
+        assert results.mass_ratios[:2].sum(axis=0)[:2] == pytest.approx([0.613] * 2, abs=0.03)
+    
+    def test_save_and_load(self, tmp_path):
+        """Test that modal results round-trip through the .npy store"""
+        results = cantilever().modal_analysis(3)
+        loaded = ModalResults.load(results.save(tmp_path / 'modal'))
+        
+        assert loaded.node_names == results.node_names
+        assert np.allclose(loaded.omega, results.omega)
+        assert loaded.mode_shape(1, 'N20') == pytest.approx(results.mode_shape(1, 'N20'))
+        assert loaded.summary() == results.summary()
+
+
+class TestAnalyzerModalAnalysis:
+    """Tests for FloorSystemFEMAnalyzer.run_modal_analysis"""
+    
+    def test_floor_system_modes(self, simple_layout, simple_loads):
+        """Test that a floor system sways laterally and carries the load mass"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        results = analyzer.run_modal_analysis(6)
+        self_weight = analyzer.run_modal_analysis(6, mass_factors={})
+        
+        assert analyzer.modal_results is self_weight
+        assert results.num_modes == 6
+        assert np.all(results.mass_ratios <= 1 + 1e-9)
+        assert results.mass_ratios[0].argmax() in (0, 1)
+        assert np.all(results.total_mass > self_weight.total_mass)
+        assert results.periods[0] > self_weight.periods[0]
+    
+    def test_pynite_engine_rejected(self, simple_layout, simple_loads):
+        """Test that modal analysis requires the sparse engine"""
+        analyzer = FloorSystemFEMAnalyzer(engine='pynite')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        with pytest.raises(ValueError, match='sparse'):
+            analyzer.run_modal_analysis()
@@ -0,0 +1,85 @@
+"""
+Unit tests for the floor system model generator
+"""
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer, generate_floor_system
+from steeldeckfem.core.model_generator import (
+    NODE_BASE, NODE_COLUMN_TOP, MEMBER_COLUMN, MEMBER_MAIN_BEAM
+)
+
+
+class TestGenerateFloorSystem:
+    """Tests for generate_floor_system"""
+    
+    def test_array_types(self, simple_layout):
+        """Test that coordinates are float64 and connectivity int32"""
+        topo = generate_floor_system(simple_layout)
+        assert topo.coords.dtype == np.float64
+        assert topo.connectivity.dtype == np.int32
+        assert topo.connectivity.shape == (topo.num_members, 2)
+    
+    def test_single_storey_labels_match_analyzer(self, simple_layout, simple_loads):
+        """Test that a one-storey topology keeps the analyzer's node and member names"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        topo = generate_floor_system(simple_layout)
+        
+        assert topo.node_labels() == list(analyzer.model.nodes)
+        assert topo.member_labels() == list(analyzer.model.members)
+        assert 'C0_0_B' in topo.node_labels()
+        assert 'MB_Y0_S0' in topo.member_labels()
+    
+    def test_multi_storey_counts(self, simple_layout):
+        """Test node and member counts grow per storey, bases only once"""
+        one = generate_floor_system(simple_layout, 1)
+        three = generate_floor_system(simple_layout, 3)
+        n_bases = len(one.nodes_of_kind(NODE_BASE))
+        
+        assert three.num_nodes == n_bases + 3 * (one.num_nodes - n_bases)
+        assert three.num_members == 3 * one.num_members
+        assert len(three.supports) == n_bases
+        assert three.coords[:, 2].max() == pytest.approx(3 * simple_layout.floor_height)
+    
+    def test_columns_stack_between_storeys(self, simple_layout):
+        """Test that upper storey columns start at the column tops below"""
+        topo = generate_floor_system(simple_layout, 2)
+        columns = topo.connectivity[topo.members_of_kind(MEMBER_COLUMN)]
+        tops = topo.nodes_of_kind(NODE_COLUMN_TOP)
+        n_cols = len(topo.supports)
+        
+        np.testing.assert_array_equal(columns[n_cols:, 0], tops[:n_cols])
+        np.testing.assert_array_equal(columns[n_cols:, 1], tops[n_cols:])
+        lengths = np.linalg.norm(np.diff(topo.coords[columns], axis=1)[:, 0], axis=1)
+        assert lengths == pytest.approx(simple_layout.floor_height)
+    
+    def test_upper_storey_label_suffix(self, simple_layout):
+        """Test that storey 2+ names get a floor suffix"""
+        topo = generate_floor_system(simple_layout, 2)
+        labels = topo.member_labels()
+        main = topo.members_of_kind(MEMBER_MAIN_BEAM)
+        
+        assert labels[main[0]] == 'MB_Y0_S0'
+        assert labels[main[-1]].endswith('_F2')
+        assert topo.member_label(main[-1]) == labels[main[-1]]
+        assert len(set(labels)) == len(labels)
+        assert len(set(topo.node_labels())) == topo.num_nodes
+    
+    def test_invalid_storeys(self, simple_layout):
+        """Test that zero storeys is rejected"""
+        with pytest.raises(ValueError, match="num_storeys"):
+            generate_floor_system(simple_layout, 0)
+    
+    def test_multi_storey_analysis(self, simple_layout, simple_loads):
+        """Test that a multi-storey model solves and carries every floor to the base"""
+        simple_layout.num_storeys = 3
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        results = analyzer.run_analysis()
+        
+        assert results['status'] == 'Analysis Complete'
+        total_rz = sum(r['Fz'] for r in results['reactions'].values())
+        lengths = analyzer.model._member_length
+        total_load = sum(-w1 * lengths[m] for m, _, w1, _, _ in analyzer.model._dist_loads)
+        assert total_rz == pytest.approx(total_load, rel=1e-9)
@@ -0,0 +1,147 @@
+"""
+Unit tests for influence lines and moving loads
+"""
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer, SparseFrameModel, WheelTrain
+
+L = 12.0
+RESPONSES = [('moment_y', 'M1', 3.0), ('shear_z', 'M1', 3.0), ('moment_y', 'M2', 1.5),
+             ('shear_z', 'M2', 0.5), ('axial', 'M1', 1.0), ('moment_y', 'K0', 3.0),
+             ('reaction', 'C0', 'FZ'), ('reaction', 'C0', 'MY'), ('reaction', 'Mid', 'FZ')]
+
+
+def two_span_frame(spacing):
+    """
+    Beam of two members on two columns and an intermediate support
+
+    M2 runs against the path direction. Beam nodes every `spacing` m.
+    """
+    model = SparseFrameModel()
+    model.add_material('S', 2e8, 7.7e7, 0.3, 7850)
+    model.add_section('Sec', 0.01, 2e-4, 1e-4, 1e-6)
+    xs = np.linspace(0.0, L, int(round(L / spacing)) + 1)
+    names = [f'N{k}' for k in range(len(xs))]
+    names[int(np.argmin(abs(xs - 8.0)))] = 'Mid'
+    for name, x in zip(names, xs):
+        model.add_node(name, x, 0, 3.0)
+    model.add_node('C0', 0, 0, 0)
+    model.add_node('C1', L, 0, 0)
+    model.add_member('M1', names[0], 'Mid', 'S', 'Sec')
+    model.add_member('M2', names[-1], 'Mid', 'S', 'Sec')
+    model.add_member('K0', 'C0', names[0], 'S', 'Sec')
+    model.add_member('K1', 'C1', names[-1], 'S', 'Sec')
+    for column in ('C0', 'C1'):
+        model.def_support(column, True, True, True, True, True, True)
+    model.def_support('Mid', False, True, True, False, False, False)
+    return model, list(zip(names, xs))
+
+
+def simple_beam(span=10.0, n=5):
+    model = SparseFrameModel()
+    model.add_material('S', 2e8, 7.7e7, 0.3, 7850)
+    model.add_section('Sec', 0.01, 2e-4, 1e-4, 1e-6)
+    for k in range(n + 1):
+        model.add_node(f'N{k}', span * k / n, 0, 0)
+    model.add_member('B', 'N0', f'N{n}', 'S', 'Sec')
+    model.def_support('N0', True, True, True, True, False, False)
+    model.def_support(f'N{n}', False, True, True, False, False, False)
+    return model
+
+
+class TestInfluenceLines:
+    """Tests for SparseFrameModel.influence_lines"""
+    
+    def test_matches_direct_solution(self):
+        """Test loads between nodes against a model with a node at every position"""
+        coarse, _ = two_span_frame(2.0)
+        lines = coarse.influence_lines(['M1', 'M2'], RESPONSES, step=0.25)
+        
+        fine, nodes = two_span_frame(0.25)
+        for name, _ in nodes:
+            fine.add_node_load(name, 'FZ', 1.0, case=name)
+        fine.analyze()
+        for name, x in nodes:
+            c = fine.load_cases.index(name)
+            direct = [fine.moment('M1', 'My', 3.0, name)[0], fine.shear('M1', 'Fz', 3.0, name)[0],
+                      fine.moment('M2', 'My', 1.5, name)[0], fine.shear('M2', 'Fz', 0.5, name)[0],
+                      fine.axial('M1', 1.0, name)[0], fine.moment('K0', 'My', 3.0, name)[0],
+                      fine.reactions[c, fine.nodes['C0'], 2], fine.reactions[c, fine.nodes['C0'], 4],
+                      fine.reactions[c, fine.nodes['Mid'], 2]]
+            np.testing.assert_allclose(lines.at(x), direct, atol=1e-9)
+    
+    def test_simply_supported_beam(self):
+        """Test the closed-form midspan moment of one and two wheels"""
+        lines = simple_beam().influence_lines(['B'], [('moment_y', 'B', 5.0)], step=0.05)
+        assert np.abs(lines.values).max() == pytest.approx(10.0 / 4)
+        
+        single = lines.envelope(WheelTrain([-100.0], [0.0]))
+        governing = single.governing('B moment_y @ 5')
+        # Sagging moment is negative My for a beam along X (PyNite convention)
+        assert single.min[0] == pytest.approx(-100 * 10.0 / 4)
+        assert governing['min']['wheels'] == pytest.approx([5.0])
+        
+        # Two equal wheels s apart, one at midspan: M = P L/4 + P (L/2 - s)/2
+        crane = lines.envelope(WheelTrain.crane(100.0, 2.0))
+        assert crane.min[0] == pytest.approx(-(100 * 10.0 / 4 + 100 * 3.0 / 2))
+    
+    def test_invalid_requests(self):
+        """Test unconnected paths, free reactions and unknown responses"""
+        model, _ = two_span_frame(2.0)
+        with pytest.raises(ValueError):
+            model.influence_lines(['M1', 'K1'], RESPONSES)
+        with pytest.raises(ValueError):
+            model.influence_lines(['M1'], [('reaction', 'Mid', 'FX')])
+        with pytest.raises(ValueError):
+            model.influence_lines(['M1'], [('torsion', 'M1', 1.0)])
+        with pytest.raises(NameError):
+            model.influence_lines(['M9'], RESPONSES)
+
+
+class TestWheelTrain:
+    """Tests for WheelTrain"""
+    
+    def test_crane(self):
+        """Test the wheel layout of two cranes side by side"""
+        train = WheelTrain.crane(120.0, 4.0, cranes=2, gap=1.5)
+        assert train.offsets.tolist() == [0.0, 4.0, 5.5, 9.5]
+        assert train.loads.tolist() == [-120.0] * 4
+        assert train.length == 9.5
+    
+    def test_invalid(self):
+        """Test mismatched loads and offsets"""
+        with pytest.raises(ValueError):
+            WheelTrain([-10.0, -10.0], [0.0])
+        with pytest.raises(ValueError):
+            WheelTrain([-10.0], [-1.0])
+
+
+class TestMovingLoadAnalysis:
+    """Tests for FloorSystemFEMAnalyzer.run_moving_load_analysis"""
+    
+    def test_runway_envelope(self, simple_layout, simple_loads):
+        """Test the default responses, base reaction equilibrium and profiling"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        path = ['MB_Y1_S0', 'MB_Y1_S1']
+        result = analyzer.run_moving_load_analysis(path, WheelTrain.crane(100.0, 4.0))
+        
+        lines, envelope = result['influence_lines'], result['envelope']
+        stations = FloorSystemFEMAnalyzer.MOVING_LOAD_STATIONS
+        supports = len(analyzer.column_nodes)
+        assert len(lines.responses) == 2 * stations * len(path) + supports
+        # The unit (upward) load is carried by the base reactions
+        reactions = [lines.index[r] for r in lines.responses if 'reaction' in r]
+        np.testing.assert_allclose(lines.values[reactions].sum(axis=0), -1.0, atol=1e-9)
+        assert envelope.values.shape[:2] == (2, len(lines.responses))
+        assert envelope.max.shape == envelope.min.shape == (len(lines.responses),)
+        assert analyzer.moving_load_results is result
+        assert 'moving_load' in [p['name'] for p in analyzer.profiler.phases]
+    
+    def test_requires_sparse_engine(self, simple_layout, simple_loads):
+        """Test that the PyNite engine is rejected"""
+        analyzer = FloorSystemFEMAnalyzer(engine='pynite')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        with pytest.raises(ValueError):
+            analyzer.run_moving_load_analysis(['MB_Y1_S0'], WheelTrain.crane(100.0, 4.0))
@@ -0,0 +1,133 @@
+"""
+Unit tests for the parallel parametric sweep runner
+"""
+
+import csv
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from steeldeckfem.core.parametric_sweep import (
+    DEFAULT_PARAMETERS, ParametricSweep, build_layout, expand_grid, main, run_case,
+    section_properties
+)
+
+SMALL = dict(DEFAULT_PARAMETERS, length=12.0, width=12.0)
+
+
+class TestSweepSetup:
+    """Tests for grid expansion and layout building"""
+
+    def test_expand_grid_cartesian_product(self):
+        """Test that every combination of grid values becomes one case"""
+        cases = expand_grid({'column_spacing_x': [6.0, 7.5, 9.0], 'main_beam_direction': ['X', 'Y']})
+        assert len(cases) == 6
+        assert {(c['column_spacing_x'], c['main_beam_direction']) for c in cases} == {
+            (s, d) for s in (6.0, 7.5, 9.0) for d in ('X', 'Y')}
+        assert all(c['secondary_beam_spacing'] == 2.0 for c in cases)
+
+    def test_expand_grid_unknown_parameter(self):
+        """Test that misspelled parameters are rejected"""
+        with pytest.raises(ValueError):
+            expand_grid({'column_spacing': [6.0]})
+
+    def test_section_properties_database_and_welded(self):
+        """Test database lookup and welded section dimensions"""
+        rolled = section_properties('H300x300x10x15')
+        assert rolled['h'] == 300 and rolled['tw'] == 10
+        welded = section_properties('H300x300x10x15.0')
+        assert welded['area'] == pytest.approx(rolled['area'], rel=0.1)
+        with pytest.raises(ValueError):
+            section_properties('XYZ')
+
+    def test_build_layout(self):
+        """Test that sweep parameters map onto the layout"""
+        layout = build_layout(dict(SMALL, main_beam_direction='Y', num_storeys=2))
+        assert layout.main_beam_direction == 'Y'
+        assert layout.num_storeys == 2
+        assert layout.column_spec.name == 'H300x300x10x15'
+        assert layout.main_beam_spec.area > layout.secondary_beam_spec.area
+
+
+class TestSweepRun:
+    """Tests for running sweeps"""
+
+    def test_run_case_row(self):
+        """Test the summary row of one layout"""
+        row = run_case(0, SMALL)
+        assert row['status'] == 'Analysis Complete'
+        assert row['steel_tonnage'] > 0
+        assert row['max_deflection'] > 0
+        assert row['max_reaction'] > 0
+
+    def test_parallel_matches_serial(self):
+        """Test that worker processes give the same rows as in-process runs"""
+        grid = {'main_beam_direction': ['X', 'Y'], 'secondary_beam_spacing': [2.0, 3.0]}
+        serial = ParametricSweep(grid, SMALL, max_workers=1).run_all()
+        parallel = ParametricSweep(grid, SMALL, max_workers=2).run_all()
+        assert [r['case'] for r in parallel] == [0, 1, 2, 3]
+        for a, b in zip(serial, parallel):
+            assert a['max_deflection'] == pytest.approx(b['max_deflection'])
+            assert a['steel_tonnage'] == pytest.approx(b['steel_tonnage'])
+
+    def test_progress_and_cancel(self):
+        """Test progress reporting and cancellation after the first row"""
+        sweep = ParametricSweep({'secondary_beam_spacing': [1.5, 2.0, 3.0]},
+                                SMALL, max_workers=1)
+        calls = []
+        rows = []
+        for row in sweep.run(progress=lambda done, total, row: calls.append((done, total))):
+            rows.append(row)
+            sweep.cancel()
+        assert len(rows) == 1
+        assert calls == [(1, 3)]
+
+    def test_cancel_stops_submission(self, monkeypatch):
+        """Test that workers get a bounded window of cases and cancel stops refilling it"""
+        submitted = []
+        submit = ProcessPoolExecutor.submit
+
+        def counting_submit(executor, fn, *args, **kwargs):
+            submitted.append(args[0])
+            return submit(executor, fn, *args, **kwargs)
+
+        monkeypatch.setattr(ProcessPoolExecutor, 'submit', counting_submit)
+        sweep = ParametricSweep({'secondary_beam_spacing': [1.5, 2.0, 2.5, 3.0, 3.5, 4.0,
+                                                           4.5, 5.0, 5.5, 6.0]},
+                                SMALL, max_workers=2)
+        rows = []
+        for row in sweep.run():
+            rows.append(row)
+            sweep.cancel()
+
+        assert len(rows) == 1
+        assert len(submitted) <= 2 * ParametricSweep.SUBMIT_WINDOW + 1
+
+    def test_cli_interrupt_keeps_finished_rows(self, tmp_path, capsys, monkeypatch):
+        """Test that Ctrl+C still reports and writes the finished rows"""
+        def interrupted(sweep, progress=None):
+            yield run_case(0, sweep.cases[0], sweep.loads, sweep.engine)
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(ParametricSweep, 'run', interrupted)
+        output = tmp_path / 'sweep.csv'
+        code = main(['--length', '12', '--width', '12', '--main-beam-direction', 'X', 'Y',
+                     '-j', '1', '-o', str(output)])
+
+        assert code == 130
+        captured = capsys.readouterr()
+        assert 'Steel (t)' in captured.out
+        assert '1 of 2 cases finished' in captured.err
+        with open(output, encoding='utf-8') as f:
+            assert [r['main_beam_direction'] for r in csv.DictReader(f)] == ['X']
+
+    def test_cli_writes_csv(self, tmp_path, capsys):
+        """Test the command line runner"""
+        output = tmp_path / 'sweep.csv'
+        code = main(['--length', '12', '--width', '12', '--main-beam-direction', 'X', 'Y',
+                     '-j', '1', '-o', str(output)])
+        assert code == 0
+        assert 'Steel (t)' in capsys.readouterr().out
+        with open(output, encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert [r['main_beam_direction'] for r in rows] == ['X', 'Y']
+
@@ -0,0 +1,97 @@
+"""
+Unit tests for live-load pattern envelopes
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer
+from steeldeckfem.core.load_combination_engine import LoadType
+from steeldeckfem.core.model_generator import MEMBER_COLUMN
+
+
+@pytest.fixture
+def analyzed(simple_layout, simple_loads):
+    analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+    analyzer.build_fem_model(simple_layout, simple_loads)
+    analyzer.run_analysis(layout=simple_layout)
+    return analyzer
+
+
+class TestLiveLoadPanels:
+    """Tests for FloorSystemFEMAnalyzer.live_load_panels"""
+    
+    def test_panels_make_up_the_live_load(self, analyzed):
+        """Test every beam is fully shared out and columns carry no panel load"""
+        names, weights = analyzed.live_load_panels()
+        topo = analyzed.topology
+        
+        assert len(names) == weights.shape[0]
+        assert len(set(names)) == len(names)
+        assert weights.shape[1] == len(analyzed.model.members)
+        total = np.asarray(weights.sum(axis=0)).ravel()
+        columns = topo.member_kind == MEMBER_COLUMN
+        assert np.allclose(total[~columns], 1.0)
+        assert np.all(total[columns] == 0.0)
+    
+    def test_unit_cases_sum_to_live_case(self, analyzed):
+        """Test the panel solutions add up to the live load case"""
+        _, weights = analyzed.live_load_panels()
+        D = sum(part['D'].sum(axis=0) for part in
+                analyzed.model.analyze_load_groups('L', weights, block=2))
+        live = analyzed.case_results.case_index('L')
+        
+        assert np.allclose(D[:, :3], analyzed.case_results.displacements[live], atol=1e-12)
+
+
+class TestPatternAnalysis:
+    """Tests for FloorSystemFEMAnalyzer.run_pattern_analysis"""
+    
+    def test_envelope_bounds_full_live_load(self, analyzed):
+        """Test the pattern envelope contains the uniformly loaded one"""
+        results = analyzed.run_pattern_analysis()
+        
+        assert analyzed.pattern_results is results
+        for limit_state, envelope in results['envelopes'].items():
+            full = analyzed.results['envelopes'][limit_state]
+            for member, forces in full['member_forces'].items():
+                pattern = envelope['member_forces'][member]
+                for key in ('moment', 'shear', 'axial'):
+                    assert np.all(np.array(pattern[f'{key}_max']) >= np.array(forces[f'{key}_max']) - 1e-6)
+                    assert np.all(np.array(pattern[f'{key}_min']) <= np.array(forces[f'{key}_min']) + 1e-6)
+            assert envelope['max_moment']['value'] >= full['max_moment']['value'] - 1e-6
+            assert envelope['max_deflection']['value'] >= full['max_deflection']['value'] - 1e-9
+            assert set(envelope['column_forces']) == set(analyzed.column_members)
+    
+    def test_matches_all_patterns(self, analyzed):
+        """Test the support reaction envelope against every panel pattern"""
+        names, weights = analyzed.live_load_panels()
+        combination = analyzed.combinations[0]
+        results = analyzed.run_pattern_analysis([combination])
+        Fz = np.concatenate([part['reactions'][..., 2] for part in
+                             analyzed.model.analyze_load_groups('L', weights)])
+        factors = dict(combination.factors)
+        gamma = factors.pop(LoadType.LIVE)
+        base = analyzed.case_results.combine(
+            analyzed._factor_matrix([factors]), [combination.name]).reactions[0, :, 2]
+        support = [analyzed.model.nodes[n] for n in analyzed.case_results.support_nodes]
+        
+        patterns = np.array(list(itertools.product((0.0, 1.0), repeat=len(names))))
+        values = base + gamma * patterns @ Fz[:, support]
+        reactions = results['envelopes'][combination.limit_state.name]['reactions']
+        for s, node in enumerate(analyzed.case_results.support_nodes):
+            assert reactions[node]['Fz_max'] == pytest.approx(values[:, s].max(), abs=1e-6)
+            assert reactions[node]['Fz_min'] == pytest.approx(values[:, s].min(), abs=1e-6)
+    
+    def test_requires_analysis(self, simple_layout, simple_loads):
+        """Test pattern loading needs the sparse engine and an analysis"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        with pytest.raises(ValueError, match='run_analysis'):
+            analyzer.run_pattern_analysis()
+        
+        analyzer = FloorSystemFEMAnalyzer(engine='pynite')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        with pytest.raises(ValueError, match='sparse'):
+            analyzer.run_pattern_analysis()
@@ -0,0 +1,85 @@
+"""
+Unit tests for the second-order (P-Delta) analysis
+"""
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer, SparseFrameModel
+
+H, E, A, I = 4.0, 200e6, 0.01, 1e-4
+P_CR = np.pi**2 * E * I / (4 * H**2)
+
+
+def cantilever(n=10):
+    """Fixed-base column with a vertical (case 'P') and lateral (case 'H') tip load"""
+    model = SparseFrameModel()
+    for k in range(n + 1):
+        model.add_node(f'N{k}', 0, 0, H * k / n)
+    model.add_material('S', E, 77e6, 0.3, 7850)
+    model.add_section('Sec', A, I, I, 2 * I)
+    model.add_member('C', 'N0', f'N{n}', 'S', 'Sec')
+    model.def_support('N0', True, True, True, True, True, True)
+    model.add_node_load(f'N{n}', 'FZ', -1.0, 'P')
+    model.add_node_load(f'N{n}', 'FX', 1.0, 'H')
+    return model
+
+
+class TestSparsePDelta:
+    """Tests for SparseFrameModel.analyze_pdelta"""
+    
+    def test_cantilever_matches_closed_form(self):
+        """Test the tip sway and base moment of an axially loaded cantilever"""
+        model = cantilever()
+        loads = np.array([[0.3 * P_CR, 10.0], [0.6 * P_CR, 10.0], [0.0, 10.0]])
+        solution = model.analyze_pdelta(loads)
+        
+        for (P, lateral), D, reactions in zip(loads, solution['D'], solution['reactions']):
+            if P:
+                k = np.sqrt(P / (E * I))
+                expected = lateral / (k * P) * (np.tan(k * H) - k * H)
+            else:
+                expected = lateral * H**3 / (3 * E * I)
+            sway = D[-1, 0]
+            assert sway == pytest.approx(expected, rel=1e-4)
+            assert reactions[0, 4] == pytest.approx(-(lateral * H + P * sway))
+        assert np.allclose(solution['D_linear'][:, -1, 0], 10 * H**3 / (3 * E * I))
+        assert model.solver_info['method'] == 'p-delta'
+    
+    def test_buckled_structure_raises(self):
+        """Test that loads above the critical load are rejected"""
+        with pytest.raises(ValueError, match='unstable'):
+            cantilever().analyze_pdelta([[1.2 * P_CR, 10.0]])
+
+
+class TestAnalyzerPDelta:
+    """Tests for FloorSystemFEMAnalyzer.run_pdelta_analysis"""
+    
+    def test_uls_combinations(self, simple_layout, simple_loads):
+        """Test second-order ULS results and storey drift amplification"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse')
+        analyzer.build_fem_model(simple_layout, dict(simple_loads, wind_load=80))
+        analyzer.run_analysis()
+        result = analyzer.run_pdelta_analysis()
+        second = result['fem_results']
+        uls = [c.name for c in analyzer.combinations if c.limit_state.name == 'ULS']
+        first = analyzer._all_combinations()
+        rows = [first.load_cases.index(name) for name in uls]
+        
+        assert analyzer.pdelta_results is result
+        assert second.load_cases == uls
+        # Equilibrium: base shear is unchanged, sway grows
+        assert np.allclose(second.reactions.sum(axis=1), first.reactions[rows].sum(axis=1),
+                           atol=1e-6)
+        sway = np.abs(second.displacements[..., 0]).max(axis=1)
+        assert np.all(sway >= np.abs(first.displacements[rows, :, 0]).max(axis=1))
+        
+        wind = next(name for name in uls if 'W' in name)
+        assert [row['storey'] for row in result['amplification'][wind]] == [1]
+        assert result['amplification'][wind][0]['X'] > 1.0
+    
+    def test_pynite_engine_rejected(self, simple_layout, simple_loads):
+        """Test that P-Delta analysis requires the sparse engine"""
+        analyzer = FloorSystemFEMAnalyzer(engine='pynite')
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        with pytest.raises(ValueError, match='sparse'):
+            analyzer.run_pdelta_analysis()
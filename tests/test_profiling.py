@@ -0,0 +1,64 @@
+"""
+Unit tests for the phase profiler
+"""
+
+import gc
+import json
+
+from steeldeckfem.core import FloorSystemFEMAnalyzer, RunProfiler
+from steeldeckfem.core.profiling import PROFILE_FORMAT, format_profile
+
+
+class TestRunProfiler:
+    """Tests for RunProfiler"""
+    
+    def test_nested_phases_and_memory(self, tmp_path):
+        """Test phase names, peak allocations, object counts and the JSON dump"""
+        profiler = RunProfiler(trace_memory=True, count_objects=True)
+        gc.collect()  # garbage of earlier tests would be collected within the phase
+        with profiler.phase('outer'):
+            with profiler.phase('inner'):
+                block = bytearray(4 * 2**20)
+                objects = [[] for _ in range(5000)]
+            del block
+        
+        inner, outer = profiler.phases
+        assert [inner['name'], outer['name']] == ['outer/inner', 'outer']
+        assert inner['peak_memory'] >= 4 * 2**20
+        assert outer['peak_memory'] >= inner['peak_memory']
+        assert inner['objects'] >= 4000
+        assert profiler.total_time == outer['wall_time'] >= inner['wall_time']
+        
+        data = json.loads(profiler.dump(tmp_path / 'profile.json').read_text(encoding='utf-8'))
+        assert data['format'] == PROFILE_FORMAT
+        assert data['phases'] == profiler.as_dict()['phases']
+        assert format_profile(data).startswith(f"{outer['wall_time']:.2f} s | outer")
+    
+    def test_time_only_by_default(self):
+        """Test that only wall times are recorded unless enabled"""
+        profiler = RunProfiler()
+        with profiler.phase('step'):
+            pass
+        assert set(profiler.phases[0]) == {'name', 'wall_time'}
+
+
+class TestAnalyzerProfile:
+    """Tests for the 'profile' entry of FloorSystemFEMAnalyzer results"""
+    
+    def test_phases_of_a_run(self, simple_layout, simple_loads):
+        """Test that every analyzer phase is recorded once per model"""
+        analyzer = FloorSystemFEMAnalyzer(engine='sparse', profile=True)
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        profile = analyzer.run_analysis(layout=simple_layout)['profile']
+        names = [p['name'] for p in profile['phases']]
+        
+        assert names == ['define_nodes', 'define_members', 'apply_supports', 'apply_loads',
+                         'analyze', 'extract_results', 'combinations', 'envelopes',
+                         'design_checks']
+        assert all('peak_memory' in p and 'objects' in p for p in profile['phases'])
+        
+        # A section-only change starts a new profile
+        simple_layout.main_beam_spec.ix *= 2
+        analyzer.build_fem_model(simple_layout, simple_loads)
+        profile = analyzer.run_analysis()['profile']
+        assert [p['name'] for p in profile['phases']][:2] == ['update_sections', 'analyze']
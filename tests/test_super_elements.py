@@ -0,0 +1,104 @@
+"""
+Unit tests for super-element (static condensation) solves
+"""
+
+import numpy as np
+import pytest
+from steeldeckfem.core import FloorSystemFEMAnalyzer, SparseFrameModel
+
+
+def portal(n=6):
+    """Two columns and a beam with n - 1 intermediate nodes carrying side beams"""
+    model = SparseFrameModel()
+    model.add_material('S', 2e8, 7.7e7, 0.3, 7850)
+    model.add_section('Sec', 0.01, 2e-4, 1e-4, 1e-6)
+    for k in range(n + 1):
+        model.add_node(f'N{k}', 6.0 * k / n, 0, 4.0)
+    for k in range(1, n):
+        model.add_node(f'S{k}', 6.0 * k / n, 3.0, 4.0)
+        model.add_member(f'Side{k}', f'N{k}', f'S{k}', 'S', 'Sec')
+        model.def_support(f'S{k}', True, True, True, False, False, False)
+    for end, name in ((0, 'A'), (n, 'B')):
+        model.add_node(name, 6.0 * end / n, 0, 0)
+        model.add_member(f'C{name}', name, f'N{end}', 'S', 'Sec')
+        model.def_support(name, True, True, True, True, True, True)
+    model.add_member('Beam', 'N0', f'N{n}', 'S', 'Sec')
+    model.add_member_dist_load('Beam', 'FZ', -10.0, -10.0, case='D')
+    model.add_node_load('N0', 'FX', 5.0, 'W')
+    return model
+
+
+class TestSparseSuperElements:
+    """Tests for SparseFrameModel.def_super_element"""
+    
+    def test_matches_global_solve(self):
+        """Test condensed solves against the plain model"""
+        plain, condensed = portal(), portal()
+        condensed.def_super_element('Beam', [f'N{k}' for k in range(1, 6)])
+        plain.analyze()
+        condensed.analyze()
+        
+        assert np.allclose(condensed.D, plain.D, atol=1e-14)
+        assert np.allclose(condensed.reactions, plain.reactions, atol=1e-9)
+        assert np.allclose(condensed.element_forces, plain.element_forces, atol=1e-9)
+        assert condensed.factor_info['global_dof'] == plain.factor_info['dof'] - 30
+        assert condensed.factor_info['condensed_dof'] == 30
+    
+    def test_shared_condensation(self):
+        """Test identical super-elements are condensed once"""
+        model = portal()
+        model.def_super_element('Left', ['N1', 'N2'])
+        model.def_super_element('Right', ['N4', 'N5'])
+        model.analyze()
+        
+        assert model.factor_info['condensations'] == 1
+        plain = portal()
+        plain.analyze()
+        assert np.allclose(model.D, plain.D, atol=1e-14)
+    
+    def test_invalid_super_elements(self):
+        """Test overlapping and directly connected super-elements are rejected"""
+        model = portal()
+        model.def_super_element('Left', ['N1', 'N2'])
+        with pytest.raises(ValueError, match='share nodes'):
+            model.def_super_element('Other', ['N2', 'N4'])
+        with pytest.raises(NameError):
+            model.def_super_element('Left', ['N4'])
+        
+        model.def_super_element('Right', ['N3', 'N4'])
+        with pytest.raises(ValueError, match='connected directly'):
+            model.analyze()
+
+
+class TestAnalyzerSuperElements:
+    """Tests for FloorSystemFEMAnalyzer(super_elements=True)"""
+    
+    @pytest.mark.parametrize('rigid_diaphragm', [False, True])
+    def test_matches_global_solve(self, simple_layout, simple_loads, rigid_diaphragm):
+        """Test floor super-elements give the results of the global solve"""
+        simple_layout.num_storeys = 3
+        loads = dict(simple_loads, wind_load=50)
+        analyzers = []
+        for condense in (False, True):
+            analyzer = FloorSystemFEMAnalyzer(engine='sparse', rigid_diaphragm=rigid_diaphragm,
+                                              super_elements=condense)
+            analyzer.build_fem_model(simple_layout, loads)
+            analyzer.run_analysis()
+            analyzers.append(analyzer)
+        plain, condensed = analyzers
+        info = condensed.model.factor_info
+        
+        assert np.allclose(condensed.case_results.displacements,
+                           plain.case_results.displacements, atol=1e-12)
+        assert np.allclose(condensed.case_results.reactions, plain.case_results.reactions,
+                           atol=1e-8)
+        assert info['condensations'] == 1
+        assert info['global_dof'] + info['condensed_dof'] == plain.model.factor_info['dof']
+        
+        omega = [a.run_modal_analysis(3).omega for a in analyzers]
+        assert np.allclose(omega[1], omega[0], rtol=1e-8)
+    
+    def test_pynite_engine_rejected(self):
+        """Test super-elements require the sparse engine"""
+        with pytest.raises(ValueError, match='sparse'):
+            FloorSystemFEMAnalyzer(engine='pynite', super_elements=True)
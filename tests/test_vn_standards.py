@@ -0,0 +1,145 @@
+"""
+Unit tests for the Vietnamese standards data loader
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from steeldeckfem.core import vn_standards_loader
+from steeldeckfem.core.vn_standards_loader import (
+    LookupTable, VNStandardsLoader, load_standards, snapshot_path
+)
+
+STANDARDS_FILE = Path(__file__).resolve().parent.parent / 'vn_construction_standards.json'
+
+
+@pytest.fixture
+def standards(tmp_path):
+    path = tmp_path / 'standards.json'
+    path.write_bytes(STANDARDS_FILE.read_bytes())
+    return VNStandardsLoader.from_file(path)
+
+
+class TestLookupTables:
+    """Tests for the compiled interpolation tables"""
+    
+    def test_table_interpolation(self):
+        """Test values at, between and beyond the tabulated arguments"""
+        table = LookupTable.from_keys({'20m': 2.0, '10m': 1.0, 'note': 'skipped', '40m': 3.0},
+                                      lambda key: float(key.replace('m', '')))
+        
+        assert table.x.tolist() == [10.0, 20.0, 40.0]
+        assert table.column('value', [0.0, 10.0, 15.0, 30.0, 40.0, 50.0]).tolist() == \
+            [1.0, 1.0, 1.5, 2.5, 3.0, 3.0]
+        assert table(np.zeros((2, 3))).shape == (2, 3, 1)
+    
+    def test_wind_factors_vectorized(self, standards):
+        """Test the array query matches the scalar one and the tabulated heights"""
+        heights = np.array([0.0, 5.0, 12.5, 33.0, 100.0, 250.0])
+        ce = standards.wind_terrain_factors('terrainB', heights)
+        
+        assert ce.shape == heights.shape
+        assert ce.tolist() == [standards.get_wind_terrain_factor('terrainB', h) for h in heights]
+        assert ce[1] == 0.9 and ce[4] == 1.82
+        assert ce[2] == pytest.approx((1.08 + 1.19) / 2)
+        assert ce[0] == ce[1] and ce[-1] == ce[-2]
+    
+    def test_slab_coefficients(self, standards):
+        """Test tabulated ratios are exact and others interpolated"""
+        exact = standards.get_two_way_slab_coefficients('interiorPanel', 1.25)
+        ratios = np.array([1.0, 1.05, 1.1])
+        coeffs = standards.two_way_slab_coefficients('interiorPanel', ratios)
+        
+        assert exact == {'mx_negative': 0.044, 'mx_positive': 0.034,
+                         'my_negative': 0.024, 'my_positive': 0.019}
+        assert coeffs['mx_negative'].tolist() == pytest.approx([0.031, 0.034, 0.037])
+    
+    def test_bearing_capacity_factors(self, standards):
+        """Test friction angles between the 5° steps are interpolated"""
+        between = standards.get_bearing_capacity_factors(32.5)
+        factors = standards.bearing_capacity_factors([30.0, 35.0])
+        
+        assert factors['Nq'].tolist() == [18.4, 33.3]
+        assert between['Nq'] == pytest.approx((18.4 + 33.3) / 2)
+        assert set(between) == {'Nc', 'Nq', 'Nγ'}
+
+
+class TestSnapshot:
+    """Tests for the binary snapshot of the standards file"""
+    
+    @pytest.fixture
+    def json_path(self, tmp_path):
+        path = tmp_path / 'standards.json'
+        path.write_bytes(STANDARDS_FILE.read_bytes())
+        return path
+    
+    def test_warm_load_matches_json(self, json_path):
+        """Test the snapshot is written once and gives the parsed data back"""
+        data, tables = load_standards(json_path)
+        snapshot = snapshot_path(json_path)
+        written = snapshot.stat().st_mtime_ns
+        warm_data, warm_tables = load_standards(json_path)
+        
+        assert snapshot.stat().st_mtime_ns == written
+        assert warm_data == data
+        assert set(warm_tables) == set(tables)
+        for key, table in tables.items():
+            assert np.array_equal(warm_tables[key].values, table.values)
+        # arrays are views of the mapped snapshot
+        assert not warm_tables['bearing'].values.flags.writeable
+    
+    def test_stale_or_broken_snapshot_rebuilt(self, json_path):
+        """Test a changed JSON file or a damaged snapshot falls back to parsing"""
+        load_standards(json_path)
+        edited = json.loads(json_path.read_text(encoding='utf-8'))
+        edited['geotechnicalEngineering']['bearingCapacity']['bearingCapacityFactors']['phi_30']['Nc'] = 31.0
+        json_path.write_text(json.dumps(edited, ensure_ascii=False), encoding='utf-8')
+        data, _ = load_standards(json_path)
+        factors = data['geotechnicalEngineering']['bearingCapacity']['bearingCapacityFactors']
+        assert factors['phi_30']['Nc'] == 31.0
+        
+        snapshot_path(json_path).write_bytes(b'broken')
+        data, tables = load_standards(json_path)
+        assert tables['bearing'].values.flags.writeable
+        assert load_standards(json_path)[0] == data
+    
+    def test_without_snapshot(self, json_path):
+        """Test snapshot=False neither reads nor writes a snapshot"""
+        data, _ = load_standards(json_path, snapshot=False)
+        assert not snapshot_path(json_path).exists()
+        assert 'windLoads' in data
+    
+    def test_read_only_directory_falls_back(self, json_path, tmp_path, monkeypatch, capsys):
+        """Test the per-user directory is used when the JSON directory is read-only"""
+        write = vn_standards_loader._write_snapshot
+        
+        def read_only(path, key, value):
+            if path.parent == json_path.parent:
+                raise PermissionError(13, 'Permission denied', str(path.parent))
+            write(path, key, value)
+        
+        cache_dir = tmp_path / 'cache'
+        monkeypatch.setattr(vn_standards_loader, '_write_snapshot', read_only)
+        monkeypatch.setattr(vn_standards_loader, 'default_snapshot_dir', lambda: cache_dir)
+        load_standards(json_path)
+        
+        assert not snapshot_path(json_path).exists()
+        assert snapshot_path(json_path, cache_dir).exists()
+        _, tables = load_standards(json_path)
+        assert not tables['bearing'].values.flags.writeable
+        assert capsys.readouterr().out == ''
+    
+    def test_unwritable_snapshot_warns_once(self, json_path, monkeypatch, capsys):
+        """Test a snapshot that cannot be written anywhere warns once per process"""
+        def unwritable(path, key, value):
+            raise PermissionError(13, 'Permission denied', str(path.parent))
+        
+        monkeypatch.setattr(vn_standards_loader, '_write_snapshot', unwritable)
+        monkeypatch.setattr(vn_standards_loader, '_snapshot_warned', False)
+        for _ in range(3):
+            data, _ = load_standards(json_path)
+        
+        assert 'windLoads' in data
+        assert capsys.readouterr().out.count('Could not write standards snapshot') == 1